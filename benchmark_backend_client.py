@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call latency of NestJS calls: a new httpx.AsyncClient per call
+(the previous behaviour) versus the shared pooled backend client.
+
+Runs against a local keep-alive stub backend, so no NestJS instance is needed.
+"""
+
+import json
+import time
+import asyncio
+import threading
+import httpx
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from python_orchestrator.agents.http_client import get_backend_client, close_backend_client
+from python_orchestrator.utils.metrics import summarize
+
+CALLS = 300
+BODY = json.dumps([{"claim_id": f"CLM-{i:03}", "status": "Submitted"} for i in range(20)]).encode()
+
+
+class StubBackend(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls on keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+async def per_call_client(url: str) -> list:
+    timings = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            (await client.get(url)).raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def shared_client(url: str) -> list:
+    timings = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        (await get_backend_client().get(url)).raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+    await close_backend_client()
+    return timings
+
+
+def report(name: str, timings: list):
+    s = summarize(timings)
+    print(f"{name:<22} mean {s['mean']:.2f} ms  p50 {s['p50']:.2f} ms  p95 {s['p95']:.2f} ms")
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubBackend)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/user/claims"
+
+    per_call = asyncio.run(per_call_client(url))
+    shared = asyncio.run(shared_client(url))
+    server.shutdown()
+
+    print(f"{CALLS} sequential GETs against a local stub backend")
+    report("new client per call", per_call)
+    report("shared pooled client", shared)
+    print(f"Mean latency reduction: {1 - summarize(shared)['mean'] / summarize(per_call)['mean']:.0%}")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Evaluate dynamic tool selection on a fixed set of labelled queries.
+
+Each query runs through the real agent (cached executor, request tool subset,
+tool execution) with the tools selection exposes for it, and once more with
+every role tool exposed. The LLM is mocked: it calls the labelled tool when
+that tool is offered to it and otherwise answers without tools. The NestJS
+backend is mocked too and answers every call with an empty JSON body. A task
+succeeds when the agent ran every tool it needs and returned an answer.
+Also reports the tool-prompt token reduction.
+"""
+
+import asyncio
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from python_orchestrator.agents import http_client
+from python_orchestrator.orchestrator import agent_factory
+from python_orchestrator.orchestrator.langhub import get_orchestrator_agent, run_agent
+from python_orchestrator.orchestrator.step_counter import StepCounterHandler
+from python_orchestrator.orchestrator.tool_selector import select_tool_names, tool_prompt_tokens
+from python_orchestrator.orchestrator.tools import get_tools_for_role
+
+EVAL_TOKEN = "eval-token"
+
+EVAL_SET = [
+    ("What is the status of my claim CLM-P001?", "user", ["get_user_claim_by_id_tool"]),
+    ("Show me the history of claim CLM-P002", "user", ["get_claim_history_tool"]),
+    ("List all my active claims", "user", ["get_user_claims_tool"]),
+    ("Summarize all my claims and how each one progressed", "user", ["get_claims_with_history_tool"]),
+    ("Which policies do I have?", "user", ["get_user_policies_tool"]),
+    ("Give me the details of policy GOLD-P001", "user", ["get_user_policy_by_id_tool"]),
+    ("How much would my premium be if I raise coverage to 300000?", "user", ["calculate_premium_tool"]),
+    ("What does the Gold plan cover?", "user", ["search_knowledge_base_tool"]),
+    ("What is my email address on file?", "user", ["get_current_user_profile_tool"]),
+    ("List every customer in the system", "admin", ["get_all_users_tool"]),
+    ("Find the user with email demo.user@prod.com", "admin", ["get_user_by_email_tool"]),
+    ("Show all policies across all users", "admin", ["get_all_policies_tool"]),
+    ("Create a new user account for jane@prod.com", "admin", ["create_user_tool"]),
+    ("Create a Silver policy for user USER_001", "admin", ["create_policy_tool"]),
+    ("Upload this FAQ entry to the knowledge base", "admin", ["upload_knowledge_base_tool"]),
+    ("Delete knowledge base entry 42", "admin", ["delete_knowledge_base_entry_tool"]),
+    ("Look up user USER_002 by id", "admin", ["get_user_by_id_admin_tool"]),
+]
+
+LABELS = {query: required for query, _, required in EVAL_SET}
+PLACEHOLDER_ARGS = {"string": "1", "integer": 1, "number": 1, "boolean": False, "object": {}, "array": []}
+
+
+class LabelledToolModel(BaseChatModel):
+    """
+    Stands in for the LLM: requests the query's labelled tools that are among
+    the tools bound to it, then answers once their results are back.
+    """
+
+    @property
+    def _llm_type(self) -> str:
+        return "labelled-tool-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=(), **kwargs):
+        if any(isinstance(m, ToolMessage) for m in messages):
+            return self._reply(AIMessage(content="Here is what I found."))
+        prompt = next(m.content for m in messages if isinstance(m, HumanMessage))
+        required = next((names for query, names in LABELS.items() if prompt.endswith(query)), [])
+        offered = {t["function"]["name"]: t["function"]["parameters"] for t in tools}
+        calls = [
+            {"name": name, "id": f"call_{i}",
+             "args": {arg: PLACEHOLDER_ARGS.get(offered[name]["properties"][arg].get("type"), "1")
+                      for arg in offered[name].get("required", [])}}
+            for i, name in enumerate(required) if name in offered
+        ]
+        if not calls:
+            return self._reply(AIMessage(content="I can't help with that."))
+        return self._reply(AIMessage(content="", tool_calls=calls))
+
+    @staticmethod
+    def _reply(message: AIMessage) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def mock_backend(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={})
+
+
+async def run_task(query: str, role: str, tool_names) -> list:
+    """Tools the agent ran for the query, or None if the run failed."""
+    agent = get_orchestrator_agent(EVAL_TOKEN, role, verbose=False, tool_names=tool_names)
+    steps = StepCounterHandler()
+    output = await run_agent(query, EVAL_TOKEN, role, agent=agent, callbacks=[steps])
+    return None if output.startswith("An error occurred") else steps.tools
+
+
+async def evaluate():
+    agent_factory.build_llm = lambda *args, **kwargs: LabelledToolModel()
+    agent_factory.OPENAI_API_KEY = "sk-eval"
+    http_client._backend_client = httpx.AsyncClient(transport=httpx.MockTransport(mock_backend))
+    solved = {"selected": 0, "all": 0}
+    full_tokens, selected_tokens = 0, 0
+    for query, role, required in EVAL_SET:
+        all_tools = get_tools_for_role(role)
+        names = select_tool_names(query, role) or tuple(t.name for t in all_tools)
+        full_tokens += tool_prompt_tokens(all_tools)
+        selected_tokens += tool_prompt_tokens([t for t in all_tools if t.name in names])
+        for exposure, tool_names in (("selected", names), ("all", None)):
+            ran = await run_task(query, role, tool_names)
+            missing = required if ran is None else [name for name in required if name not in ran]
+            solved[exposure] += not missing
+            if exposure == "selected":
+                print(f"{'✅' if not missing else '❌'} [{role}] {query}" +
+                      (f"  missing: {missing}" if missing else ""))
+    return solved["selected"] / len(EVAL_SET), solved["all"] / len(EVAL_SET), 1 - selected_tokens / full_tokens
+
+
+if __name__ == "__main__":
+    success_rate, baseline_rate, reduction = asyncio.run(evaluate())
+    print("=" * 60)
+    print(f"Task success with selection: {success_rate:.0%} (all tools exposed: {baseline_rate:.0%})")
+    print(f"Tool-prompt token reduction: {reduction:.0%}")
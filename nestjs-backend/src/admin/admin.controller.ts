@@ -1,4 +1,4 @@
-import { Controller, Get, Post, Delete, Param, Body, UploadedFile, UseInterceptors, UseGuards, NotFoundException } from '@nestjs/common';
+import { Controller, Get, Post, Delete, Param, Body, Query, UploadedFile, UseInterceptors, UseGuards, NotFoundException, BadRequestException } from '@nestjs/common';
 import { AdminService } from './admin.service';
 import { FileInterceptor } from '@nestjs/platform-express';
 import { JwtAuthGuard } from '../auth/jwt-auth.guard';
@@ -8,7 +8,8 @@ import { UsersService } from '../users/users.service';
 import { PoliciesService } from '../policies/policies.service';
 import { CreateUserDto } from '../users/dto/create-user.dto';
 import { CreatePolicyDto } from '../policies/dto/create-policy.dto';
-import { ApiTags, ApiOperation, ApiResponse, ApiBearerAuth, ApiParam, ApiBody, ApiConsumes } from '@nestjs/swagger';
+import { ApiTags, ApiOperation, ApiResponse, ApiBearerAuth, ApiParam, ApiBody, ApiConsumes, ApiQuery } from '@nestjs/swagger';
+import { parseLimit } from '../common/pagination';
 
 @ApiTags('Admin')
 @Controller('admin')
@@ -25,11 +26,25 @@ export class AdminController {
   @Get('users')
   @ApiBearerAuth()
   @ApiOperation({ summary: 'Get all users (Admin only)' })
-  @ApiResponse({ status: 200, description: 'List of all users' })
+  @ApiResponse({ status: 200, description: 'List of all users, or a page { items, next_cursor } when any query parameter is given' })
   @ApiResponse({ status: 401, description: 'Unauthorized' })
   @ApiResponse({ status: 403, description: 'Forbidden - Admin access required' })
-  async getAllUsers() {
-    return this.usersService.findAll();
+  @ApiQuery({ name: 'cursor', required: false, description: 'Cursor returned as next_cursor by the previous page' })
+  @ApiQuery({ name: 'limit', required: false, description: 'Page size (max 200)', example: '50' })
+  @ApiQuery({ name: 'role', required: false, description: 'Filter by role', example: 'user' })
+  @ApiQuery({ name: 'created_from', required: false, description: 'Created on or after (ISO date)', example: '2024-01-01' })
+  @ApiQuery({ name: 'created_to', required: false, description: 'Created on or before (ISO date)', example: '2024-12-31' })
+  async getAllUsers(
+    @Query('cursor') cursor?: string,
+    @Query('limit') limit?: string,
+    @Query('role') role?: string,
+    @Query('created_from') createdFrom?: string,
+    @Query('created_to') createdTo?: string,
+  ) {
+    if ([cursor, limit, role, createdFrom, createdTo].every(value => value === undefined)) {
+      return this.usersService.findAll();
+    }
+    return this.usersService.findPage({ cursor, limit: parseLimit(limit), role, createdFrom, createdTo });
   }
 
   @Post('users')
@@ -72,11 +87,41 @@ export class AdminController {
   @Get('policies')
   @ApiBearerAuth()
   @ApiOperation({ summary: 'Get all policies (Admin only)' })
-  @ApiResponse({ status: 200, description: 'List of all policies' })
+  @ApiResponse({ status: 200, description: 'List of all policies, or a page { items, next_cursor } when any query parameter is given' })
+  @ApiResponse({ status: 400, description: 'Invalid status filter' })
   @ApiResponse({ status: 401, description: 'Unauthorized' })
   @ApiResponse({ status: 403, description: 'Forbidden - Admin access required' })
-  async getAllPolicies() {
-    return this.policiesService.findAll();
+  @ApiQuery({ name: 'cursor', required: false, description: 'Cursor returned as next_cursor by the previous page' })
+  @ApiQuery({ name: 'limit', required: false, description: 'Page size (max 200)', example: '50' })
+  @ApiQuery({ name: 'status', required: false, description: 'active or expired', example: 'active' })
+  @ApiQuery({ name: 'user_id', required: false, description: 'Filter by policy holder', example: 'USER_001' })
+  @ApiQuery({ name: 'plan_name', required: false, description: 'Filter by plan', example: 'Gold' })
+  @ApiQuery({ name: 'start_from', required: false, description: 'Start date on or after (ISO date)', example: '2024-01-01' })
+  @ApiQuery({ name: 'start_to', required: false, description: 'Start date on or before (ISO date)', example: '2024-12-31' })
+  async getAllPolicies(
+    @Query('cursor') cursor?: string,
+    @Query('limit') limit?: string,
+    @Query('status') status?: string,
+    @Query('user_id') userId?: string,
+    @Query('plan_name') planName?: string,
+    @Query('start_from') startFrom?: string,
+    @Query('start_to') startTo?: string,
+  ) {
+    if ([cursor, limit, status, userId, planName, startFrom, startTo].every(value => value === undefined)) {
+      return this.policiesService.findAll();
+    }
+    if (status !== undefined && status !== 'active' && status !== 'expired') {
+      throw new BadRequestException(`Invalid status filter: ${status}`);
+    }
+    return this.policiesService.findPage({
+      cursor,
+      limit: parseLimit(limit),
+      status: status as 'active' | 'expired' | undefined,
+      userId,
+      planName,
+      startFrom,
+      startTo,
+    });
   }
 
   @Post('policies')
@@ -31,14 +31,14 @@ export class AuthService {
     if (!user) {
       throw new UnauthorizedException('Invalid credentials');
     }
-    const payload = { email: user.email, sub: user.user_id };
+    const payload = { email: user.email, sub: user.user_id, role: user.role };
     return {
       access_token: this.jwtService.sign(payload),
     };
   }
 
   generateToken(user: any): string {
-    const payload = { email: user.email, sub: user.user_id };
+    const payload = { email: user.email, sub: user.user_id, role: user.role };
     return this.jwtService.sign(payload);
   }
 }
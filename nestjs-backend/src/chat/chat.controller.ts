@@ -1,8 +1,8 @@
-import { Controller, Post, Body, UseGuards, Request } from '@nestjs/common';
+import { Controller, Post, Body, UseGuards, Request, Res } from '@nestjs/common';
 import { ChatService } from './chat.service';
 import { JwtAuthGuard } from '../auth/jwt-auth.guard';
 import { ApiTags, ApiOperation, ApiResponse, ApiBearerAuth, ApiBody } from '@nestjs/swagger';
-import { Request as ExpressRequest } from 'express';
+import { Request as ExpressRequest, Response } from 'express';
 
 interface UserPayload {
   sub: number;
@@ -39,4 +39,20 @@ export class ChatController {
     const userRole = req.user?.role || 'user';
     return this.chatService.forwardToOrchestrator(message, sessionId, userRole, req);
   }
+
+  @Post('stream')
+  @UseGuards(JwtAuthGuard)
+  @ApiBearerAuth()
+  @ApiOperation({ summary: 'Send a chat message and stream the orchestrator response as server-sent events' })
+  @ApiResponse({ status: 200, description: 'Streams token, tool_start, tool_end and final events' })
+  @ApiResponse({ status: 401, description: 'Unauthorized' })
+  async streamMessage(
+    @Body() body: { message: string; sessionId?: string },
+    @Request() req: AuthenticatedRequest,
+    @Res() res: Response
+  ) {
+    const { message, sessionId } = body;
+    const userRole = req.user?.role || 'user';
+    return this.chatService.streamToOrchestrator(message, sessionId, userRole, req, res);
+  }
 }
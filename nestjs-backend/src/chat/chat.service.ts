@@ -1,4 +1,5 @@
 import { Injectable, Logger } from '@nestjs/common';
+import { Request, Response } from 'express';
 import { OrchestratorService } from './orchestrator/orchestrator.service';
 
 @Injectable()
@@ -39,6 +40,11 @@ export class ChatService {
     }
   }
 
+  async streamToOrchestrator(message: string, sessionId: string | undefined, userRole: string, request: Request, res: Response) {
+    this.logger.log('Relaying chat stream from orchestrator service');
+    return this.orchestratorService.streamFromOrchestrator(message, sessionId, userRole, request, res);
+  }
+
   async getOrchestratorStatus() {
     return this.orchestratorService.getOrchestratorStatus();
   }
@@ -1,6 +1,6 @@
 import { Injectable, Logger, OnModuleInit } from '@nestjs/common';
 import { ConfigService } from '@nestjs/config';
-import { Request } from 'express';
+import { Request, Response } from 'express';
 
 @Injectable()
 export class OrchestratorService implements OnModuleInit {
@@ -118,6 +118,43 @@ export class OrchestratorService implements OnModuleInit {
     }
   }
 
+  async streamFromOrchestrator(message: string, sessionId: string | undefined, userRole: string, request: Request, res: Response): Promise<void> {
+    const { HttpService } = require('@nestjs/axios');
+    const httpService = new HttpService();
+
+    const payload = {
+      message,
+      sessionId,
+      userRole,
+      timestamp: new Date().toISOString(),
+      auth_token: this.extractAuthToken(request)
+    };
+
+    res.setHeader('Content-Type', 'text/event-stream');
+    res.setHeader('Cache-Control', 'no-cache');
+    res.setHeader('Connection', 'keep-alive');
+    res.setHeader('X-Accel-Buffering', 'no');
+    res.flushHeaders();
+
+    const startTime = Date.now();
+    try {
+      const upstream = await httpService.axiosRef.post(`${this.orchestratorUrl}/chat/stream`, payload, {
+        headers: { 'Content-Type': 'application/json' },
+        responseType: 'stream'
+      });
+
+      upstream.data.once('data', () => {
+        this.logger.log(`Chat stream time to first byte: ${Date.now() - startTime}ms`);
+      });
+      res.on('close', () => upstream.data.destroy());
+      upstream.data.pipe(res);
+    } catch (error) {
+      this.logger.error('Error relaying orchestrator stream:', (error as Error).message);
+      res.write(`event: error\ndata: ${JSON.stringify({ error: 'Unable to connect to orchestrator service' })}\n\n`);
+      res.end();
+    }
+  }
+
   getOrchestratorStatus(): { running: boolean; ready: boolean; url: string } {
     return {
       running: this.isReady,
@@ -16,9 +16,12 @@ export class LoggingInterceptor implements NestInterceptor {
     const request = context.switchToHttp().getRequest();
     const { method, url, body, query } = request;
     const now = Date.now();
+    // W3C traceparent from the orchestrator: 00-<trace id>-<parent span id>-<flags>
+    const traceId = String(request.headers['traceparent'] || '').split('-')[1];
+    const trace = traceId ? ` [trace ${traceId}]` : '';
 
     this.loggerService.log(
-      `Incoming Request: ${method} ${url} - Query: ${JSON.stringify(query)} - Body: ${JSON.stringify(body)}`,
+      `Incoming Request: ${method} ${url}${trace} - Query: ${JSON.stringify(query)} - Body: ${JSON.stringify(body)}`,
       'http-interceptor'
     );
 
@@ -27,7 +30,7 @@ export class LoggingInterceptor implements NestInterceptor {
       .pipe(
         tap(() =>
           this.loggerService.log(
-            `Outgoing Response: ${method} ${url} - ${Date.now() - now}ms`,
+            `Outgoing Response: ${method} ${url}${trace} - ${Date.now() - now}ms`,
             'http-interceptor'
           ),
         ),
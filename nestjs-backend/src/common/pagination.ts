@@ -0,0 +1,57 @@
+import { BadRequestException } from '@nestjs/common';
+
+export const DEFAULT_PAGE_LIMIT = 50;
+export const MAX_PAGE_LIMIT = 200;
+
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+export function encodeCursor(id: string): string {
+  return Buffer.from(id, 'utf8').toString('base64url');
+}
+
+export function decodeCursor(cursor: string): string {
+  return Buffer.from(cursor, 'base64url').toString('utf8');
+}
+
+export function parseLimit(limit?: string): number {
+  const parsed = parseInt(limit ?? '', 10);
+  if (isNaN(parsed) || parsed < 1) {
+    return DEFAULT_PAGE_LIMIT;
+  }
+  return Math.min(parsed, MAX_PAGE_LIMIT);
+}
+
+/**
+ * Build a page from rows fetched with `take(limit + 1)`: the extra row only
+ * signals that another page exists.
+ */
+export function toPage<T>(rows: T[], limit: number, idOf: (row: T) => string): Page<T> {
+  const items = rows.slice(0, limit);
+  const hasMore = rows.length > limit;
+  return {
+    items,
+    next_cursor: hasMore ? encodeCursor(idOf(items[items.length - 1])) : null,
+  };
+}
+
+const DATE_ONLY = /^\d{4}-\d{2}-\d{2}$/;
+
+/**
+ * Condition for an inclusive "to" date filter. A date-only value (YYYY-MM-DD)
+ * covers that whole day, so it is compared as `< next day`; a full timestamp
+ * is compared with `<=` as given.
+ */
+export function dateToCondition(column: string, param: string, value: string): [string, Record<string, string>] {
+  if (!DATE_ONLY.test(value)) {
+    return [`${column} <= :${param}`, { [param]: value }];
+  }
+  const nextDay = new Date(`${value}T00:00:00Z`);
+  if (isNaN(nextDay.getTime())) {
+    throw new BadRequestException(`Invalid date: ${value}`);
+  }
+  nextDay.setUTCDate(nextDay.getUTCDate() + 1);
+  return [`${column} < :${param}`, { [param]: nextDay.toISOString().slice(0, 10) }];
+}
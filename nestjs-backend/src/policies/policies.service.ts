@@ -5,6 +5,17 @@ import { Policy } from '../entities/policy.entity';
 import { User } from '../entities/user.entity';
 import { CreatePolicyDto } from './dto/create-policy.dto';
 import { UpdatePolicyDto } from './dto/update-policy.dto';
+import { Page, dateToCondition, decodeCursor, toPage } from '../common/pagination';
+
+export interface PolicyPageOptions {
+  cursor?: string;
+  limit: number;
+  status?: 'active' | 'expired';
+  userId?: string;
+  planName?: string;
+  startFrom?: string;
+  startTo?: string;
+}
 
 @Injectable()
 export class PoliciesService {
@@ -74,6 +85,36 @@ export class PoliciesService {
     return this.policyRepository.find({ relations: ['user'] });
   }
 
+  async findPage(options: PolicyPageOptions): Promise<Page<Policy>> {
+    const query = this.policyRepository
+      .createQueryBuilder('policy')
+      .orderBy('policy.policy_id', 'ASC')
+      .take(options.limit + 1);
+
+    if (options.cursor) {
+      query.andWhere('policy.policy_id > :cursor', { cursor: decodeCursor(options.cursor) });
+    }
+    if (options.status === 'active') {
+      query.andWhere('policy.end_date >= :now', { now: new Date() });
+    } else if (options.status === 'expired') {
+      query.andWhere('policy.end_date < :now', { now: new Date() });
+    }
+    if (options.userId) {
+      query.andWhere('policy.user_id = :userId', { userId: options.userId });
+    }
+    if (options.planName) {
+      query.andWhere('policy.plan_name = :planName', { planName: options.planName });
+    }
+    if (options.startFrom) {
+      query.andWhere('policy.start_date >= :startFrom', { startFrom: options.startFrom });
+    }
+    if (options.startTo) {
+      query.andWhere(...dateToCondition('policy.start_date', 'startTo', options.startTo));
+    }
+
+    return toPage(await query.getMany(), options.limit, policy => policy.policy_id);
+  }
+
   async findOne(id: string): Promise<Policy> {
     const policy = await this.policyRepository.findOne({ where: { policy_id: id }, relations: ['user'] });
     if (!policy) {
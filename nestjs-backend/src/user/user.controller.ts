@@ -9,6 +9,7 @@ import {
   UseGuards,
   Request,
   NotFoundException,
+  Header,
 } from '@nestjs/common';
 import { ClaimsService } from '../claims/claims.service';
 import { PoliciesService } from '../policies/policies.service';
@@ -47,6 +48,8 @@ export class UserController {
 
   // Profile Management
   @Get('profile')
+  @Header('Cache-Control', 'private, no-cache')
+  @Header('Vary', 'Authorization')
   @ApiBearerAuth()
   @ApiOperation({ summary: 'Get user profile' })
   @ApiResponse({ status: 200, description: 'User profile retrieved successfully' })
@@ -80,6 +83,8 @@ export class UserController {
 
   // Policy Management (User sees only their policies)
   @Get('policies')
+  @Header('Cache-Control', 'private, no-cache')
+  @Header('Vary', 'Authorization')
   @ApiBearerAuth()
   @ApiOperation({ summary: 'Get user policies' })
   @ApiResponse({ status: 200, description: 'List of user policies' })
@@ -145,6 +150,8 @@ export class UserController {
   }
 
   @Get('claims')
+  @Header('Cache-Control', 'private, no-cache')
+  @Header('Vary', 'Authorization')
   @ApiBearerAuth()
   @ApiOperation({ summary: 'Get user claims' })
   @ApiResponse({ status: 200, description: 'List of user claims' })
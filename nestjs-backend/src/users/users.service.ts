@@ -5,6 +5,15 @@ import { User } from '../entities/user.entity';
 import { CreateUserDto } from './dto/create-user.dto';
 import { UpdateUserEmailDto } from './dto/update-user-email.dto';
 import * as bcrypt from 'bcrypt';
+import { Page, dateToCondition, decodeCursor, toPage } from '../common/pagination';
+
+export interface UserPageOptions {
+  cursor?: string;
+  limit: number;
+  role?: string;
+  createdFrom?: string;
+  createdTo?: string;
+}
 
 @Injectable()
 export class UsersService {
@@ -36,6 +45,28 @@ export class UsersService {
     return this.userRepository.find();
   }
 
+  async findPage(options: UserPageOptions): Promise<Page<User>> {
+    const query = this.userRepository
+      .createQueryBuilder('user')
+      .orderBy('user.user_id', 'ASC')
+      .take(options.limit + 1);
+
+    if (options.cursor) {
+      query.andWhere('user.user_id > :cursor', { cursor: decodeCursor(options.cursor) });
+    }
+    if (options.role) {
+      query.andWhere('user.role = :role', { role: options.role });
+    }
+    if (options.createdFrom) {
+      query.andWhere('user.created_at >= :createdFrom', { createdFrom: options.createdFrom });
+    }
+    if (options.createdTo) {
+      query.andWhere(...dateToCondition('user.created_at', 'createdTo', options.createdTo));
+    }
+
+    return toPage(await query.getMany(), options.limit, user => user.user_id);
+  }
+
   async findOne(id: string): Promise<User> {
     const user = await this.userRepository.findOne({ where: { user_id: id } });
     if (!user) {
@@ -82,6 +82,23 @@ describe('AdminController (e2e)', () => {
         });
     });
 
+    it('GET /admin/users?limit=1 - should return a page with a cursor', async () => {
+      const first = await request(app.getHttpServer())
+        .get('/admin/users?limit=1')
+        .set('Authorization', `Bearer ${adminToken}`)
+        .expect(200);
+
+      expect(first.body.items).toHaveLength(1);
+      expect(first.body.next_cursor).toBeTruthy();
+
+      const second = await request(app.getHttpServer())
+        .get(`/admin/users?limit=1&cursor=${first.body.next_cursor}`)
+        .set('Authorization', `Bearer ${adminToken}`)
+        .expect(200);
+
+      expect(second.body.items[0].user_id).not.toEqual(first.body.items[0].user_id);
+    });
+
     it('GET /admin/users - should return 403 with user token', () => {
       return request(app.getHttpServer())
         .get('/admin/users')
@@ -175,6 +192,27 @@ describe('AdminController (e2e)', () => {
         });
     });
 
+    it('GET /admin/policies?status=active - should return a page of active policies', () => {
+      return request(app.getHttpServer())
+        .get('/admin/policies?status=active&limit=5')
+        .set('Authorization', `Bearer ${adminToken}`)
+        .expect(200)
+        .expect((res) => {
+          expect(Array.isArray(res.body.items)).toBe(true);
+          expect(res.body.items.length).toBeLessThanOrEqual(5);
+          res.body.items.forEach((policy: any) => {
+            expect(new Date(policy.end_date).getTime()).toBeGreaterThanOrEqual(Date.now() - 1000);
+          });
+        });
+    });
+
+    it('GET /admin/policies?status=unknown - should return 400', () => {
+      return request(app.getHttpServer())
+        .get('/admin/policies?status=unknown')
+        .set('Authorization', `Bearer ${adminToken}`)
+        .expect(400);
+    });
+
     it('GET /admin/policies - should return 403 with user token', () => {
       return request(app.getHttpServer())
         .get('/admin/policies')
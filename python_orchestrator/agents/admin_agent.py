@@ -1,37 +1,52 @@
 import httpx
 import os
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Optional
+from .cache import invalidates
+from .http_client import get_backend_client
+from .pagination import DEFAULT_PAGE_SIZE, page_params, iter_pages
 
 logger = logging.getLogger(__name__)
 NESTJS_BACKEND_URL = os.getenv("NESTJS_BACKEND_URL", "http://localhost:3000")
 
-async def get_all_users(auth_token: str) -> List[Dict[str, Any]]:
-    """Get all users (admin only)."""
+async def get_all_users(
+    auth_token: str,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    role: Optional[str] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get one page of users (admin only), filtered by role and creation date range."""
     url = f"{NESTJS_BACKEND_URL}/admin/users"
     headers = {"Authorization": f"Bearer {auth_token}"}
+    params = page_params(cursor, limit, role=role, created_from=created_from, created_to=created_to)
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_backend_client()
+        response = await client.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error fetching all users: {e.response.status_code}")
         raise ValueError(f"API error fetching all users: {e.response.text}")
     except httpx.RequestError as e:
         raise ValueError("Could not connect to backend to fetch all users.")
 
+def iter_all_users(auth_token: str, page_size: int = DEFAULT_PAGE_SIZE, **filters) -> AsyncIterator[Dict[str, Any]]:
+    """Iterate over all users matching the filters, one page in memory at a time."""
+    return iter_pages(get_all_users, auth_token, page_size, **filters)
+
 async def get_user_by_id_admin(user_id: str, auth_token: str) -> Dict[str, Any]:
     """Get specific user details (admin only)."""
     url = f"{NESTJS_BACKEND_URL}/admin/users/{user_id}"
     headers = {"Authorization": f"Bearer {auth_token}"}
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_backend_client()
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise ValueError(f"User with ID {user_id} not found.")
@@ -39,16 +54,17 @@ async def get_user_by_id_admin(user_id: str, auth_token: str) -> Dict[str, Any]:
     except httpx.RequestError as e:
         raise ValueError("Could not connect to backend to fetch user.")
 
+@invalidates("/user/profile")
 async def create_user(user_data: Dict[str, Any], auth_token: str) -> Dict[str, Any]:
     """Create new user (admin only)."""
     url = f"{NESTJS_BACKEND_URL}/admin/users"
     headers = {"Authorization": f"Bearer {auth_token}"}
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=user_data, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_backend_client()
+        response = await client.post(url, json=user_data, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error creating user: {e.response.status_code}")
         raise ValueError(f"API error creating user: {e.response.text}")
@@ -61,10 +77,10 @@ async def upload_knowledge_base(kb_data: Dict[str, Any], auth_token: str) -> Dic
     headers = {"Authorization": f"Bearer {auth_token}"}
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=kb_data, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_backend_client()
+        response = await client.post(url, json=kb_data, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error uploading knowledge base: {e.response.status_code}")
         raise ValueError(f"API error uploading knowledge base: {e.response.text}")
@@ -77,10 +93,10 @@ async def delete_knowledge_base_entry(kb_id: str, auth_token: str) -> Dict[str,
     headers = {"Authorization": f"Bearer {auth_token}"}
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_backend_client()
+        response = await client.delete(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise ValueError(f"Knowledge base entry with ID {kb_id} not found.")
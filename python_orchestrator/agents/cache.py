@@ -0,0 +1,115 @@
+import os
+import copy
+import time
+import hashlib
+import inspect
+import functools
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Tuple
+from python_orchestrator.utils import metrics
+from python_orchestrator.utils import prometheus_metrics as prom
+
+CACHE_TTL_SECONDS = float(os.getenv("AGENT_CACHE_TTL_SECONDS", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("AGENT_CACHE_MAX_ENTRIES", "1000"))
+
+
+def user_identity(auth_token: Optional[str]) -> str:
+    """Stable, non-reversible identity for a token, used in cache keys."""
+    return hashlib.sha256((auth_token or "").encode()).hexdigest()[:16]
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, ttl: float = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, endpoints: Iterable[str], identity: Optional[str] = None) -> int:
+        """Drop entries for the given endpoints, optionally for one user only."""
+        endpoints = set(endpoints)
+        stale = [k for k in self._entries
+                 if k[1] in endpoints and (identity is None or k[0] == identity)]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def clear(self):
+        self._entries.clear()
+
+
+_cache = TTLCache()
+_cached_functions = set()
+
+
+def _split_args(func, args, kwargs) -> Tuple[str, tuple]:
+    """Return the auth token and the remaining call arguments as a hashable tuple."""
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    params = dict(bound.arguments)
+    token = params.pop("auth_token", None)
+    return token, tuple(sorted(params.items()))
+
+
+def cached(endpoint: str):
+    """Cache a read-only agent call per (user identity, endpoint, params)."""
+    def decorator(func):
+        _cached_functions.add(func.__name__)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            token, params = _split_args(func, args, kwargs)
+            key = (user_identity(token), endpoint, params)
+            hit, value = _cache.get(key)
+            metrics.increment("backend_cache_requests", tool=func.__name__, result="hit" if hit else "miss")
+            prom.cache_lookup("backend", hit)
+            if hit:
+                return copy.deepcopy(value)
+            value = await func(*args, **kwargs)
+            _cache.set(key, value)
+            return copy.deepcopy(value)
+        return wrapper
+    return decorator
+
+
+def invalidates(*endpoints: str, per_user: bool = False):
+    """After a successful write, drop cached reads for the affected endpoints."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await func(*args, **kwargs)
+            identity = user_identity(_split_args(func, args, kwargs)[0]) if per_user else None
+            dropped = _cache.invalidate(endpoints, identity)
+            metrics.increment("backend_cache_invalidations", amount=dropped, tool=func.__name__)
+            return result
+        return wrapper
+    return decorator
+
+
+def get_cache_stats() -> dict:
+    """Hit rate per cached agent call."""
+    tools = {}
+    for name in sorted(_cached_functions):
+        hits = metrics.get_counter("backend_cache_requests", tool=name, result="hit")
+        misses = metrics.get_counter("backend_cache_requests", tool=name, result="miss")
+        total = hits + misses
+        tools[name] = {"hits": int(hits), "misses": int(misses), "hit_rate": hits / total if total else 0.0}
+    return {"entries": len(_cache._entries), "ttl_seconds": _cache.ttl, "tools": tools}
@@ -1,7 +1,10 @@
 import httpx
 import os
+import asyncio
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from .cache import cached
+from .http_client import get_backend_client, get_json
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -9,6 +12,10 @@ logger = logging.getLogger(__name__)
 # Get NestJS backend URL from environment variables
 NESTJS_BACKEND_URL = os.getenv("NESTJS_BACKEND_URL", "http://localhost:3000")
 
+# Maximum concurrent history requests in get_claims_with_history
+CLAIM_HISTORY_CONCURRENCY = int(os.getenv("CLAIM_HISTORY_CONCURRENCY", "5"))
+
+@cached("/user/claims")
 async def get_user_claims(auth_token: str, active_only: bool = False) -> List[Dict[str, Any]]:
     """
     Retrieve current user's claims from the NestJS backend.
@@ -32,10 +39,7 @@ async def get_user_claims(auth_token: str, active_only: bool = False) -> List[Di
         headers["Authorization"] = f"Bearer {auth_token}"
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()  # Raises an exception for 4XX/5XX errors
-            return response.json()
+        return await get_json(url, headers=headers)
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error fetching user claims: {e.response.status_code} - {e.response.text}")
         raise ValueError(f"API error fetching user claims: {e.response.text}")
@@ -63,10 +67,10 @@ async def get_user_claim_by_id(claim_id: str, auth_token: str) -> Dict[str, Any]
         headers["Authorization"] = f"Bearer {auth_token}"
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_backend_client()
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error fetching claim {claim_id}: {e.response.status_code} - {e.response.text}")
         if e.response.status_code == 404:
@@ -96,10 +100,10 @@ async def get_claim_history(claim_id: str, auth_token: str) -> List[Dict[str, An
         headers["Authorization"] = f"Bearer {auth_token}"
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_backend_client()
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error fetching claim history for {claim_id}: {e.response.status_code} - {e.response.text}")
         if e.response.status_code == 404:
@@ -108,3 +112,45 @@ async def get_claim_history(claim_id: str, auth_token: str) -> List[Dict[str, An
     except httpx.RequestError as e:
         logger.error(f"Request error fetching claim history for {claim_id}: {e}")
         raise ValueError(f"Could not connect to NestJS backend to fetch claim history for {claim_id}.")
+
+async def get_claims_with_history(
+    auth_token: str,
+    claim_ids: Optional[List[str]] = None,
+    active_only: bool = False,
+    max_concurrency: int = CLAIM_HISTORY_CONCURRENCY
+) -> List[Dict[str, Any]]:
+    """
+    Retrieve the current user's claims, each merged with its history.
+
+    The backend has no batch history endpoint, so histories are fetched
+    concurrently, at most max_concurrency at a time.
+
+    Args:
+        auth_token (str): JWT authentication token.
+        claim_ids (List[str], optional): Only these claims; defaults to all of the user's claims.
+        active_only (bool): If True, only include active claims. Ignored when claim_ids
+            are given: explicitly requested claims are returned whatever their status,
+            so an inactive claim is not reported as missing.
+        max_concurrency (int): Maximum number of history requests in flight.
+
+    Returns:
+        List[Dict[str, Any]]: Claims with a "history" list, or an "error" for claims that could not be loaded.
+    """
+    claims = await get_user_claims(auth_token, active_only and not claim_ids)
+    if claim_ids:
+        by_id = {claim.get("claim_id"): claim for claim in claims}
+        claims = [by_id.get(claim_id, {"claim_id": claim_id, "error": f"Claim with ID {claim_id} not found."})
+                  for claim_id in claim_ids]
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def with_history(claim: Dict[str, Any]) -> Dict[str, Any]:
+        if "error" in claim:
+            return claim
+        async with semaphore:
+            try:
+                return {**claim, "history": await get_claim_history(claim["claim_id"], auth_token)}
+            except ValueError as e:
+                return {**claim, "error": str(e)}
+
+    return list(await asyncio.gather(*(with_history(claim) for claim in claims)))
@@ -0,0 +1,277 @@
+import os
+import copy
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import httpx
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from python_orchestrator.utils import metrics, deadline, tracing
+from python_orchestrator.utils import prometheus_metrics as prom
+from .resilience import ResilientTransport, route_of
+from .cache import TTLCache, user_identity
+
+logger = logging.getLogger(__name__)
+
+BACKEND_MAX_CONNECTIONS = int(os.getenv("BACKEND_MAX_CONNECTIONS", "50"))
+BACKEND_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("BACKEND_MAX_KEEPALIVE_CONNECTIONS", "20"))
+BACKEND_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("BACKEND_KEEPALIVE_EXPIRY_SECONDS", "30"))
+BACKEND_TIMEOUT_SECONDS = float(os.getenv("BACKEND_TIMEOUT_SECONDS", "10"))
+BACKEND_HTTP2 = os.getenv("BACKEND_HTTP2", "false").lower() == "true"
+BACKEND_COALESCE_GETS = os.getenv("BACKEND_COALESCE_GETS", "true").lower() == "true"
+
+# Read timeouts for routes that are known to be slower than the default,
+# matched by path prefix
+ROUTE_TIMEOUTS = {
+    "/orchestrator/rag/search-vector": 30.0,
+    "/admin/kb": 60.0,
+    "/user/premium/calculate": 20.0,
+}
+
+BACKEND_REVALIDATION_TTL_SECONDS = float(os.getenv("BACKEND_REVALIDATION_TTL_SECONDS", "3600"))
+
+# Shared pooled client for every NestJS call made by the agents package
+_backend_client: Optional[httpx.AsyncClient] = None
+_resilient_transport: Optional[ResilientTransport] = None
+
+
+def timeout_for(url: str) -> httpx.Timeout:
+    """
+    Timeout for a request URL: the route's read timeout, or the default,
+    each capped at what is left of the current request deadline.
+    """
+    path = urlsplit(url).path
+    timeout = httpx.Timeout(BACKEND_TIMEOUT_SECONDS)
+    for prefix, seconds in ROUTE_TIMEOUTS.items():
+        if path.startswith(prefix):
+            timeout = httpx.Timeout(BACKEND_TIMEOUT_SECONDS, read=seconds)
+            break
+    return httpx.Timeout(**{phase: deadline.cap(seconds) for phase, seconds in timeout.as_dict().items()})
+
+
+async def _apply_route_timeout(request: httpx.Request):
+    if deadline.remaining() == 0:
+        metrics.increment("backend_deadline_exceeded", route=route_of(request.url))
+        raise httpx.TimeoutException("Request deadline exceeded before calling the backend", request=request)
+    request.extensions["timeout"] = timeout_for(str(request.url)).as_dict()
+
+
+class TracingTransport(httpx.AsyncBaseTransport):
+    """
+    Records a client span for every request sent to the backend (each retry
+    and hedge included) and propagates it to NestJS as a W3C traceparent header.
+    The span ends when the response headers arrive.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with tracing.span(f"http {request.method} {route_of(request.url)}", tracing.KIND_CLIENT,
+                          **{"http.request.method": request.method, "url.path": request.url.path}) as span:
+            if span is not None:
+                request.headers["traceparent"] = span.traceparent
+            prom.BACKEND_IN_FLIGHT.inc()
+            try:
+                response = await self._transport.handle_async_request(request)
+            finally:
+                prom.BACKEND_IN_FLIGHT.dec()
+            if span is not None:
+                span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class CoalescingTransport(httpx.AsyncBaseTransport):
+    """
+    Single-flight transport: concurrent GETs for the same URL and the same
+    Authorization header share one in-flight backend request. Each caller
+    receives its own copy of the response. The shared request is cancelled
+    once every caller waiting on it has been cancelled.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+        # Per key: [shared fetch task, number of callers waiting on it]
+        self._in_flight: Dict[Tuple[str, ...], list] = {}
+
+    @staticmethod
+    def _key(request: httpx.Request) -> Tuple[str, ...]:
+        auth = hashlib.sha256(request.headers.get("Authorization", "").encode()).hexdigest()
+        # Conditional headers are part of the key: a 304 only answers the caller that asked for one
+        return (str(request.url), auth, request.headers.get("If-None-Match", ""),
+                request.headers.get("If-Modified-Since", ""))
+
+    async def _fetch(self, request: httpx.Request):
+        response = await self._transport.handle_async_request(request)
+        try:
+            content = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+        return response.status_code, response.headers, content, response.extensions
+
+    def _forget(self, key, entry):
+        if self._in_flight.get(key) is entry:
+            del self._in_flight[key]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self._transport.handle_async_request(request)
+        key = self._key(request)
+        entry = self._in_flight.get(key)
+        metrics.increment("backend_get_requests", result="coalesced" if entry else "sent")
+        if entry is None:
+            entry = self._in_flight[key] = [asyncio.ensure_future(self._fetch(request)), 0]
+            entry[0].add_done_callback(lambda _: self._forget(key, entry))
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # Shielded so one caller's cancellation does not fail the others
+            status_code, headers, content, extensions = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                # Nobody is waiting any more: stop the backend request too
+                self._forget(key, entry)
+                task.cancel()
+            raise
+        entry[1] -= 1
+        return httpx.Response(status_code, headers=headers, content=content, extensions=extensions)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def get_coalescing_stats() -> dict:
+    """Share of backend GETs that were served by another caller's in-flight request."""
+    sent = metrics.get_counter("backend_get_requests", result="sent")
+    coalesced = metrics.get_counter("backend_get_requests", result="coalesced")
+    total = sent + coalesced
+    return {
+        "enabled": BACKEND_COALESCE_GETS,
+        "sent": int(sent),
+        "coalesced": int(coalesced),
+        "coalescing_rate": coalesced / total if total else 0.0,
+    }
+
+
+# Parsed bodies with their validators, per (user identity, URL):
+# (etag, last_modified, parsed body, body bytes, parse ms)
+_validated_bodies = TTLCache(ttl=BACKEND_REVALIDATION_TTL_SECONDS)
+
+
+async def get_json(url: str, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    GET a JSON resource with ETag/Last-Modified revalidation. When the backend
+    answers 304 Not Modified, the previously parsed body is reused. Raises
+    httpx.HTTPStatusError for error responses, like raise_for_status().
+    """
+    headers = dict(headers or {})
+    request_url = str(httpx.URL(url, params=params))
+    key = (user_identity(headers.get("Authorization", "").removeprefix("Bearer ")), request_url)
+    hit, stored = _validated_bodies.get(key)
+    prom.cache_lookup("revalidation", hit)
+    if hit:
+        etag, last_modified = stored[0], stored[1]
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    response = await get_backend_client().get(request_url, headers=headers)
+    if hit and response.status_code == 304:
+        _, _, body, size, parse_ms = stored
+        metrics.increment("backend_revalidations", result="not_modified")
+        metrics.increment("backend_revalidation_bytes_saved", size)
+        metrics.increment("backend_revalidation_parse_ms_saved", parse_ms)
+        return copy.deepcopy(body)
+    response.raise_for_status()
+
+    start = time.perf_counter()
+    body = json.loads(response.content)
+    parse_ms = (time.perf_counter() - start) * 1000
+    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    if etag or last_modified:
+        _validated_bodies.set(key, (etag, last_modified, copy.deepcopy(body), len(response.content), parse_ms))
+    metrics.increment("backend_revalidations", result="modified" if hit else "unconditional")
+    return body
+
+
+def get_revalidation_stats() -> dict:
+    """Conditional GET outcomes and the transfer and parse work saved by 304s."""
+    not_modified = metrics.get_counter("backend_revalidations", result="not_modified")
+    modified = metrics.get_counter("backend_revalidations", result="modified")
+    return {
+        "stored_bodies": len(_validated_bodies._entries),
+        "not_modified": int(not_modified),
+        "modified": int(modified),
+        "unconditional": int(metrics.get_counter("backend_revalidations", result="unconditional")),
+        "not_modified_rate": not_modified / (not_modified + modified) if not_modified + modified else 0.0,
+        "bytes_saved": int(metrics.get_counter("backend_revalidation_bytes_saved")),
+        "parse_ms_saved": metrics.get_counter("backend_revalidation_parse_ms_saved"),
+    }
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("BACKEND_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+        return False
+
+
+def get_backend_client() -> httpx.AsyncClient:
+    """Return the shared, pooled async client used for all NestJS calls."""
+    global _backend_client, _resilient_transport
+    if _backend_client is None or _backend_client.is_closed:
+        _resilient_transport = ResilientTransport(TracingTransport(httpx.AsyncHTTPTransport(
+            http2=BACKEND_HTTP2 and _http2_available(),
+            limits=httpx.Limits(
+                max_connections=BACKEND_MAX_CONNECTIONS,
+                max_keepalive_connections=BACKEND_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=BACKEND_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )))
+        # Coalescing sits in front so callers sharing a request also share its retries
+        transport = _resilient_transport
+        if BACKEND_COALESCE_GETS:
+            transport = CoalescingTransport(transport)
+        _backend_client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(BACKEND_TIMEOUT_SECONDS),
+            event_hooks={"request": [_apply_route_timeout]},
+        )
+    return _backend_client
+
+
+def get_backend_pool():
+    """The connection pool behind the shared client, or None before it is created."""
+    if _resilient_transport is None:
+        return None
+    http_transport = _resilient_transport._transport._transport
+    return getattr(http_transport, "_pool", None)
+
+
+def get_resilience_stats() -> dict:
+    """Circuit breaker state, retries and hedged reads for backend calls."""
+    return {
+        "breaker_state": _resilient_transport.breaker.state if _resilient_transport else None,
+        "breaker_opened": int(metrics.get_counter("backend_breaker_opened")),
+        "breaker_rejections": int(metrics.get_counter("backend_breaker_rejections")),
+        "retry_budget_exhausted": int(metrics.get_counter("backend_retry_budget_exhausted")),
+        "hedges_sent": int(metrics.get_counter("backend_hedges", result="sent")),
+        "hedges_won": int(metrics.get_counter("backend_hedges", result="won")),
+    }
+
+
+async def close_backend_client():
+    """Close the shared client (called on application shutdown)."""
+    global _backend_client
+    if _backend_client is not None and not _backend_client.is_closed:
+        await _backend_client.aclose()
+    _backend_client = None
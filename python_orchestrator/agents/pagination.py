@@ -0,0 +1,33 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def page_params(cursor=None, limit: int = DEFAULT_PAGE_SIZE, **filters) -> Dict[str, Any]:
+    """Query parameters for a paged backend listing; unset filters are omitted."""
+    params = {"limit": limit, **filters}
+    if cursor:
+        params["cursor"] = cursor
+    return {k: v for k, v in params.items() if v is not None}
+
+
+async def iter_pages(
+    fetch_page: Callable[..., Awaitable[Dict[str, Any]]],
+    auth_token: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    **filters
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield every item of a cursor-paginated listing, holding one page in memory at a time.
+
+    fetch_page must accept (auth_token, cursor=..., limit=..., **filters) and
+    return {"items": [...], "next_cursor": str | None}.
+    """
+    cursor = None
+    while True:
+        page = await fetch_page(auth_token, cursor=cursor, limit=page_size, **filters)
+        for item in page["items"]:
+            yield item
+        cursor = page.get("next_cursor")
+        if not cursor:
+            return
@@ -1,11 +1,15 @@
 import httpx
 import os
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Optional
+from .cache import cached, invalidates
+from .http_client import get_backend_client, get_json
+from .pagination import DEFAULT_PAGE_SIZE, page_params, iter_pages
 
 logger = logging.getLogger(__name__)
 NESTJS_BACKEND_URL = os.getenv("NESTJS_BACKEND_URL", "http://localhost:3000")
 
+@cached("/user/policies")
 async def get_user_policies(auth_token: str, active_only: bool = False) -> List[Dict[str, Any]]:
     """Get current user's policies."""
     url = f"{NESTJS_BACKEND_URL}/user/policies"
@@ -15,10 +19,7 @@ async def get_user_policies(auth_token: str, active_only: bool = False) -> List[
     headers = {"Authorization": f"Bearer {auth_token}"}
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        return await get_json(url, headers=headers)
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error fetching user policies: {e.response.status_code}")
         raise ValueError(f"API error fetching user policies: {e.response.text}")
@@ -32,10 +33,10 @@ async def get_user_policy_by_id(policy_id: str, auth_token: str) -> Dict[str, An
     headers = {"Authorization": f"Bearer {auth_token}"}
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_backend_client()
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise ValueError(f"Policy with ID {policy_id} not found.")
@@ -43,32 +44,48 @@ async def get_user_policy_by_id(policy_id: str, auth_token: str) -> Dict[str, An
     except httpx.RequestError as e:
         raise ValueError("Could not connect to backend to fetch policy.")
 
-async def get_all_policies(auth_token: str) -> List[Dict[str, Any]]:
-    """Get all policies (admin only)."""
+async def get_all_policies(
+    auth_token: str,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    status: Optional[str] = None,
+    user_id: Optional[str] = None,
+    plan_name: Optional[str] = None,
+    start_from: Optional[str] = None,
+    start_to: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get one page of policies (admin only), filtered by status, holder, plan and start date range."""
     url = f"{NESTJS_BACKEND_URL}/admin/policies"
     headers = {"Authorization": f"Bearer {auth_token}"}
+    params = page_params(cursor, limit, status=status, user_id=user_id, plan_name=plan_name,
+                         start_from=start_from, start_to=start_to)
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_backend_client()
+        response = await client.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error fetching all policies: {e.response.status_code}")
         raise ValueError(f"API error fetching all policies: {e.response.text}")
     except httpx.RequestError as e:
         raise ValueError("Could not connect to backend to fetch all policies.")
 
+def iter_all_policies(auth_token: str, page_size: int = DEFAULT_PAGE_SIZE, **filters) -> AsyncIterator[Dict[str, Any]]:
+    """Iterate over all policies matching the filters, one page in memory at a time."""
+    return iter_pages(get_all_policies, auth_token, page_size, **filters)
+
+@invalidates("/user/policies")
 async def create_policy(policy_data: Dict[str, Any], auth_token: str) -> Dict[str, Any]:
     """Create new policy (admin only)."""
     url = f"{NESTJS_BACKEND_URL}/admin/policies"
     headers = {"Authorization": f"Bearer {auth_token}"}
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=policy_data, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        client = get_backend_client()
+        response = await client.post(url, json=policy_data, headers=headers)
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error creating policy: {e.response.status_code}")
         raise ValueError(f"API error creating policy: {e.response.text}")
@@ -0,0 +1,219 @@
+import os
+import time
+import random
+import asyncio
+import logging
+import httpx
+from typing import Optional
+from urllib.parse import urlsplit
+from python_orchestrator.utils import metrics, deadline
+
+logger = logging.getLogger(__name__)
+
+BACKEND_RETRY_ATTEMPTS = int(os.getenv("BACKEND_RETRY_ATTEMPTS", "2"))
+BACKEND_RETRY_BACKOFF_SECONDS = float(os.getenv("BACKEND_RETRY_BACKOFF_SECONDS", "0.1"))
+# Retries may add at most this fraction of extra load, plus a small steady allowance
+BACKEND_RETRY_BUDGET_RATIO = float(os.getenv("BACKEND_RETRY_BUDGET_RATIO", "0.2"))
+BACKEND_RETRY_MIN_PER_SECOND = float(os.getenv("BACKEND_RETRY_MIN_PER_SECOND", "1"))
+BACKEND_BREAKER_FAILURE_THRESHOLD = int(os.getenv("BACKEND_BREAKER_FAILURE_THRESHOLD", "5"))
+BACKEND_BREAKER_RESET_SECONDS = float(os.getenv("BACKEND_BREAKER_RESET_SECONDS", "30"))
+BACKEND_HEDGE_ENABLED = os.getenv("BACKEND_HEDGE_ENABLED", "false").lower() == "true"
+BACKEND_HEDGE_DELAY_MS = float(os.getenv("BACKEND_HEDGE_DELAY_MS", "200"))
+
+RETRYABLE_STATUS = {502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD"}
+HEDGE_MIN_SAMPLES = 20
+MAX_RETRY_BALANCE = 10.0
+
+DEGRADED_MESSAGE = ("The insurance backend is currently degraded and not responding. "
+                    "Tell the user their account data is temporarily unavailable and to try again shortly.")
+
+
+class BackendDegradedError(httpx.TransportError):
+    """Raised without contacting the backend while the circuit breaker is open."""
+
+
+def is_backend_degraded(error: BaseException) -> bool:
+    """True if the error, or any exception it was raised from, is a BackendDegradedError."""
+    while error is not None:
+        if isinstance(error, BackendDegradedError):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def route_of(url) -> str:
+    """Low-cardinality route label: the first two path segments."""
+    segments = [s for s in urlsplit(str(url)).path.split("/") if s]
+    return "/" + "/".join(segments[:2])
+
+
+class RetryBudget:
+    """Token bucket that lets retries (and hedges) add only a bounded share of load."""
+
+    def __init__(self, ratio: float = BACKEND_RETRY_BUDGET_RATIO,
+                 min_per_second: float = BACKEND_RETRY_MIN_PER_SECOND):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self._balance = 0.0
+        self._updated = time.monotonic()
+
+    def _refill(self, amount: float):
+        self._balance = min(MAX_RETRY_BALANCE, self._balance + amount)
+
+    def record_request(self):
+        self._refill(self.ratio)
+
+    def try_spend(self) -> bool:
+        now = time.monotonic()
+        self._refill((now - self._updated) * self.min_per_second)
+        self._updated = now
+        if self._balance >= 1:
+            self._balance -= 1
+            return True
+        metrics.increment("backend_retry_budget_exhausted")
+        return False
+
+
+class CircuitBreaker:
+    """
+    Opens after consecutive failures and fails fast until the reset timeout,
+    then lets a single trial request through (half-open).
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = BACKEND_BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = BACKEND_BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started = None
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        if self.state == self.OPEN and now - self._opened_at >= self.reset_seconds:
+            self.state = self.HALF_OPEN
+            self._trial_started = None
+        if self.state == self.HALF_OPEN:
+            # A trial that never reported back (e.g. cancelled) is replaced after the reset timeout
+            if self._trial_started is not None and now - self._trial_started < self.reset_seconds:
+                return False
+            self._trial_started = now
+            return True
+        return self.state == self.CLOSED
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info("Backend circuit closed")
+        self.state = self.CLOSED
+        self._failures = 0
+
+    def record_failure(self):
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Backend circuit opened after {self._failures} consecutive failures")
+                metrics.increment("backend_breaker_opened")
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper applying the backend resilience policy:
+    - jittered exponential-backoff retries for idempotent requests, under a retry budget
+    - a circuit breaker that fails fast with BackendDegradedError while open
+    - optional hedging: a duplicate GET after the route's p95 latency, first response wins
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport,
+                 max_retries: int = BACKEND_RETRY_ATTEMPTS,
+                 backoff_seconds: float = BACKEND_RETRY_BACKOFF_SECONDS,
+                 hedge: bool = BACKEND_HEDGE_ENABLED,
+                 hedge_delay_ms: float = BACKEND_HEDGE_DELAY_MS,
+                 budget: Optional[RetryBudget] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self._transport = transport
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.hedge = hedge
+        self.hedge_delay_ms = hedge_delay_ms
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except asyncio.CancelledError:
+            metrics.increment("backend_requests_cancelled", route=route_of(request.url))
+            raise
+        metrics.observe("backend_request_ms", (time.perf_counter() - start) * 1000, route=route_of(request.url))
+        return response
+
+    def _hedge_delay(self, request: httpx.Request) -> float:
+        latency = metrics.get_summary("backend_request_ms", route=route_of(request.url))
+        delay_ms = latency["p95"] if latency["count"] >= HEDGE_MIN_SAMPLES else self.hedge_delay_ms
+        return delay_ms / 1000
+
+    async def _send_hedged(self, request: httpx.Request) -> httpx.Response:
+        first = asyncio.ensure_future(self._send(request))
+        done, _ = await asyncio.wait({first}, timeout=self._hedge_delay(request))
+        if done or not self.budget.try_spend():
+            return await first
+        metrics.increment("backend_hedges", result="sent")
+        second = asyncio.ensure_future(self._send(request))
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None or not pending:
+                        if task is second:
+                            metrics.increment("backend_hedges", result="won")
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _may_retry(self, idempotent: bool, attempt: int) -> bool:
+        # No retry once the request deadline cannot cover another backoff
+        left = deadline.remaining()
+        if left is not None and left <= self.backoff_seconds * 2 ** (attempt + 1):
+            return False
+        return idempotent and attempt < self.max_retries and self.budget.try_spend()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        idempotent = request.method in IDEMPOTENT_METHODS
+        self.budget.record_request()
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                metrics.increment("backend_breaker_rejections")
+                raise BackendDegradedError(DEGRADED_MESSAGE, request=request)
+            try:
+                if idempotent and self.hedge:
+                    response = await self._send_hedged(request)
+                else:
+                    response = await self._send(request)
+            except httpx.TransportError:
+                self.breaker.record_failure()
+                if not self._may_retry(idempotent, attempt):
+                    raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+                if not self._may_retry(idempotent, attempt):
+                    return response
+                await response.aclose()
+            attempt += 1
+            metrics.increment("backend_retries", route=route_of(request.url))
+            await asyncio.sleep(random.uniform(0, self.backoff_seconds * 2 ** attempt))
+
+    async def aclose(self):
+        await self._transport.aclose()
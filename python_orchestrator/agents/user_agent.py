@@ -2,6 +2,8 @@ import httpx
 import os
 import sys
 from typing import Dict, Any
+from .cache import cached
+from .http_client import get_backend_client, get_json
 
 # Add parent directory to path to import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -32,11 +34,11 @@ async def get_user_by_id(user_id: str, auth_token: str = None) -> Dict[str, Any]
         headers["Authorization"] = f"Bearer {auth_token}"
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()  # Raises an exception for 4XX/5XX errors
-            logger.info(f"Successfully fetched user by ID: {user_id}")
-            return response.json()
+        client = get_backend_client()
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()  # Raises an exception for 4XX/5XX errors
+        logger.info(f"Successfully fetched user by ID: {user_id}")
+        return response.json()
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error fetching user by ID {user_id}: {e.response.status_code} - {e.response.text}")
         if e.response.status_code == 404:
@@ -46,6 +48,7 @@ async def get_user_by_id(user_id: str, auth_token: str = None) -> Dict[str, Any]
         logger.error(f"Request error fetching user by ID {user_id}: {e}")
         raise ValueError(f"Could not connect to NestJS backend to fetch user by ID {user_id}.")
 
+@cached("/user/profile")
 async def get_current_user_profile(auth_token: str) -> Dict[str, Any]:
     """
     Retrieve current user's profile using the user-specific endpoint.
@@ -66,11 +69,9 @@ async def get_current_user_profile(auth_token: str) -> Dict[str, Any]:
         headers["Authorization"] = f"Bearer {auth_token}"
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()  # Raises an exception for 4XX/5XX errors
-            logger.info("Successfully fetched current user profile")
-            return response.json()
+        body = await get_json(url, headers=headers)
+        logger.info("Successfully fetched current user profile")
+        return body
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error fetching current user profile: {e.response.status_code} - {e.response.text}")
         if e.response.status_code == 404:
@@ -104,11 +105,11 @@ async def get_user_by_email(email: str, auth_token: str = None) -> Dict[str, Any
         headers["Authorization"] = f"Bearer {auth_token}"
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            logger.info(f"Successfully fetched user by email: {email}")
-            return response.json()
+        client = get_backend_client()
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+        logger.info(f"Successfully fetched user by email: {email}")
+        return response.json()
     except httpx.HTTPStatusError as e:
         logger.error(f"HTTP error fetching user by email {email}: {e.response.status_code} - {e.response.text}")
         if e.response.status_code == 404:
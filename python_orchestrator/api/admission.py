@@ -0,0 +1,104 @@
+"""
+Admission control for chat requests.
+
+At most `max_in_flight` agent runs execute at once. Further requests wait in a
+bounded queue for up to `queue_timeout` seconds; when the queue is full or the
+wait times out the request is rejected immediately with a Retry-After hint
+instead of slowing down every in-flight chat.
+"""
+
+import math
+import time
+import asyncio
+from python_orchestrator.utils import metrics
+from python_orchestrator.utils import prometheus_metrics as prom
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted; carries a Retry-After hint in seconds."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """An admitted request's slot. Releasing is idempotent."""
+
+    def __init__(self, controller: "AdmissionController"):
+        self._controller = controller
+        self._started = time.perf_counter()
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            metrics.observe("admission_run_ms", (time.perf_counter() - self._started) * 1000)
+            self._controller._release()
+
+
+class AdmissionController:
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.waiting = 0
+
+    def _retry_after(self) -> int:
+        """Seconds until a slot is likely free: typical run time times queue depth per slot."""
+        run_seconds = metrics.get_summary("admission_run_ms")["p50"] / 1000 or self.queue_timeout
+        return max(1, min(60, math.ceil(run_seconds * (self.waiting + 1) / self.max_in_flight)))
+
+    def _reject(self, reason: str):
+        metrics.increment("admission_requests", result=reason)
+        prom.CHAT_REJECTED.labels(reason).inc()
+        raise Overloaded(reason, self._retry_after())
+
+    async def acquire(self) -> Ticket:
+        """Wait for a slot; raise Overloaded if the queue is full or the wait exceeds the deadline."""
+        metrics.observe("admission_queue_depth", self.waiting)
+        if not self._semaphore.locked():
+            # A free slot is taken without yielding, so concurrent arrivals see it as taken
+            await self._semaphore.acquire()
+            metrics.observe("admission_queue_wait_ms", 0.0)
+            prom.CHAT_QUEUE_WAIT.observe(0.0)
+        else:
+            if self.waiting >= self.max_queue:
+                self._reject("rejected_queue_full")
+            start = time.perf_counter()
+            self.waiting += 1
+            prom.CHAT_QUEUE_DEPTH.inc()
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._reject("rejected_queue_timeout")
+            finally:
+                self.waiting -= 1
+                prom.CHAT_QUEUE_DEPTH.dec()
+                waited = time.perf_counter() - start
+                metrics.observe("admission_queue_wait_ms", waited * 1000)
+                prom.CHAT_QUEUE_WAIT.observe(waited)
+        self.in_flight += 1
+        prom.CHAT_IN_FLIGHT.inc()
+        metrics.increment("admission_requests", result="admitted")
+        return Ticket(self)
+
+    def _release(self):
+        self.in_flight -= 1
+        prom.CHAT_IN_FLIGHT.dec()
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        wait = metrics.get_summary("admission_queue_wait_ms")
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "queue_wait_ms": {"p50": wait["p50"], "p95": wait["p95"], "max": wait["max"]},
+            **{result: int(metrics.get_counter("admission_requests", result=result))
+               for result in ("admitted", "rejected_queue_full", "rejected_queue_timeout")},
+        }
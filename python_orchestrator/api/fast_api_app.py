@@ -1,7 +1,10 @@
 import os
 import sys
 import time
-from fastapi import FastAPI, HTTPException
+import asyncio
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -12,36 +15,90 @@ from api.models import (
     ChatRequest, ChatResponse, AgentInfoResponse, RoleDetectionRequest,
     RoleDetectionResponse, ErrorResponse
 )
+from api.admission import AdmissionController, Overloaded
 from vectorization.text_vectorizer import TextVectorizer
-from orchestrator.langhub import run_agent, get_orchestrator_agent, run_agent_with_rag
-from orchestrator.agent_factory import get_user_role_from_token
-from orchestrator.tools import get_tools_for_role
+from orchestrator.langhub import (
+    run_agent, get_orchestrator_agent, run_agent_with_rag, run_chat, stream_chat, get_deadline_stats
+)
+from orchestrator.faq_router import load_faq_index, get_fast_path_stats
+from orchestrator.prefetch import get_prefetch_stats
+from orchestrator.streaming import format_sse
+from orchestrator.retrieval import set_vectorizer, get_retrieval_stats
+from orchestrator.session_store import session_store
+from orchestrator.tool_selector import get_tool_selection_stats
+from orchestrator.agent_modes import get_agent_mode_stats
+from orchestrator.tool_memo import get_tool_memo_stats
+from orchestrator.token_accounting import get_token_stats
+from orchestrator.token_claims import get_role, get_user_id, get_claims_cache_stats
+from orchestrator.agent_factory import prebuild_agents, close_llm_http_client, get_agent_cache_stats
+from orchestrator.tools import get_tools_for_role, get_compaction_stats
+from python_orchestrator.utils import metrics, tracing
+from python_orchestrator.utils import prometheus_metrics as prom
+from python_orchestrator.utils.logger import get_logger
+from python_orchestrator.config import (
+    CHAT_MAX_IN_FLIGHT, CHAT_MAX_QUEUE, CHAT_QUEUE_TIMEOUT_SECONDS, CHAT_DISCONNECT_POLL_SECONDS,
+    JWT_SECRET, JWT_PUBLIC_KEY
+)
+from python_orchestrator.agents.cache import get_cache_stats
+from python_orchestrator.agents.http_client import (
+    get_backend_client, close_backend_client, get_coalescing_stats, get_resilience_stats,
+    get_revalidation_stats, get_backend_pool, BACKEND_MAX_CONNECTIONS
+)
+
+logger = get_logger(__name__)
+
+# Status for a client that went away before the answer (nginx convention)
+CLIENT_CLOSED_REQUEST = 499
 
 # Global vectorizer instance
 vectorizer = None
 
+# Bounds concurrent agent runs across /chat and /chat/stream
+admission = AdmissionController(CHAT_MAX_IN_FLIGHT, CHAT_MAX_QUEUE, CHAT_QUEUE_TIMEOUT_SECONDS)
+
 # FastAPI app
 app = FastAPI(
     title="Python Vectorization Orchestrator",
     description="Text vectorization service with role-based AI agents",
     version="1.0.0"
 )
+app.add_middleware(prom.PrometheusMiddleware)
+
+# Background task refreshing per-worker Prometheus gauges
+_metrics_sampler = None
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize the text vectorizer on startup"""
-    global vectorizer
+    """Initialize the text vectorizer, the backend HTTP pool and role agents on startup"""
+    global vectorizer, _metrics_sampler
+    if not (JWT_SECRET or JWT_PUBLIC_KEY):
+        # Without a key no token verifies, and the chat endpoints would reject every caller
+        raise RuntimeError("Set JWT_SECRET or JWT_PUBLIC_KEY to verify auth tokens")
+    get_backend_client()
+    _metrics_sampler = asyncio.create_task(prom.sample_periodically(get_backend_pool, BACKEND_MAX_CONNECTIONS))
     try:
         vectorizer = TextVectorizer()
         print("Text vectorizer initialized successfully")
+        load_faq_index(vectorizer)
+        set_vectorizer(vectorizer)
     except Exception as e:
         print(f"Failed to initialize text vectorizer: {e}")
+    try:
+        prebuild_agents()
+        print("Role agents prebuilt successfully")
+    except Exception as e:
+        print(f"Failed to prebuild agents: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     global vectorizer
     vectorizer = None
+    if _metrics_sampler:
+        _metrics_sampler.cancel()
+    prom.mark_worker_exit()
+    await close_llm_http_client()
+    await close_backend_client()
     print("Text vectorizer shutdown complete")
 
 @app.get("/", response_model=dict)
@@ -56,8 +113,11 @@ async def root():
             "vectorize-batch": "/vectorize-batch",
             "model-info": "/model-info",
             "chat": "/chat",
+            "chat-stream": "/chat/stream",
             "agent-info": "/agent-info",
             "detect-role": "/detect-role",
+            "stats": "/stats",
+            "metrics": "/metrics",
             "docs": "/docs"
         }
     }
@@ -163,12 +223,10 @@ async def vectorize_batch(request: BatchVectorizationRequest):
 async def detect_role(request: RoleDetectionRequest):
     """Detect user role from authentication token"""
     try:
-        role = get_user_role_from_token(request.auth_token)
-        return RoleDetectionResponse(
-            role=role,
-            confidence=0.8 if role == "admin" else 0.9,
-            method="token_analysis"
-        )
+        role = get_role(request.auth_token)
+        if role is None:
+            return RoleDetectionResponse(role="user", confidence=0.0, method="unverified_default")
+        return RoleDetectionResponse(role=role, confidence=1.0, method="jwt_claims")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Role detection failed: {str(e)}")
 
@@ -190,41 +248,192 @@ async def get_agent_info(agent_type: str = "user"):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get agent info: {str(e)}")
 
+def _wants_timing(http_request: Request) -> bool:
+    """Clients opt into a latency breakdown with an `X-Debug-Timing: 1` request header."""
+    return http_request.headers.get("x-debug-timing", "").lower() in ("1", "true", "yes")
+
+def _timing_header(root) -> str:
+    return f'trace;desc="{root.trace_id}", ' + tracing.format_timing_header(root)
+
+class ClientDisconnected(Exception):
+    """The client closed the connection before the chat answer was ready."""
+
+async def _cancel_on_disconnect(http_request: Request, coro):
+    """
+    Await the coroutine as a task, cancelling it (and with it the agent loop,
+    tool calls and backend requests it is waiting on) if the client disconnects.
+    """
+    start = time.perf_counter()
+    task = asyncio.create_task(coro)
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=CHAT_DISCONNECT_POLL_SECONDS)
+        if done:
+            return task.result()
+        if await http_request.is_disconnected():
+            break
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    metrics.increment("chat_cancelled", reason="client_disconnect")
+    metrics.observe("chat_cancelled_after_ms", elapsed_ms)
+    logger.info(f"Client disconnected after {elapsed_ms:.0f} ms, cancelled its agent run "
+                f"({int(metrics.get_counter('chat_cancelled', reason='client_disconnect'))} cancelled so far)")
+    raise ClientDisconnected()
+
+def _verified_caller(request: ChatRequest) -> tuple:
+    """
+    (role, user id) from the verified token. A role or user id in the body is
+    only a hint and must match the token, so it cannot widen the tool set.
+    """
+    if not request.auth_token:
+        raise HTTPException(status_code=401, detail="Authentication token is required")
+    user_role = get_role(request.auth_token)
+    if user_role is None:
+        raise HTTPException(status_code=401, detail="Invalid or expired authentication token")
+    if request.user_role and request.user_role != user_role:
+        metrics.increment("chat_identity_mismatch", field="user_role")
+        raise HTTPException(status_code=403, detail="user_role does not match the authentication token")
+    user_id = get_user_id(request.auth_token)
+    if request.user_id and str(request.user_id) != str(user_id):
+        metrics.increment("chat_identity_mismatch", field="user_id")
+        raise HTTPException(status_code=403, detail="user_id does not match the authentication token")
+    return user_role, str(user_id)
+
 @app.post("/chat", response_model=ChatResponse)
-async def chat_with_agent(request: ChatRequest):
+async def chat_with_agent(request: ChatRequest, http_request: Request, response: Response):
     """
     Chat with the LangChain agent which can use tools to interact with the NestJS backend.
-    The agent will have different tools available based on the user's role.
+    The agent will have different tools available based on the role in the verified token;
+    a user_role or user_id in the body that contradicts the token is rejected with 403.
     Includes RAG (Retrieval-Augmented Generation) for knowledge-based queries.
+    Returns 429 with Retry-After when the server is at capacity. The agent run
+    is cancelled if the client disconnects before the answer is ready.
+    With `X-Debug-Timing: 1` the response carries a per-span latency breakdown
+    in the X-Debug-Timing header.
     """
+    user_role, user_id = _verified_caller(request)
+    # Prepend the verified user id to the query for context
+    full_query = f"User ID: {user_id}. Message: {request.message}"
+
+    ticket = await _admit()
     try:
-        if not request.auth_token:
-            raise HTTPException(status_code=401, detail="Authentication token is required")
-        
-        # Determine user role
-        user_role = request.user_role or get_user_role_from_token(request.auth_token)
         
-        # Prepend user_id to the query for context if provided
-        full_query = f"User ID: {request.user_id}. Message: {request.message}" if request.user_id else request.message
-        
-        # Run agent with RAG and intent detection
-        agent_response = await run_agent_with_rag(
-            query=full_query,
-            auth_token=request.auth_token,
-            user_role=user_role
-        )
+        # Answer from the FAQ fast path when confident, otherwise run the agent with RAG
+        with tracing.span("chat", tracing.KIND_SERVER, traceparent=http_request.headers.get("traceparent"),
+                          **{"user.role": user_role}) as root:
+            agent_response, tools_used = await _cancel_on_disconnect(http_request, run_chat(
+                message=request.message,
+                query=full_query,
+                auth_token=request.auth_token,
+                user_role=user_role,
+                session_id=request.session_id
+            ))
+        if root is not None and _wants_timing(http_request):
+            response.headers["X-Debug-Timing"] = _timing_header(root)
         
         return ChatResponse(
             response=agent_response,
             user_role=user_role,
-            tools_used=["rag_search", "role_based_tools"]  # Enhanced to show RAG capability
+            tools_used=tools_used
         )
+    except HTTPException:
+        raise
+    except ClientDisconnected:
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
     except ValueError as e:
         raise HTTPException(status_code=500, detail=f"Agent configuration error: {str(e)}")
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=f"Agent service unavailable: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
+    finally:
+        ticket.release()
+
+async def _admit():
+    """Wait for an agent-run slot or fail fast with 429 and Retry-After."""
+    try:
+        return await admission.acquire()
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Server is at capacity ({e.reason}); retry later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+async def _release_after(stream, ticket):
+    """Hold the admission slot until the stream finishes."""
+    try:
+        async for chunk in stream:
+            yield chunk
+    finally:
+        ticket.release()
+
+async def _traced_stream(stream, http_request: Request, user_role: str):
+    """Trace the stream as one request; with X-Debug-Timing, end it with a `timing` event."""
+    with tracing.span("chat.stream", tracing.KIND_SERVER, traceparent=http_request.headers.get("traceparent"),
+                      **{"user.role": user_role}) as root:
+        async for chunk in stream:
+            yield chunk
+    if root is not None and _wants_timing(http_request):
+        yield format_sse("timing", {"trace_id": root.trace_id, "spans": tracing.timing_breakdown(root)})
+
+@app.post("/chat/stream")
+async def chat_with_agent_stream(request: ChatRequest, http_request: Request):
+    """
+    Streaming variant of /chat. Returns server-sent events: `token` for LLM tokens,
+    `tool_start`/`tool_end` for tool calls and `final` with the complete answer,
+    followed by `timing` when the request has an `X-Debug-Timing: 1` header.
+    """
+    user_role, user_id = _verified_caller(request)
+    full_query = f"User ID: {user_id}. Message: {request.message}"
+
+    ticket = await _admit()
+    return StreamingResponse(
+        _release_after(_traced_stream(stream_chat(request.message, full_query, request.auth_token, user_role,
+                                                  request.session_id), http_request, user_role), ticket),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Safety net for a stream that is never iterated; release is idempotent
+        background=BackgroundTask(ticket.release)
+    )
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus scrape endpoint (aggregated across workers in multiprocess mode)."""
+    return Response(prom.render(), media_type=prom.CONTENT_TYPE_LATEST)
+
+@app.get("/stats", response_model=dict)
+async def get_stats():
+    """FAQ fast-path ratio, chat latency per route, agent reuse savings and cache hit rates"""
+    latencies = metrics.snapshot()["latencies"]
+    return {
+        "faq_fast_path": get_fast_path_stats(),
+        "agent_cache": get_agent_cache_stats(),
+        "backend_cache": get_cache_stats(),
+        "backend_coalescing": get_coalescing_stats(),
+        "backend_resilience": get_resilience_stats(),
+        "backend_revalidation": get_revalidation_stats(),
+        "prefetch": get_prefetch_stats(),
+        "retrieval": get_retrieval_stats(),
+        "sessions": session_store.stats(),
+        "tool_selection": get_tool_selection_stats(),
+        "agent_modes": get_agent_mode_stats(),
+        "admission": admission.stats(),
+        "deadline": get_deadline_stats(),
+        "llm_usage": get_token_stats(),
+        "cancellations": {
+            "client_disconnect": int(metrics.get_counter("chat_cancelled", reason="client_disconnect")),
+            "stream_closed": int(metrics.get_counter("chat_cancelled", reason="stream_closed")),
+            "avg_cancelled_after_ms": metrics.get_summary("chat_cancelled_after_ms")["mean"],
+        },
+        "jwt_claims": get_claims_cache_stats(),
+        "tool_memo_hits": get_tool_memo_stats(),
+        "tool_output_compaction": get_compaction_stats(),
+        "stream": {k: v for k, v in latencies.items() if k.startswith("chat_stream")}
+    }
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
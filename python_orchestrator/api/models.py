@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Literal
 
 # Health Check Models
@@ -39,10 +39,13 @@ class ModelInfoResponse(BaseModel):
 
 # Chat/Orchestrator Models
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
     message: str = Field(..., description="The user's chat message")
-    user_id: Optional[str] = Field(None, description="Optional user ID for context")
+    user_id: Optional[str] = Field(None, description="Optional user ID; must match the token's subject")
     auth_token: Optional[str] = Field(None, description="JWT authentication token for API calls")
-    user_role: Optional[Literal['user', 'admin']] = Field(None, description="User role for tool selection")
+    user_role: Optional[Literal['user', 'admin']] = Field(None, description="Optional user role; must match the token's role")
+    session_id: Optional[str] = Field(None, alias="sessionId", description="Conversation session for memory across turns")
 
 class ChatResponse(BaseModel):
     response: str = Field(..., description="The agent's response to the user's message")
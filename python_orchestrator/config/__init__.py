@@ -15,6 +15,23 @@ else:
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Shared LLM HTTP client pool
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+# Completion tokens per LLM call (0 leaves it to the model); also bounds how far a
+# request can overshoot CHAT_MAX_TOKENS_PER_REQUEST
+LLM_MAX_COMPLETION_TOKENS = int(os.getenv("LLM_MAX_COMPLETION_TOKENS", "1024"))
+
+# Agent loop: "tool_calling" (native, parallel tool calls) or "structured_chat" (text ReAct)
+AGENT_MODE = os.getenv("AGENT_MODE", "tool_calling")
+
+# Dynamic tool selection
+TOOL_SELECTION_ENABLED = os.getenv("TOOL_SELECTION_ENABLED", "true").lower() == "true"
+TOOL_SELECTION_TOP_N = int(os.getenv("TOOL_SELECTION_TOP_N", "5"))
+# Structured-chat agents cached per tool subset (tool-calling agents take the subset per request)
+AGENT_CACHE_MAX_SUBSETS = int(os.getenv("AGENT_CACHE_MAX_SUBSETS", "64"))
+
 # NestJS Backend Configuration
 NESTJS_BACKEND_URL = os.getenv("NESTJS_BACKEND_URL")
 
@@ -27,6 +44,71 @@ VECTOR_MODEL_NAME = os.getenv("VECTOR_MODEL_NAME", "all-MiniLM-L6-v2")
 VECTOR_DIMENSION = int(os.getenv("VECTOR_DIMENSION", "384"))
 DEFAULT_BATCH_SIZE = int(os.getenv("DEFAULT_BATCH_SIZE", "10"))
 
+# FAQ Fast-Path Configuration
+FAQ_FILE_PATH = os.getenv(
+    "FAQ_FILE_PATH",
+    os.path.join(os.path.dirname(__file__), '..', '..', 'nestjs-backend', 'src', 'database',
+                 'seed', 'data', 'knowledge_base', 'faq.md')
+)
+FAQ_FAST_PATH_ENABLED = os.getenv("FAQ_FAST_PATH_ENABLED", "true").lower() == "true"
+FAQ_FAST_PATH_THRESHOLD = float(os.getenv("FAQ_FAST_PATH_THRESHOLD", "0.85"))
+# Held-out paraphrases of the FAQ questions; the threshold is calibrated to reach
+# FAQ_TARGET_PRECISION on them (the threshold above is then only a floor)
+FAQ_PARAPHRASES_PATH = os.getenv(
+    "FAQ_PARAPHRASES_PATH", os.path.join(os.path.dirname(__file__), 'faq_paraphrases.txt')
+)
+FAQ_TARGET_PRECISION = float(os.getenv("FAQ_TARGET_PRECISION", "0.95"))
+
+# Speculative user-context prefetch
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_TIMEOUT_SECONDS = float(os.getenv("PREFETCH_TIMEOUT_SECONDS", "2"))
+
+# Retrieval-before-reasoning: inject KB snippets into the initial prompt
+RAG_PREINJECT_ENABLED = os.getenv("RAG_PREINJECT_ENABLED", "true").lower() == "true"
+RAG_PREINJECT_TOP_K = int(os.getenv("RAG_PREINJECT_TOP_K", "3"))
+RAG_PREINJECT_TOKEN_BUDGET = int(os.getenv("RAG_PREINJECT_TOKEN_BUDGET", "400"))
+
+# Session memory
+SESSION_TOKEN_BUDGET = int(os.getenv("SESSION_TOKEN_BUDGET", "1500"))
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "1800"))
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+SESSION_GLOBAL_TOKEN_CAP = int(os.getenv("SESSION_GLOBAL_TOKEN_CAP", "500000"))
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "")  # empty keeps sessions in memory only
+
+# Admission control for /chat and /chat/stream
+CHAT_MAX_IN_FLIGHT = int(os.getenv("CHAT_MAX_IN_FLIGHT", "16"))
+CHAT_MAX_QUEUE = int(os.getenv("CHAT_MAX_QUEUE", "64"))
+CHAT_QUEUE_TIMEOUT_SECONDS = float(os.getenv("CHAT_QUEUE_TIMEOUT_SECONDS", "5"))
+
+# End-to-end deadline per chat request, shared by the agent loop, tools and backend calls
+CHAT_DEADLINE_SECONDS = float(os.getenv("CHAT_DEADLINE_SECONDS", "30"))
+# Below this much remaining budget the agent is skipped and a partial answer returned
+CHAT_DEADLINE_MIN_AGENT_SECONDS = float(os.getenv("CHAT_DEADLINE_MIN_AGENT_SECONDS", "3"))
+
+# Tracing: spans are exported as OTLP/JSON lines to a file and/or to a collector's
+# OTLP/HTTP traces endpoint (e.g. http://localhost:4318/v1/traces); empty disables export
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+TRACING_FILE_PATH = os.getenv("TRACING_FILE_PATH", "")
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "")
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "python-orchestrator")
+
+# LLM token budget per chat request (0 disables the cap) and optional price overrides
+# in USD per 1M tokens for cost estimates (otherwise a built-in per-model table is used)
+CHAT_MAX_TOKENS_PER_REQUEST = int(os.getenv("CHAT_MAX_TOKENS_PER_REQUEST", "40000"))
+LLM_PRICE_INPUT_PER_1M = float(os.getenv("LLM_PRICE_INPUT_PER_1M")) if os.getenv("LLM_PRICE_INPUT_PER_1M") else None
+LLM_PRICE_OUTPUT_PER_1M = float(os.getenv("LLM_PRICE_OUTPUT_PER_1M")) if os.getenv("LLM_PRICE_OUTPUT_PER_1M") else None
+
+# How often /chat checks whether the client is still connected
+CHAT_DISCONNECT_POLL_SECONDS = float(os.getenv("CHAT_DISCONNECT_POLL_SECONDS", "0.5"))
+
+# JWT verification (HS* tokens use JWT_SECRET, RS*/ES* tokens use JWT_PUBLIC_KEY)
+JWT_SECRET = os.getenv("JWT_SECRET", "")
+JWT_PUBLIC_KEY = os.getenv("JWT_PUBLIC_KEY", "").replace("\\n", "\n")
+JWT_ALGORITHMS = [a.strip() for a in os.getenv("JWT_ALGORITHMS", "HS256").split(",") if a.strip()]
+JWT_AUDIENCE = os.getenv("JWT_AUDIENCE", "")
+JWT_ISSUER = os.getenv("JWT_ISSUER", "")
+JWT_CLAIMS_CACHE_MAX_ENTRIES = int(os.getenv("JWT_CLAIMS_CACHE_MAX_ENTRIES", "10000"))
+
 # Logging Configuration
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 ENABLE_DEBUG = os.getenv("ENABLE_DEBUG", "false").lower() == "true"
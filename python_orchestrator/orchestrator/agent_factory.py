@@ -1,19 +1,171 @@
 import os
+import time
+import httpx
+from collections import OrderedDict
 from langchain_openai import ChatOpenAI
-from langchain.agents import initialize_agent, AgentType
-from python_orchestrator.config import OPENAI_API_KEY
+from python_orchestrator.config import (
+    OPENAI_API_KEY, LLM_MAX_CONNECTIONS, LLM_MAX_KEEPALIVE_CONNECTIONS, LLM_TIMEOUT_SECONDS,
+    AGENT_CACHE_MAX_SUBSETS, AGENT_MODE, LLM_MAX_COMPLETION_TOKENS
+)
+from python_orchestrator.utils import metrics
+from python_orchestrator.utils import prometheus_metrics as prom
+from python_orchestrator.utils.logger import get_logger
 from .tools import get_tools_for_role, set_auth_token, set_user_role
+from .request_context import set_tool_names
+from .agent_modes import create_agent_executor, TOOL_CALLING
+from .token_claims import get_role
+
+logger = get_logger(__name__)
+
+DEFAULT_MODEL_NAME = "gpt-4o-mini"
+DEFAULT_TEMPERATURE = 0.0
+
+# Shared pooled HTTP client for all LLM calls
+_llm_http_client = None
+
+# Prebuilt agent executors keyed by (role, model, temperature, tool subset, mode) -> (agent, build_ms)
+_agent_cache = OrderedDict()
+
+def get_llm_http_client() -> httpx.AsyncClient:
+    """Return the shared, pooled async HTTP client used by every ChatOpenAI instance."""
+    global _llm_http_client
+    if _llm_http_client is None or _llm_http_client.is_closed:
+        _llm_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            timeout=LLM_TIMEOUT_SECONDS
+        )
+    return _llm_http_client
+
+async def close_llm_http_client():
+    """
+    Close the shared LLM HTTP client (called on shutdown). Cached executors are
+    dropped with it, since their models hold the closed client.
+    """
+    global _llm_http_client
+    if _llm_http_client is not None:
+        await _llm_http_client.aclose()
+        _llm_http_client = None
+    _agent_cache.clear()
+
+def build_llm(openai_api_key: str, model_name: str = DEFAULT_MODEL_NAME,
+              temperature: float = DEFAULT_TEMPERATURE) -> ChatOpenAI:
+    """
+    Streaming chat model on the shared HTTP pool. stream_usage makes OpenAI
+    append token usage to the stream, which token accounting and the
+    per-request token cap depend on; max_tokens bounds each completion.
+    """
+    return ChatOpenAI(
+        openai_api_key=openai_api_key,
+        model_name=model_name,
+        temperature=temperature,
+        streaming=True,
+        stream_usage=True,
+        max_tokens=LLM_MAX_COMPLETION_TOKENS or None,
+        http_async_client=get_llm_http_client()
+    )
+
+def build_agent(
+    user_role: str = 'user',
+    openai_api_key: str = None,
+    model_name: str = DEFAULT_MODEL_NAME,
+    temperature: float = DEFAULT_TEMPERATURE,
+    verbose: bool = True,
+    tool_names: tuple = None,
+    agent_mode: str = AGENT_MODE
+):
+    """
+    Build an agent executor for a role. The executor holds no request auth;
+    the token and role are set for the tools at invocation time. When
+    tool_names is given, only those role tools are exposed to the agent.
+    agent_mode selects native tool calling or the structured-chat ReAct agent.
+    """
+    openai_api_key = openai_api_key or OPENAI_API_KEY
+    if not openai_api_key:
+        raise ValueError("OpenAI API key not found. Please set it in the .env file.")
+
+    llm = build_llm(openai_api_key, model_name, temperature)
+    tools = get_tools_for_role(user_role)
+    if tool_names:
+        tools = [t for t in tools if t.name in tool_names]
+    return create_agent_executor(llm, tools, agent_mode, verbose)
+
+def get_cached_agent(
+    user_role: str = 'user',
+    model_name: str = DEFAULT_MODEL_NAME,
+    temperature: float = DEFAULT_TEMPERATURE,
+    verbose: bool = True,
+    tool_names: tuple = None,
+    agent_mode: str = AGENT_MODE
+):
+    """
+    Return the prebuilt agent for (role, model, temperature, tool subset, mode),
+    building it once on a miss. Each hit records the construction time it saved.
+    Tool-calling agents read the subset per request (set_tool_names), so they
+    are cached per role only; structured-chat agents bake the subset into the
+    prompt and are cached per subset.
+    """
+    if agent_mode == TOOL_CALLING:
+        tool_names = None
+    key = (user_role, model_name, temperature, tool_names, agent_mode)
+    cached = _agent_cache.get(key)
+    prom.cache_lookup("agent", bool(cached))
+    if cached:
+        _agent_cache.move_to_end(key)
+        metrics.increment("agent_cache_hits", role=user_role)
+        metrics.increment("agent_build_ms_saved", cached[1], role=user_role)
+        return cached[0]
+
+    start = time.perf_counter()
+    agent = build_agent(user_role, model_name=model_name, temperature=temperature,
+                        verbose=verbose, tool_names=tool_names, agent_mode=agent_mode)
+    build_ms = (time.perf_counter() - start) * 1000
+    _agent_cache[key] = (agent, build_ms)
+    _evict_tool_subset_agents()
+    metrics.increment("agent_cache_misses", role=user_role)
+    metrics.observe("agent_build_ms", build_ms, role=user_role)
+    logger.info(f"Built agent for {key} in {build_ms:.1f} ms")
+    return agent
+
+def _evict_tool_subset_agents():
+    """Keep at most AGENT_CACHE_MAX_SUBSETS structured-chat agents built for tool subsets (LRU)."""
+    subset_keys = [k for k in _agent_cache if k[3] is not None]
+    for key in subset_keys[:max(0, len(subset_keys) - AGENT_CACHE_MAX_SUBSETS)]:
+        del _agent_cache[key]
+
+def prebuild_agents(roles=('user', 'admin')):
+    """Construct the default agent for each role at startup."""
+    for role in roles:
+        get_cached_agent(role)
+
+def get_agent_cache_stats() -> dict:
+    """Construction time per cached agent and time saved by reuse."""
+    return {
+        "cached_agents": [
+            {"role": r, "model": m, "temperature": t, "tools": list(names or []), "mode": mode, "build_ms": ms}
+            for (r, m, t, names, mode), (_, ms) in _agent_cache.items()
+        ],
+        "hits": {role: metrics.get_counter("agent_cache_hits", role=role) for role in ('user', 'admin')},
+        "build_ms_saved": {
+            role: metrics.get_counter("agent_build_ms_saved", role=role) for role in ('user', 'admin')
+        },
+    }
 
 def create_role_based_agent(
     auth_token: str,
     user_role: str = 'user',
     openai_api_key: str = None,
-    model_name: str = "gpt-4o-mini",
-    temperature: float = 0.0,
-    verbose: bool = True
+    model_name: str = DEFAULT_MODEL_NAME,
+    temperature: float = DEFAULT_TEMPERATURE,
+    verbose: bool = True,
+    tool_names: tuple = None
 ):
     """
     Create a LangChain agent with role-based tool selection.
+    Reuses the prebuilt executor for (role, model, temperature) when the default
+    API key is used; the auth token and role are applied to the tools per call.
     
     Args:
         auth_token (str): JWT authentication token for API calls.
@@ -22,70 +174,32 @@ def create_role_based_agent(
         model_name (str, optional): Model name. Defaults to "gpt-4o-mini".
         temperature (float, optional): LLM temperature. Defaults to 0.0.
         verbose (bool, optional): Verbose logging. Defaults to True.
+        tool_names (tuple, optional): Subset of the role's tools to expose.
     
     Returns:
         langchain.agents.Agent: Configured agent with role-appropriate tools.
     """
-    if not openai_api_key:
-        openai_api_key = OPENAI_API_KEY
-
-    if not openai_api_key:
-        raise ValueError("OpenAI API key not found. Please set it in the .env file.")
-
-    # Set auth token and user role for tools
+    # Set auth token, user role and tool subset for tools and the agent
     set_auth_token(auth_token)
     set_user_role(user_role)
+    set_tool_names(tool_names)
 
-    # Get tools based on user role
-    tools = get_tools_for_role(user_role)
+    if openai_api_key and openai_api_key != OPENAI_API_KEY:
+        return build_agent(user_role, openai_api_key, model_name, temperature, verbose, tool_names)
 
-    # Initialize LLM
-    llm = ChatOpenAI(
-        openai_api_key=openai_api_key,
-        model_name=model_name,
-        temperature=temperature
-    )
-
-    # Initialize agent with role-specific tools
-    agent = initialize_agent(
-        tools=tools,
-        llm=llm,
-        agent=AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION,
-        verbose=verbose,
-        handle_parsing_errors=True
-    )
-
-    return agent
+    return get_cached_agent(user_role, model_name, temperature, verbose, tool_names)
 
 def get_user_role_from_token(auth_token: str) -> str:
     """
-    Extract user role from JWT token.
-    This is a simplified implementation. In production, you should
-    properly decode and validate the JWT token.
-    
+    Extract the user role from the verified JWT claims.
+
     Args:
         auth_token (str): JWT authentication token.
-    
+
     Returns:
-        str: User role ('user' or 'admin').
+        str: User role ('user' or 'admin'). Tokens that cannot be verified get 'user'.
     """
-    # This is a simplified implementation
-    # In production, you should decode the JWT and extract the role
-    # For now, we'll check for admin indicators in the token or default to user
-    
-    try:
-        # Simple check - if token contains 'admin' or similar, assume admin role
-        # This is NOT secure for production - proper JWT decoding is required
-        if 'admin' in auth_token.lower():
-            return 'admin'
-        
-        # You could also check token payload if it's base64 encoded
-        # For production, use a proper JWT library like PyJWT
-        
-        return 'user'
-    except Exception:
-        # Default to user role if there's any issue
-        return 'user'
+    return get_role(auth_token) or 'user'
 
 def create_agent_with_auth(auth_token: str, **kwargs) -> object:
     """
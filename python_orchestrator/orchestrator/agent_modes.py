@@ -0,0 +1,97 @@
+"""
+Agent loop variants.
+
+`tool_calling` uses the model's native function calling: several independent
+tool calls returned in one LLM step are executed concurrently by the
+AgentExecutor. The tools offered to the model are read from the request's
+selected subset at every LLM call, so one executor per role serves every
+subset. `structured_chat` is the original text-parsed ReAct agent,
+kept selectable for comparison.
+"""
+
+from langchain.agents import AgentExecutor, AgentType, initialize_agent
+from langchain.agents.format_scratchpad.tools import format_to_tool_messages
+from langchain.agents.output_parsers.tools import ToolsAgentOutputParser
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from python_orchestrator.utils import metrics
+from .request_context import get_tool_names
+
+TOOL_CALLING = "tool_calling"
+STRUCTURED_CHAT = "structured_chat"
+AGENT_MODES = (TOOL_CALLING, STRUCTURED_CHAT)
+
+SYSTEM_PROMPT = (
+    "You are a helpful customer assistant for a car insurance company. Use the available "
+    "tools to look up the current user's account data and the knowledge base. When several "
+    "independent lookups are needed, request all of those tool calls in the same step."
+)
+
+TOOL_CALLING_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", SYSTEM_PROMPT),
+    ("human", "{input}"),
+    MessagesPlaceholder("agent_scratchpad"),
+])
+
+
+def parse_error_handler(agent_mode: str):
+    """Count each output-parsing retry and send a short correction back to the LLM."""
+    def handle(error) -> str:
+        metrics.increment("agent_parse_retries", mode=agent_mode)
+        return "Invalid or incomplete response. Please reply using the required format."
+    return handle
+
+
+def create_tool_calling_agent(llm, tools, prompt):
+    """
+    LangChain's create_tool_calling_agent, except the tool schemas bound to
+    the model are the request's selected subset (all tools when none is set).
+    Schemas are converted once; each call only picks from them.
+    """
+    schemas = {t.name: convert_to_openai_tool(t) for t in tools}
+
+    def bind_selected_tools(_):
+        names = get_tool_names()
+        selected = [schemas[name] for name in names if name in schemas] if names else list(schemas.values())
+        return llm.bind(tools=selected)
+
+    return (
+        RunnablePassthrough.assign(agent_scratchpad=lambda x: format_to_tool_messages(x["intermediate_steps"]))
+        | prompt
+        | RunnableLambda(bind_selected_tools)
+        | ToolsAgentOutputParser()
+    )
+
+
+def create_agent_executor(llm, tools, agent_mode: str, verbose: bool = True):
+    """Build the executor for the requested agent mode."""
+    if agent_mode not in AGENT_MODES:
+        raise ValueError(f"Unknown agent mode '{agent_mode}'. Expected one of {AGENT_MODES}.")
+    if agent_mode == STRUCTURED_CHAT:
+        return initialize_agent(
+            tools=tools,
+            llm=llm,
+            agent=AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION,
+            verbose=verbose,
+            handle_parsing_errors=parse_error_handler(agent_mode)
+        )
+    agent = create_tool_calling_agent(llm, tools, TOOL_CALLING_PROMPT)
+    return AgentExecutor(
+        agent=agent,
+        tools=tools,
+        verbose=verbose,
+        handle_parsing_errors=parse_error_handler(agent_mode)
+    )
+
+
+def get_agent_mode_stats() -> dict:
+    """Parse-failure retries and average ReAct iterations per agent mode."""
+    return {
+        mode: {
+            "parse_retries": int(metrics.get_counter("agent_parse_retries", mode=mode)),
+            "avg_iterations": metrics.get_summary("agent_iterations", mode=mode)["mean"],
+            "runs": metrics.get_summary("agent_iterations", mode=mode)["count"],
+        }
+        for mode in AGENT_MODES
+    }
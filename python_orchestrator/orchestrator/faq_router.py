@@ -0,0 +1,160 @@
+"""
+FAQ fast-path router.
+
+Embeds the FAQ questions once and answers messages that closely match one
+directly, so they skip the LLM agent entirely. The match threshold is
+calibrated at load time on held-out paraphrases of the questions.
+"""
+
+import re
+import numpy as np
+from typing import List, Optional, Tuple
+from python_orchestrator.config import (
+    FAQ_FILE_PATH, FAQ_FAST_PATH_ENABLED, FAQ_FAST_PATH_THRESHOLD, FAQ_PARAPHRASES_PATH, FAQ_TARGET_PRECISION
+)
+from python_orchestrator.utils import metrics
+from python_orchestrator.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FAQ_FAST_PATH_TAG = "faq_fast_path"
+CALIBRATION_MARGIN = 0.05
+MAX_THRESHOLD = 0.99
+FAQ_LINE = re.compile(r"^\s*\d+\.\s*(?P<question>[^?]+\?)\s*(?P<answer>.+)$")
+PARAPHRASE_LINE = re.compile(r"^\s*(?P<number>\d+)\.\s*(?P<text>.+)$")
+
+# Loaded index: vectorizer, FAQ entries, normalized question matrix, threshold,
+# share of held-out paraphrases answered correctly at that threshold (None if uncalibrated)
+_index = None
+
+
+def parse_faq_file(path: str = FAQ_FILE_PATH) -> List[Tuple[str, str]]:
+    """Parse `N. Question? Answer` lines into (question, answer) pairs."""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            match = FAQ_LINE.match(line)
+            if match:
+                entries.append((match.group("question").strip(), match.group("answer").strip()))
+    return entries
+
+
+def parse_paraphrase_file(path: str = FAQ_PARAPHRASES_PATH) -> List[Tuple[int, str]]:
+    """Parse `N. Paraphrase` lines into (FAQ entry index, paraphrase) pairs."""
+    paraphrases = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            match = PARAPHRASE_LINE.match(line)
+            if match:
+                paraphrases.append((int(match.group("number")) - 1, match.group("text").strip()))
+    return paraphrases
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def calibrate_threshold(matrix: np.ndarray, paraphrases: Optional[np.ndarray] = None,
+                        labels: Optional[np.ndarray] = None, floor: float = FAQ_FAST_PATH_THRESHOLD,
+                        target_precision: float = FAQ_TARGET_PRECISION) -> Tuple[float, Optional[float]]:
+    """
+    Pick the fast-path threshold. Matches that would be wrong are each FAQ
+    question's closest other question (a message that close is ambiguous) and
+    paraphrases whose best match is another entry; paraphrases matching their
+    own entry are right. The threshold is the lowest score, not below `floor`,
+    at which the matches it lets through reach `target_precision`.
+    Without paraphrases it clears the closest question pair by CALIBRATION_MARGIN.
+    Returns (threshold, share of paraphrases answered correctly, or None).
+    """
+    similarities = matrix @ matrix.T
+    np.fill_diagonal(similarities, -1.0)
+    confusions = similarities.max(axis=1) if len(matrix) > 1 else np.empty(0)
+    if paraphrases is None or not len(paraphrases):
+        if not len(confusions):
+            return floor, None
+        return min(MAX_THRESHOLD, max(floor, float(confusions.max()) + CALIBRATION_MARGIN)), None
+
+    scores = paraphrases @ matrix.T
+    best_scores = scores.max(axis=1)
+    correct = scores.argmax(axis=1) == labels
+    match_scores = np.concatenate([best_scores, confusions])
+    match_correct = np.concatenate([correct, np.zeros(len(confusions), dtype=bool)])
+    threshold = MAX_THRESHOLD
+    for candidate in sorted({floor} | {float(x) for x in match_scores if floor <= x < MAX_THRESHOLD}):
+        accepted = match_scores >= candidate
+        if not accepted.any() or match_correct[accepted].mean() >= target_precision:
+            threshold = candidate
+            break
+    return threshold, float((correct & (best_scores >= threshold)).mean())
+
+
+def _load_paraphrases(vectorizer, entries: list, path: str):
+    """Normalized paraphrase vectors and their FAQ entry indexes, or (None, None) if unavailable."""
+    try:
+        paraphrases = [(i, text) for i, text in parse_paraphrase_file(path) if 0 <= i < len(entries)]
+    except OSError as e:
+        logger.warning(f"No FAQ paraphrases for threshold calibration ({e}); using the closest-pair rule")
+        return None, None
+    if not paraphrases:
+        return None, None
+    vectors = _normalize(np.array(vectorizer.vectorize_chunks_batch([text for _, text in paraphrases])))
+    return vectors, np.array([i for i, _ in paraphrases])
+
+
+def load_faq_index(vectorizer, path: str = FAQ_FILE_PATH, paraphrases_path: str = FAQ_PARAPHRASES_PATH) -> bool:
+    """Embed the FAQ questions with the shared vectorizer and calibrate the threshold. Returns True if loaded."""
+    global _index
+    if not FAQ_FAST_PATH_ENABLED or vectorizer is None:
+        return False
+    try:
+        entries = parse_faq_file(path)
+        vectors = vectorizer.vectorize_chunks_batch([q for q, _ in entries])
+        matrix = _normalize(np.array(vectors))
+        paraphrases, labels = _load_paraphrases(vectorizer, entries, paraphrases_path)
+        threshold, hit_rate = calibrate_threshold(matrix, paraphrases, labels)
+        _index = (vectorizer, entries, matrix, threshold, hit_rate)
+        logger.info(f"FAQ fast path loaded {len(entries)} entries, threshold {threshold:.3f}" + (
+            f", answers {hit_rate:.0%} of {len(labels)} held-out paraphrases at "
+            f"{FAQ_TARGET_PRECISION:.0%} target precision" if hit_rate is not None else ""))
+        return True
+    except Exception as e:
+        logger.error(f"Failed to load FAQ fast-path index: {e}")
+        return False
+
+
+def match_faq(message: str) -> Optional[dict]:
+    """Return the FAQ entry matching the message if it clears the threshold."""
+    if _index is None or not message or not message.strip():
+        return None
+    vectorizer, entries, matrix, threshold, _ = _index
+    query = _normalize(vectorizer.vectorize_chunk(message))
+    scores = matrix @ query
+    best = int(np.argmax(scores))
+    score = float(scores[best])
+    if score < threshold:
+        return None
+    question, answer = entries[best]
+    return {"question": question, "answer": answer, "score": score}
+
+
+def record_route(route: str, elapsed_ms: float):
+    """Record which path served a chat and how long it took."""
+    metrics.increment("chat_requests", route=route)
+    metrics.observe("chat_latency_ms", elapsed_ms, route=route)
+
+
+def get_fast_path_stats() -> dict:
+    """Fast-path ratio and per-route latency distribution."""
+    fast = metrics.get_counter("chat_requests", route=FAQ_FAST_PATH_TAG)
+    agent = metrics.get_counter("chat_requests", route="agent")
+    total = fast + agent
+    latencies = metrics.snapshot()["latencies"]
+    return {
+        "total_chats": int(total),
+        "fast_path_hits": int(fast),
+        "fast_path_ratio": fast / total if total else 0.0,
+        "threshold": _index[3] if _index else None,
+        "paraphrase_hit_rate": _index[4] if _index else None,
+        "latency_ms": {k: v for k, v in latencies.items() if k.startswith("chat_latency_ms")},
+    }
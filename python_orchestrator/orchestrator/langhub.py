@@ -1,20 +1,42 @@
 import os
+import time
+import asyncio
 from langchain_openai import ChatOpenAI
 from langchain.agents import initialize_agent, AgentType
-from python_orchestrator.config import OPENAI_API_KEY
-from .agent_factory import create_agent_with_auth, create_role_based_agent
+from python_orchestrator.config import (
+    OPENAI_API_KEY, AGENT_MODE, CHAT_DEADLINE_SECONDS, CHAT_DEADLINE_MIN_AGENT_SECONDS
+)
+from .agent_factory import create_agent_with_auth, create_role_based_agent, get_user_role_from_token
 from .tools import search_knowledge_base_tool
+from .faq_router import match_faq, record_route, FAQ_FAST_PATH_TAG
+from .streaming import StreamingCallbackHandler, format_sse
+from .request_context import set_auth_token, set_user_role
+from .prefetch import start_prefetch, cancel_prefetch, await_user_context
+from .step_counter import StepCounterHandler
+from .llm_tracing import LLMTracingHandler
+from .token_accounting import TokenAccountingHandler, TokenBudgetExceeded
+from .tool_memo import run_memo
+from .token_claims import format_identity
+from .tool_selector import select_tool_names
+from .retrieval import start_rag_preinject, await_snippets
+from .session_store import session_store, session_key, record_exchange, SessionRecorder
+from python_orchestrator.utils import metrics, tracing
+from python_orchestrator.utils.deadline import deadline_scope, remaining
 from python_orchestrator.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+PARTIAL_NO_ANSWER = ("I'm sorry, I couldn't finish looking into this. "
+                     "Please try again in a moment or rephrase your question.")
+
 def get_orchestrator_agent(
     auth_token: str = None,
     user_role: str = None,
     openai_api_key: str = None,
     model_name: str = "gpt-4o-mini",
     temperature: float = 0.0,
-    verbose: bool = True
+    verbose: bool = True,
+    tool_names: tuple = None
 ):
     """
     Initializes and returns a LangChain agent configured with role-based tools.
@@ -27,6 +49,7 @@ def get_orchestrator_agent(
         model_name (str, optional): Model name. Defaults to "gpt-4o-mini".
         temperature (float, optional): LLM temperature. Defaults to 0.0.
         verbose (bool, optional): Verbose logging. Defaults to True.
+        tool_names (tuple, optional): Subset of the role's tools to expose.
 
     Returns:
         langchain.agents.Agent: The initialized LangChain agent.
@@ -42,7 +65,8 @@ def get_orchestrator_agent(
             openai_api_key=openai_api_key,
             model_name=model_name,
             temperature=temperature,
-            verbose=verbose
+            verbose=verbose,
+            tool_names=tool_names
         )
     else:
         # Create agent with automatic role detection
@@ -51,7 +75,8 @@ def get_orchestrator_agent(
             openai_api_key=openai_api_key,
             model_name=model_name,
             temperature=temperature,
-            verbose=verbose
+            verbose=verbose,
+            tool_names=tool_names
         )
 
 def get_user_agent(auth_token: str, **kwargs):
@@ -88,7 +113,7 @@ def get_admin_agent(auth_token: str, **kwargs):
         **kwargs
     )
 
-async def run_agent(query: str, auth_token: str = None, user_role: str = None, agent=None):
+async def run_agent(query: str, auth_token: str = None, user_role: str = None, agent=None, callbacks=None):
     """
     Run the agent with a given query using role-based tool selection.
 
@@ -97,6 +122,7 @@ async def run_agent(query: str, auth_token: str = None, user_role: str = None, a
         auth_token (str, optional): JWT authentication token.
         user_role (str, optional): User role ('user' or 'admin').
         agent (langchain.agents.Agent, optional): Existing agent instance.
+        callbacks (list, optional): Callback handlers for this run.
 
     Returns:
         str: The agent's response.
@@ -114,8 +140,12 @@ async def run_agent(query: str, auth_token: str = None, user_role: str = None, a
         raise RuntimeError("Agent could not be initialized.")
 
     try:
-        result = await agent.ainvoke({"input": query})
+        with run_memo(), tracing.span("agent.run", mode=AGENT_MODE):
+            run_callbacks = (callbacks or []) + [LLMTracingHandler()]
+            result = await agent.ainvoke({"input": query}, config={"callbacks": run_callbacks})
         return result.get("output", "Agent did not return an output.")
+    except TokenBudgetExceeded:
+        raise
     except Exception as e:
         return f"An error occurred while running the agent: {e}"
 
@@ -147,32 +177,223 @@ async def run_admin_agent(query: str, auth_token: str):
     agent = get_admin_agent(auth_token)
     return await run_agent(query, agent=agent)
 
-async def run_agent_with_rag(query: str, auth_token: str = None, user_role: str = None):
+async def _build_agent_input(query: str, auth_token: str, prefetch, history_key: str):
+    """
+    Gather session history, account context and KB snippets concurrently and
+    prepend them to the query. Returns (agent_input, user_context, snippets).
+    """
+    prefetch = prefetch or start_prefetch(query, auth_token)
+    retrieval = start_rag_preinject(query, auth_token)
+    user_context, snippets = await asyncio.gather(await_user_context(prefetch), await_snippets(retrieval))
+    history = await session_store.get_context(history_key) if history_key else ""
+    identity = format_identity(auth_token)
+    agent_input = "\n\n".join(part for part in (history, identity, user_context, snippets, query) if part)
+    return agent_input, user_context, snippets
+
+def _partial_answer(snippets: str) -> str:
+    """Best answer available without the agent: the pre-injected knowledge base excerpts."""
+    excerpts = snippets.split("\n")[1:] if snippets else []
+    if not excerpts:
+        return PARTIAL_NO_ANSWER
+    return ("I couldn't finish looking into this fully, but here is what I found in our knowledge base "
+            "that may help:\n" + "\n".join(excerpts))
+
+def _budget_low() -> bool:
+    left = remaining()
+    return left is not None and left < CHAT_DEADLINE_MIN_AGENT_SECONDS
+
+async def _select_tools(query: str, role: str):
+    """Pick the tools relevant to the query; fall back to all role tools on failure."""
+    try:
+        return await asyncio.to_thread(select_tool_names, query, role)
+    except Exception as e:
+        logger.error(f"Dynamic tool selection failed, exposing all tools: {e}")
+        return None
+
+async def run_agent_with_rag(query: str, auth_token: str = None, user_role: str = None,
+                             callbacks=None, prefetch=None, session_id: str = None, message: str = None):
     """
     Run the agent with access to all tools, letting LangChain decide autonomously.
+    Session history, the user's account context and the top knowledge base
+    snippets are injected into the initial prompt.
     
     Args:
         query (str): The user's query or instruction for the agent.
         auth_token (str, optional): JWT authentication token.
         user_role (str, optional): User role ('user' or 'admin').
+        callbacks (list, optional): Callback handlers for this run.
+        prefetch (asyncio.Task, optional): Prefetch already started by the caller.
+        session_id (str, optional): Conversation session to read and extend.
+        message (str, optional): The raw user message stored in the session
+                                 (defaults to the query).
     
     Returns:
-        str: The agent's response.
+        str: The agent's response, or a partial answer built from the knowledge
+        base snippets when the request deadline or token budget runs out.
     """
+    with deadline_scope(CHAT_DEADLINE_SECONDS):
+        return await _run_agent_with_rag(query, auth_token, user_role, callbacks, prefetch, session_id, message)
+
+async def _run_agent_with_rag(query: str, auth_token: str, user_role: str, callbacks, prefetch, session_id: str,
+                              message: str):
+    snippets = ""
     try:
         # Set auth token and user role for tools
-        from .tools import set_auth_token, set_user_role
         if auth_token:
             set_auth_token(auth_token)
         if user_role:
             set_user_role(user_role)
-        
+
+        key = session_key(session_id, auth_token)
+        role = user_role or get_user_role_from_token(auth_token)
+        (agent_input, user_context, snippets), tool_names = await asyncio.gather(
+            _build_agent_input(query, auth_token, prefetch, key), _select_tools(query, role)
+        )
+        if _budget_low():
+            logger.warning("Request deadline nearly spent before the agent started, returning a partial answer")
+            metrics.increment("chat_deadline_degraded", stage="before_agent")
+            return _partial_answer(snippets)
         logger.info(f"Running agent with query: {query}")
-        
-        # Let LangChain decide which tools to use autonomously
-        return await run_agent(query, auth_token, user_role)
+
+        # Let LangChain decide autonomously among the tools relevant to this query
+        agent = get_orchestrator_agent(auth_token, role, tool_names=tool_names)
+        steps = StepCounterHandler()
+        usage = TokenAccountingHandler(role, key)
+        recorder = SessionRecorder(key)
+        run_callbacks = (callbacks or []) + [steps, usage] + ([recorder] if key else [])
+        try:
+            response = await asyncio.wait_for(
+                run_agent(agent_input, auth_token, role, agent=agent, callbacks=run_callbacks),
+                timeout=remaining()
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Request deadline reached during the agent run, returning a partial answer")
+            metrics.increment("chat_deadline_degraded", stage="agent")
+            return _partial_answer(snippets)
+        except TokenBudgetExceeded as e:
+            logger.warning(f"{e}, returning a partial answer")
+            return _partial_answer(snippets)
+        finally:
+            usage.record()
+        steps.record(prefetch="used" if user_context else "none")
+        steps.record(rag="preinjected" if snippets else "none")
+        steps.record(mode=AGENT_MODE)
+        await record_exchange(key, message or query, response, recorder.turns)
+        return response
         
     except Exception as e:
         logger.error(f"Error in run_agent_with_rag: {e}")
+        if _budget_low():
+            metrics.increment("chat_deadline_degraded", stage="fallback")
+            return _partial_answer(snippets)
         # Fallback to normal agent execution
-        return await run_agent(query, auth_token, user_role)
+        usage = TokenAccountingHandler(user_role, session_key(session_id, auth_token))
+        try:
+            return await asyncio.wait_for(
+                run_agent(query, auth_token, user_role, callbacks=(callbacks or []) + [usage]),
+                timeout=remaining()
+            )
+        except asyncio.TimeoutError:
+            metrics.increment("chat_deadline_degraded", stage="fallback")
+            return _partial_answer(snippets)
+        except TokenBudgetExceeded:
+            return _partial_answer(snippets)
+        finally:
+            usage.record()
+
+async def _match_faq_safely(message: str):
+    """FAQ fast-path lookup that never fails the chat."""
+    try:
+        return await asyncio.to_thread(match_faq, message)
+    except Exception as e:
+        logger.error(f"FAQ fast path failed, using agent: {e}")
+        return None
+
+async def run_chat(message: str, query: str, auth_token: str = None, user_role: str = None,
+                   session_id: str = None):
+    """
+    Route a chat message: answer high-confidence FAQ matches directly and fall
+    back to the full RAG agent for everything else.
+
+    Args:
+        message (str): The raw user message, used for FAQ matching.
+        query (str): The query passed to the agent (may include extra context).
+        auth_token (str, optional): JWT authentication token.
+        user_role (str, optional): User role ('user' or 'admin').
+        session_id (str, optional): Conversation session to read and extend.
+
+    Returns:
+        tuple: (response text, list of tools used)
+    """
+    with deadline_scope(CHAT_DEADLINE_SECONDS):
+        return await _run_chat(message, query, auth_token, user_role, session_id)
+
+async def _run_chat(message: str, query: str, auth_token: str, user_role: str, session_id: str):
+    start = time.perf_counter()
+    prefetch = start_prefetch(query, auth_token)
+    faq_hit = await _match_faq_safely(message)
+
+    if faq_hit:
+        cancel_prefetch(prefetch)
+        logger.info(f"FAQ fast path hit (score {faq_hit['score']:.3f}): {faq_hit['question']}")
+        record_route(FAQ_FAST_PATH_TAG, (time.perf_counter() - start) * 1000)
+        await record_exchange(session_key(session_id, auth_token), message, faq_hit["answer"])
+        return faq_hit["answer"], [FAQ_FAST_PATH_TAG]
+
+    response = await run_agent_with_rag(query, auth_token, user_role, prefetch=prefetch, session_id=session_id,
+                                        message=message)
+    record_route("agent", (time.perf_counter() - start) * 1000)
+    return response, ["rag_search", "role_based_tools"]
+
+async def _chat_events(message: str, query: str, auth_token: str = None, user_role: str = None,
+                       session_id: str = None):
+    """Yield SSE chunks: a single FAQ answer, or agent tokens and tool events."""
+    start = time.perf_counter()
+    prefetch = start_prefetch(query, auth_token)
+    faq_hit = await _match_faq_safely(message)
+    if faq_hit:
+        cancel_prefetch(prefetch)
+        record_route(FAQ_FAST_PATH_TAG, (time.perf_counter() - start) * 1000)
+        await record_exchange(session_key(session_id, auth_token), message, faq_hit["answer"])
+        yield format_sse("final", {"response": faq_hit["answer"], "tools_used": [FAQ_FAST_PATH_TAG]})
+        return
+
+    handler = StreamingCallbackHandler()
+    agent_run = run_agent_with_rag(query, auth_token, user_role, callbacks=[handler],
+                                   prefetch=prefetch, session_id=session_id, message=message)
+    task = asyncio.create_task(handler.run(agent_run))
+    try:
+        async for event, data in handler.events():
+            yield format_sse(event, data)
+        record_route("agent", (time.perf_counter() - start) * 1000)
+    finally:
+        if not task.done():
+            # The client went away mid-stream
+            metrics.increment("chat_cancelled", reason="stream_closed")
+            logger.info("Stream closed before the agent finished, cancelling its run")
+        task.cancel()
+        cancel_prefetch(prefetch)
+
+async def stream_chat(message: str, query: str, auth_token: str = None, user_role: str = None,
+                      session_id: str = None):
+    """
+    Streaming variant of run_chat. Emits server-sent events and records the
+    time to first byte and total stream duration.
+    """
+    start = time.perf_counter()
+    first_chunk = True
+    async for chunk in _chat_events(message, query, auth_token, user_role, session_id):
+        if first_chunk:
+            metrics.observe("chat_stream_ttfb_ms", (time.perf_counter() - start) * 1000)
+            first_chunk = False
+        yield chunk
+    metrics.observe("chat_stream_duration_ms", (time.perf_counter() - start) * 1000)
+
+def get_deadline_stats() -> dict:
+    """Configured chat deadline and how often it forced a partial answer, by stage."""
+    return {
+        "deadline_seconds": CHAT_DEADLINE_SECONDS,
+        "min_agent_seconds": CHAT_DEADLINE_MIN_AGENT_SECONDS,
+        **{f"degraded_{stage}": int(metrics.get_counter("chat_deadline_degraded", stage=stage))
+           for stage in ("before_agent", "agent", "fallback")},
+    }
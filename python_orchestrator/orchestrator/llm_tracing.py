@@ -0,0 +1,57 @@
+"""
+Tracing spans and Prometheus metrics for the LLM calls of an agent run.
+
+LLM calls are only visible through LangChain callbacks, so their spans are
+started and finished from callback events under the current agent span.
+"""
+
+import time
+from langchain_core.callbacks import AsyncCallbackHandler
+from python_orchestrator.utils import tracing
+from python_orchestrator.utils import prometheus_metrics as prom
+from .request_context import get_user_role
+from .token_accounting import llm_usage
+
+
+class LLMTracingHandler(AsyncCallbackHandler):
+    """
+    Records one client span per LLM call, with the model and token usage, and
+    the call count, latency and tokens per role in Prometheus.
+    """
+
+    def __init__(self):
+        self._spans = {}
+        self._metrics = prom.llm_children(get_user_role())
+
+    def _start(self, run_id, kwargs):
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model_name") or params.get("model") or "unknown"
+        span = tracing.start_span(f"llm {model}", tracing.KIND_CLIENT, **{"gen_ai.request.model": model})
+        self._spans[run_id] = (span, time.perf_counter())
+
+    def _finish(self, run_id, status: str):
+        span, start = self._spans.pop(run_id, (None, None))
+        if start is not None:
+            self._metrics[status].inc()
+            self._metrics["duration"].observe(time.perf_counter() - start)
+        return span
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start(run_id, kwargs)
+
+    async def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id, kwargs)
+
+    async def on_llm_end(self, response, *, run_id, **kwargs):
+        span = self._finish(run_id, "ok")
+        input_tokens, output_tokens = llm_usage(response)
+        if input_tokens or output_tokens:
+            self._metrics["input"].inc(input_tokens)
+            self._metrics["output"].inc(output_tokens)
+            if span is not None:
+                span.set_attribute("gen_ai.usage.input_tokens", input_tokens)
+                span.set_attribute("gen_ai.usage.output_tokens", output_tokens)
+        tracing.end_span(span)
+
+    async def on_llm_error(self, error, *, run_id, **kwargs):
+        tracing.end_span(self._finish(run_id, "error"), error)
@@ -0,0 +1,125 @@
+"""
+Speculative prefetch of the user's account context at chat start.
+
+Policies, active claims and, when the token does not already identify the
+user, the profile are fetched concurrently while the agent is prepared, then
+injected into the prompt so the agent can often answer without calling those
+tools one after another.
+"""
+
+import json
+import asyncio
+from typing import Optional
+from python_orchestrator.agents import user_agent, policy_agent, claims_agent
+from python_orchestrator.config import PREFETCH_ENABLED, PREFETCH_TIMEOUT_SECONDS
+from python_orchestrator.utils import metrics
+from python_orchestrator.utils.logger import get_logger
+from .token_claims import verify_token
+
+logger = get_logger(__name__)
+
+ACCOUNT_KEYWORDS = (
+    "my ", "claim", "polic", "premium", "profile", "account", "coverage",
+    "deductible", "renew", "expire", "status",
+)
+MAX_ITEMS = 10
+PROFILE_FIELDS = ("user_id", "email", "role")
+POLICY_FIELDS = ("policy_id", "plan_name", "collision_coverage", "roadside_assistance",
+                 "deductible", "premium", "start_date", "end_date")
+CLAIM_FIELDS = ("claim_id", "policy_id", "status", "vehicle", "damage_description", "last_updated")
+
+
+def needs_account_context(query: str) -> bool:
+    """Cheap check for questions about the user's own account data."""
+    lowered = (query or "").lower()
+    return any(keyword in lowered for keyword in ACCOUNT_KEYWORDS)
+
+
+async def prefetch_user_context(auth_token: str) -> dict:
+    """
+    Fetch policies, active claims and (unless verified token claims already
+    identify the user) the profile concurrently; failed parts are skipped.
+    """
+    calls = {
+        "policies": policy_agent.get_user_policies(auth_token),
+        "active_claims": claims_agent.get_user_claims(auth_token, active_only=True),
+    }
+    if verify_token(auth_token) is None:
+        calls["profile"] = user_agent.get_current_user_profile(auth_token)
+    results = await asyncio.gather(*calls.values(), return_exceptions=True)
+    fetched = dict(zip(calls, results))
+    return {k: v for k, v in fetched.items() if not isinstance(v, BaseException)}
+
+
+def start_prefetch(query: str, auth_token: str) -> Optional[asyncio.Task]:
+    """Launch the prefetch in the background if the query may need account data."""
+    if not PREFETCH_ENABLED or not auth_token or not needs_account_context(query):
+        return None
+    metrics.increment("prefetch_started")
+    return asyncio.create_task(prefetch_user_context(auth_token))
+
+
+def cancel_prefetch(task: Optional[asyncio.Task]):
+    """Cancel a prefetch that turned out not to be needed."""
+    if task and not task.done():
+        task.cancel()
+        metrics.increment("prefetch_cancelled")
+
+
+def _project(value, fields):
+    if isinstance(value, list):
+        return [_project(item, fields) for item in value[:MAX_ITEMS]]
+    if isinstance(value, dict):
+        return {k: value[k] for k in fields if k in value}
+    return value
+
+
+def format_user_context(context: dict) -> str:
+    """Render prefetched data as a compact prompt section."""
+    if not context:
+        return ""
+    sections = [("Profile", "profile", PROFILE_FIELDS), ("Policies", "policies", POLICY_FIELDS),
+                ("Active claims", "active_claims", CLAIM_FIELDS)]
+    lines = ["Known account context for the current user (prefetched; use it instead of "
+             "calling tools when it is sufficient):"]
+    for label, key, fields in sections:
+        if key in context:
+            lines.append(f"{label}: {json.dumps(_project(context[key], fields), default=str)}")
+    return "\n".join(lines)
+
+
+async def await_user_context(task: Optional[asyncio.Task]) -> str:
+    """Wait briefly for the prefetch; give up and cancel it if it is too slow."""
+    if task is None:
+        return ""
+    try:
+        context = await asyncio.wait_for(task, timeout=PREFETCH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        metrics.increment("prefetch_cancelled")
+        return ""
+    except asyncio.CancelledError:
+        # Only the prefetch itself was cancelled; cancellation of the chat propagates
+        if not task.cancelled() or asyncio.current_task().cancelling():
+            raise
+        metrics.increment("prefetch_cancelled")
+        return ""
+    except Exception as e:
+        logger.error(f"User context prefetch failed: {e}")
+        return ""
+    metrics.increment("prefetch_used")
+    return format_user_context(context)
+
+
+def get_prefetch_stats() -> dict:
+    """Prefetch usage and average ReAct steps with and without prefetched context."""
+    with_context = metrics.get_summary("agent_steps", prefetch="used")
+    without_context = metrics.get_summary("agent_steps", prefetch="none")
+    return {
+        "started": int(metrics.get_counter("prefetch_started")),
+        "used": int(metrics.get_counter("prefetch_used")),
+        "cancelled": int(metrics.get_counter("prefetch_cancelled")),
+        "avg_steps_with_prefetch": with_context["mean"],
+        "avg_steps_without_prefetch": without_context["mean"],
+        "avg_steps_saved": without_context["mean"] - with_context["mean"]
+        if with_context["count"] and without_context["count"] else None,
+    }
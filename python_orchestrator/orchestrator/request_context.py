@@ -0,0 +1,44 @@
+"""
+Request-scoped context for the orchestrator.
+
+Values are stored in contextvars so that concurrent /chat requests served by the
+same worker each see their own auth token, role and tool subset, including
+inside tools and agent steps.
+"""
+
+from contextvars import ContextVar
+from typing import Optional, Tuple
+
+_auth_token: ContextVar[Optional[str]] = ContextVar("auth_token", default=None)
+_user_role: ContextVar[Optional[str]] = ContextVar("user_role", default=None)
+_tool_names: ContextVar[Optional[Tuple[str, ...]]] = ContextVar("tool_names", default=None)
+
+
+def set_auth_token(token: str):
+    """Set the authentication token for the current request."""
+    _auth_token.set(token)
+
+
+def get_auth_token() -> Optional[str]:
+    """Get the authentication token for the current request."""
+    return _auth_token.get()
+
+
+def set_user_role(role: str):
+    """Set the user role ('user' or 'admin') for the current request."""
+    _user_role.set(role)
+
+
+def get_user_role() -> Optional[str]:
+    """Get the user role for the current request."""
+    return _user_role.get()
+
+
+def set_tool_names(tool_names: Optional[Tuple[str, ...]]):
+    """Set the tools exposed to the agent for the current request (None exposes all role tools)."""
+    _tool_names.set(tool_names)
+
+
+def get_tool_names() -> Optional[Tuple[str, ...]]:
+    """Get the tool subset selected for the current request."""
+    return _tool_names.get()
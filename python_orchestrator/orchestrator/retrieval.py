@@ -0,0 +1,119 @@
+"""
+Knowledge base retrieval shared by the RAG tool and the retrieval-before-reasoning mode.
+
+In that mode the KB search runs concurrently with agent setup and the top-k
+snippets are injected into the initial prompt, within a token budget, so the
+agent does not need a reasoning turn just to decide to search.
+"""
+
+import os
+import asyncio
+import httpx
+from typing import Optional
+from python_orchestrator.config import (
+    RAG_PREINJECT_ENABLED, RAG_PREINJECT_TOP_K, RAG_PREINJECT_TOKEN_BUDGET
+)
+from python_orchestrator.agents.http_client import get_backend_client
+from python_orchestrator.utils import metrics
+from python_orchestrator.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# NestJS backend URL
+NESTJS_BASE_URL = os.getenv('NESTJS_BASE_URL', 'http://localhost:3000')
+CHARS_PER_TOKEN = 4
+
+# Shared vectorizer, set at startup or loaded on first use
+_vectorizer = None
+
+
+def set_vectorizer(vectorizer):
+    """Share the application's vectorizer instead of loading another model."""
+    global _vectorizer
+    _vectorizer = vectorizer
+
+
+def get_vectorizer():
+    global _vectorizer
+    if _vectorizer is None:
+        from python_orchestrator.vectorization.text_vectorizer import TextVectorizer
+        _vectorizer = TextVectorizer()
+    return _vectorizer
+
+
+async def search_knowledge_base(query: str, limit: int = 3, auth_token: Optional[str] = None) -> dict:
+    """
+    Vectorize the query off the event loop and ask NestJS for the most similar
+    chunks over the shared backend client.
+    """
+    try:
+        logger.info(f"Vectorizing query: {query}")
+        query_vector = await asyncio.to_thread(get_vectorizer().vectorize_chunk, query)
+
+        rag_url = f"{NESTJS_BASE_URL}/orchestrator/rag/search-vector"
+        payload = {"vector": query_vector.tolist(), "limit": limit, "query": query}
+        headers = {"Content-Type": "application/json"}
+        if auth_token:
+            headers["Authorization"] = f"Bearer {auth_token}"
+
+        logger.info(f"Making vector-based RAG request to {rag_url}")
+        response = await get_backend_client().post(rag_url, json=payload, headers=headers)
+        if response.status_code != 200:
+            logger.error(f"Vector RAG search failed with status {response.status_code}: {response.text}")
+            return {"error": f"Vector RAG search failed: {response.text}"}
+
+        result = response.json()
+        logger.info(f"Vector RAG search returned {len(result.get('results', []))} results")
+        return result
+    except httpx.RequestError as e:
+        logger.error(f"Vector RAG search request failed: {e}")
+        return {"error": f"Vector RAG search request failed: {str(e)}"}
+    except Exception as e:
+        logger.error(f"Unexpected error in vector RAG search: {e}")
+        return {"error": f"Unexpected error in vector RAG search: {str(e)}"}
+
+
+def start_rag_preinject(query: str, auth_token: Optional[str]) -> Optional[asyncio.Task]:
+    """Launch the KB search in the background when pre-injection is enabled."""
+    if not RAG_PREINJECT_ENABLED or not query:
+        return None
+    return asyncio.create_task(search_knowledge_base(query, RAG_PREINJECT_TOP_K, auth_token))
+
+
+def format_snippets(result: dict, token_budget: int = RAG_PREINJECT_TOKEN_BUDGET) -> str:
+    """Render the top snippets as a prompt section, stopping at the token budget."""
+    chunks = [r.get("text_chunk", "") for r in (result or {}).get("results", []) if r.get("text_chunk")]
+    header = ("Relevant knowledge base excerpts (search_knowledge_base_tool is still "
+              "available for follow-up lookups):")
+    lines, remaining = [header], token_budget * CHARS_PER_TOKEN - len(header)
+    for chunk in chunks:
+        if remaining <= 0:
+            break
+        snippet = chunk[:remaining]
+        lines.append(f"- {snippet}")
+        remaining -= len(snippet) + 3
+    return "\n".join(lines) if len(lines) > 1 else ""
+
+
+async def await_snippets(task: Optional[asyncio.Task]) -> str:
+    """Wait for the pre-injected search and format its snippets."""
+    if task is None:
+        return ""
+    try:
+        return format_snippets(await task)
+    except Exception as e:
+        logger.error(f"RAG pre-injection failed: {e}")
+        return ""
+
+
+def get_retrieval_stats() -> dict:
+    """Average ReAct iterations per chat with and without pre-injected snippets."""
+    with_snippets = metrics.get_summary("agent_iterations", rag="preinjected")
+    without_snippets = metrics.get_summary("agent_iterations", rag="none")
+    return {
+        "preinject_enabled": RAG_PREINJECT_ENABLED,
+        "avg_iterations_with_preinject": with_snippets["mean"],
+        "avg_iterations_without_preinject": without_snippets["mean"],
+        "chats_with_preinject": with_snippets["count"],
+        "chats_without_preinject": without_snippets["count"],
+    }
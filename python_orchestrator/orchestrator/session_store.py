@@ -0,0 +1,181 @@
+"""
+Bounded conversation memory keyed by session.
+
+Each session keeps recent turns and tool results within a token budget; older
+turns are rolled up into a short summary. Sessions are evicted by TTL and LRU
+under a global token cap, and can optionally be persisted to SQLite so they
+survive restarts. SQLite calls run in a worker thread, never on the event loop.
+"""
+
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+from langchain_core.callbacks import AsyncCallbackHandler
+from python_orchestrator.config import (
+    SESSION_TOKEN_BUDGET, SESSION_TTL_SECONDS, SESSION_MAX_SESSIONS,
+    SESSION_GLOBAL_TOKEN_CAP, SESSION_DB_PATH
+)
+from .token_claims import get_user_id
+
+CHARS_PER_TOKEN = 4
+SUMMARY_LINE_CHARS = 160
+MAX_TOOL_RESULT_CHARS = 800
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // CHARS_PER_TOKEN + 1
+
+
+def _session_tokens(session: dict) -> int:
+    return estimate_tokens(session["summary"]) + sum(estimate_tokens(c) for _, c in session["turns"])
+
+
+class SqliteSessionBackend:
+    """
+    Persists sessions as JSON rows in a SQLite file. Calls block, so the store
+    runs them in a worker thread; each exchange is one transaction.
+    """
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS sessions (key TEXT PRIMARY KEY, data TEXT, updated REAL)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated)")
+
+    def load(self, key: str, updated_after: float) -> Optional[dict]:
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM sessions WHERE key = ? AND updated > ?",
+                                    (key, updated_after)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, key: str, data: str, updated: float, evicted: list):
+        """
+        Upsert a session (an older snapshot never overwrites a newer one), delete
+        the sessions evicted from memory and rows past the TTL, then commit once.
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "data = excluded.data, updated = excluded.updated WHERE excluded.updated >= sessions.updated",
+                (key, data, updated))
+            self.conn.executemany("DELETE FROM sessions WHERE key = ? AND updated <= ?", evicted)
+            self.conn.execute("DELETE FROM sessions WHERE updated <= ?", (time.time() - SESSION_TTL_SECONDS,))
+
+
+class SessionStore:
+    """In-memory LRU of sessions with per-session and global token budgets."""
+
+    def __init__(self, backend: Optional[SqliteSessionBackend] = None):
+        self.backend = backend
+        self._sessions = OrderedDict()
+
+    async def _get(self, key: str) -> Optional[dict]:
+        session = self._sessions.get(key)
+        if session is None and self.backend:
+            session = await asyncio.to_thread(self.backend.load, key, time.time() - SESSION_TTL_SECONDS)
+        if session and time.time() - session["updated"] > SESSION_TTL_SECONDS:
+            # The persisted row is deleted by the next write's TTL sweep
+            self._sessions.pop(key, None)
+            return None
+        if session:
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+        return session
+
+    async def add_turns(self, key: str, turns: list):
+        """Append turns, compact the session to its budget and persist it in one write."""
+        session = await self._get(key) or {"summary": "", "turns": []}
+        session["turns"].extend([role, content] for role, content in turns)
+        session["updated"] = time.time()
+        self._compact(session)
+        self._sessions[key] = session
+        self._sessions.move_to_end(key)
+        evicted = self._evict()
+        if self.backend:
+            # Serialized here, on the loop, so the snapshot cannot change while it is written
+            await asyncio.to_thread(self.backend.save, key, json.dumps(session), session["updated"], evicted)
+
+    def _compact(self, session: dict):
+        """Roll the oldest turns into the summary until the session fits its budget."""
+        while len(session["turns"]) > 1 and _session_tokens(session) > SESSION_TOKEN_BUDGET:
+            role, content = session["turns"].pop(0)
+            session["summary"] += f"\n- {role}: {content[:SUMMARY_LINE_CHARS]}"
+        # The summary itself may use at most half of the budget; oldest lines go first
+        lines = session["summary"].split("\n")
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > SESSION_TOKEN_BUDGET // 2:
+            lines.pop(0)
+        session["summary"] = "\n".join(lines)
+
+    def _evict(self) -> list:
+        """
+        Drop least recently used sessions beyond the session count or global
+        token cap; returns their (key, updated) so the persisted rows go too.
+        """
+        evicted = []
+        total = sum(_session_tokens(s) for s in self._sessions.values())
+        while self._sessions and (len(self._sessions) > SESSION_MAX_SESSIONS or total > SESSION_GLOBAL_TOKEN_CAP):
+            key, session = self._sessions.popitem(last=False)
+            total -= _session_tokens(session)
+            evicted.append((key, session["updated"]))
+        return evicted
+
+    async def get_context(self, key: str) -> str:
+        """Render the session's summary and recent turns as a prompt section."""
+        session = await self._get(key)
+        if not session:
+            return ""
+        lines = ["Conversation so far in this session:"]
+        if session["summary"]:
+            lines.append(f"Earlier (summarized):\n{session['summary'].strip()}")
+        lines.extend(f"{role}: {content}" for role, content in session["turns"])
+        return "\n".join(lines)
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "tokens": sum(_session_tokens(s) for s in self._sessions.values()),
+            "persistent": self.backend is not None,
+        }
+
+
+session_store = SessionStore(SqliteSessionBackend(SESSION_DB_PATH) if SESSION_DB_PATH else None)
+
+
+def session_key(session_id: Optional[str], auth_token: Optional[str]) -> Optional[str]:
+    """
+    Scope a client session id to the verified user (the token's `sub`), so a
+    session survives token refresh and cannot be read across users. Callers
+    whose token does not verify get no session.
+    """
+    user_id = get_user_id(auth_token) if session_id else None
+    return f"{user_id}:{session_id}" if user_id else None
+
+
+async def record_exchange(key: Optional[str], message: str, response: str, tool_turns: tuple = ()):
+    """Store a user message, the tool results gathered for it and the answer, in that order."""
+    if key:
+        await session_store.add_turns(key, [("user", message), *tool_turns, ("assistant", response)])
+
+
+class SessionRecorder(AsyncCallbackHandler):
+    """
+    Collects tool results from an agent run; they are stored with the exchange,
+    after the user turn that caused them.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.turns = []
+        self._tool_names = {}
+
+    async def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._tool_names[run_id] = (serialized or {}).get("name", "tool")
+
+    async def on_tool_end(self, output, *, run_id, **kwargs):
+        name = self._tool_names.pop(run_id, "tool")
+        self.turns.append(("tool", f"{name} -> {str(output)[:MAX_TOOL_RESULT_CHARS]}"))
@@ -0,0 +1,33 @@
+"""
+Counts ReAct steps per agent run so orchestration modes can be compared.
+"""
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from python_orchestrator.utils import metrics
+
+
+class StepCounterHandler(AsyncCallbackHandler):
+    """
+    Counts LLM round-trips (ReAct iterations) and the tool actions they chose
+    during one run. In tool-calling mode one round-trip can choose several tools.
+    """
+
+    def __init__(self):
+        self.llm_calls = 0
+        self.steps = 0
+        self.tools = []
+
+    async def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.llm_calls += 1
+
+    async def on_llm_start(self, serialized, prompts, **kwargs):
+        self.llm_calls += 1
+
+    async def on_agent_action(self, action, **kwargs):
+        self.steps += 1
+        self.tools.append(action.tool)
+
+    def record(self, **labels):
+        """Record tool steps and ReAct iterations (LLM round-trips) for this run."""
+        metrics.observe("agent_steps", self.steps, **labels)
+        metrics.observe("agent_iterations", self.llm_calls, **labels)
@@ -0,0 +1,117 @@
+"""
+Server-sent-events streaming for agent runs.
+
+An async callback handler turns final-answer tokens and tool start/end
+callbacks into events on a queue, which the /chat/stream endpoint relays as SSE.
+"""
+
+import re
+import json
+import asyncio
+from langchain_core.callbacks import AsyncCallbackHandler
+from python_orchestrator.config import AGENT_MODE
+from .agent_modes import STRUCTURED_CHAT
+
+MAX_EVENT_OUTPUT_CHARS = 500
+
+# Structured-chat replies are JSON blobs; the answer is the action_input of a "Final Answer" action
+_FINAL_ANSWER_START = re.compile(r'"action"\s*:\s*"Final Answer"\s*,\s*"action_input"\s*:\s*"')
+_JSON_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+
+
+def format_sse(event: str, data) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _decode_json_string(raw: str) -> str:
+    """The complete characters of a JSON string body, up to its closing quote or a partial escape."""
+    out, i = [], 0
+    while i < len(raw) and raw[i] != '"':
+        if raw[i] != "\\":
+            out.append(raw[i])
+            i += 1
+        elif raw[i + 1:i + 2] == "u":
+            if len(raw) < i + 6:
+                break
+            out.append(chr(int(raw[i + 2:i + 6], 16)))
+            i += 6
+        elif i + 1 < len(raw):
+            out.append(_JSON_ESCAPES.get(raw[i + 1], raw[i + 1]))
+            i += 2
+        else:
+            break
+    return "".join(out)
+
+
+class StreamingCallbackHandler(AsyncCallbackHandler):
+    """
+    Collects final-answer tokens and tool events for streaming to the client.
+    Tokens of LLM calls that choose tools are not streamed: in tool-calling
+    mode a call is dropped once it streams a tool-call chunk, and in
+    structured-chat mode only the action_input of a "Final Answer" is streamed.
+    """
+
+    def __init__(self, agent_mode: str = AGENT_MODE):
+        self.agent_mode = agent_mode
+        self.queue = asyncio.Queue()
+        self._tool_names = {}
+        self._tool_call_runs = set()
+        # Structured-chat mode, per LLM run: (text so far, answer characters already streamed)
+        self._replies = {}
+
+    async def on_llm_new_token(self, token: str, *, chunk=None, run_id=None, **kwargs):
+        if self.agent_mode == STRUCTURED_CHAT:
+            token = self._final_answer_delta(run_id, token)
+        elif run_id in self._tool_call_runs or getattr(getattr(chunk, "message", None), "tool_call_chunks", None):
+            self._tool_call_runs.add(run_id)
+            return
+        if token:
+            await self.queue.put(("token", {"token": token}))
+
+    def _final_answer_delta(self, run_id, token: str) -> str:
+        """New characters of the Final Answer's action_input carried by this token, if any."""
+        text, streamed = self._replies.get(run_id, ("", 0))
+        text += token or ""
+        match = _FINAL_ANSWER_START.search(text)
+        answer = _decode_json_string(text[match.end():]) if match else ""
+        self._replies[run_id] = (text, len(answer))
+        return answer[streamed:]
+
+    async def on_llm_end(self, response, *, run_id, **kwargs):
+        self._tool_call_runs.discard(run_id)
+        self._replies.pop(run_id, None)
+
+    async def on_llm_error(self, error, *, run_id, **kwargs):
+        self._tool_call_runs.discard(run_id)
+        self._replies.pop(run_id, None)
+
+    async def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        name = (serialized or {}).get("name", "tool")
+        self._tool_names[run_id] = name
+        await self.queue.put(("tool_start", {"tool": name, "input": input_str}))
+
+    async def on_tool_end(self, output, *, run_id, **kwargs):
+        name = self._tool_names.pop(run_id, "tool")
+        await self.queue.put(("tool_end", {"tool": name, "output": str(output)[:MAX_EVENT_OUTPUT_CHARS]}))
+
+    async def on_tool_error(self, error, *, run_id, **kwargs):
+        name = self._tool_names.pop(run_id, "tool")
+        await self.queue.put(("tool_error", {"tool": name, "error": str(error)}))
+
+    async def run(self, agent_coro):
+        """Await the agent run, then emit the final answer and close the stream."""
+        try:
+            await self.queue.put(("final", {"response": await agent_coro}))
+        except Exception as e:
+            await self.queue.put(("error", {"error": str(e)}))
+        finally:
+            await self.queue.put(None)
+
+    async def events(self):
+        """Yield (event, data) pairs until the run finishes."""
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                return
+            yield item
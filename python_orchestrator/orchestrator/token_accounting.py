@@ -0,0 +1,209 @@
+"""
+LLM token and cost accounting.
+
+A callback handler attached to each agent run attributes the prompt and
+completion tokens, latency and estimated cost of every LLM call to the
+request, the caller's role, the session and the tool-selection step (the
+tools the model chose in that call, or the final answer). A per-request token
+cap stops runaway ReAct loops before the next LLM call is made.
+
+The cap is checked between calls, so a request can overshoot it by at most one
+call: that call's prompt plus LLM_MAX_COMPLETION_TOKENS of completion, which
+is also passed to the model as max_tokens.
+"""
+
+import re
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from langchain_core.callbacks import AsyncCallbackHandler
+from python_orchestrator.config import (
+    CHAT_MAX_TOKENS_PER_REQUEST, LLM_PRICE_INPUT_PER_1M, LLM_PRICE_OUTPUT_PER_1M
+)
+from python_orchestrator.utils import metrics, tracing
+from python_orchestrator.utils import prometheus_metrics as prom
+from python_orchestrator.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# USD per 1M (input, output) tokens, matched by longest model-name prefix
+MODEL_PRICES_PER_1M = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+FINAL_ANSWER_STEP = "final_answer"
+MAX_TRACKED_SESSIONS = 1000
+TOP_SESSIONS = 5
+
+# Structured-chat mode names the chosen tool in the text: {"action": "<tool>", ...}
+_ACTION_PATTERN = re.compile(r'"action"\s*:\s*"([^"]+)"')
+
+_lock = threading.Lock()
+_step_labels = set()
+# Per session: [requests, tokens, cost]
+_session_totals = OrderedDict()
+
+
+class TokenBudgetExceeded(Exception):
+    """Raised before an LLM call once the request has used its token budget."""
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimated USD cost of an LLM call; configured prices override the built-in table."""
+    prices = None
+    for prefix in sorted(MODEL_PRICES_PER_1M, key=len, reverse=True):
+        if (model or "").startswith(prefix):
+            prices = MODEL_PRICES_PER_1M[prefix]
+            break
+    input_price = LLM_PRICE_INPUT_PER_1M if LLM_PRICE_INPUT_PER_1M is not None else (prices or (0.0, 0.0))[0]
+    output_price = LLM_PRICE_OUTPUT_PER_1M if LLM_PRICE_OUTPUT_PER_1M is not None else (prices or (0.0, 0.0))[1]
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def llm_usage(response) -> Tuple[int, int]:
+    """(input tokens, output tokens) of an LLMResult, from the message usage or the provider output."""
+    for generations in response.generations or []:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0)
+
+
+def _step_label(response) -> str:
+    """The tools the model selected in this call, or FINAL_ANSWER_STEP."""
+    names = []
+    for generations in response.generations or []:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            names += [call["name"] for call in getattr(message, "tool_calls", None) or []]
+            if not names:
+                names += [a for a in _ACTION_PATTERN.findall(generation.text or "") if a != "Final Answer"]
+    return "+".join(sorted(set(names))) or FINAL_ANSWER_STEP
+
+
+class TokenAccountingHandler(AsyncCallbackHandler):
+    """Accumulates token usage and cost for one request and enforces its token cap."""
+
+    # Lets TokenBudgetExceeded propagate out of the agent run instead of being logged
+    raise_error = True
+
+    def __init__(self, role: str, session_key: Optional[str] = None,
+                 max_tokens: int = CHAT_MAX_TOKENS_PER_REQUEST):
+        self.role = role or "user"
+        self.session_key = session_key
+        self.max_tokens = max_tokens
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost_usd = 0.0
+        self.llm_ms = 0.0
+        self._started = {}
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def _start(self, run_id, kwargs):
+        if self.max_tokens and self.total_tokens >= self.max_tokens:
+            metrics.increment("llm_budget_stops", role=self.role)
+            raise TokenBudgetExceeded(
+                f"Request used {self.total_tokens} of {self.max_tokens} LLM tokens; stopping the agent")
+        params = kwargs.get("invocation_params") or {}
+        self._started[run_id] = (time.perf_counter(), params.get("model_name") or params.get("model") or "")
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start(run_id, kwargs)
+
+    async def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id, kwargs)
+
+    async def on_llm_end(self, response, *, run_id, **kwargs):
+        start, model = self._started.pop(run_id, (time.perf_counter(), ""))
+        model = (response.llm_output or {}).get("model_name") or model
+        input_tokens, output_tokens = llm_usage(response)
+        cost = estimate_cost(model, input_tokens, output_tokens)
+        step = _step_label(response)
+
+        self.calls += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cost_usd += cost
+        self.llm_ms += (time.perf_counter() - start) * 1000
+
+        metrics.increment("llm_tokens", input_tokens, role=self.role, type="input")
+        metrics.increment("llm_tokens", output_tokens, role=self.role, type="output")
+        metrics.increment("llm_cost_usd", cost, role=self.role)
+        metrics.increment("llm_step_calls", step=step)
+        metrics.increment("llm_step_tokens", input_tokens + output_tokens, step=step)
+        metrics.increment("llm_step_cost_usd", cost, step=step)
+        prom.llm_children(self.role)["cost"].inc(cost)
+        with _lock:
+            _step_labels.add(step)
+
+    async def on_llm_error(self, error, *, run_id, **kwargs):
+        self._started.pop(run_id, None)
+
+    def record(self):
+        """Record this request's totals in the per-role and per-session aggregates."""
+        metrics.increment("llm_accounted_requests", role=self.role)
+        metrics.observe("llm_tokens_per_request", self.total_tokens, role=self.role)
+        metrics.observe("llm_cost_per_request", self.cost_usd, role=self.role)
+        metrics.observe("llm_ms_per_request", self.llm_ms, role=self.role)
+        if self.session_key:
+            with _lock:
+                totals = _session_totals.pop(self.session_key, [0, 0, 0.0])
+                totals[0] += 1
+                totals[1] += self.total_tokens
+                totals[2] += self.cost_usd
+                _session_totals[self.session_key] = totals
+                while len(_session_totals) > MAX_TRACKED_SESSIONS:
+                    _session_totals.popitem(last=False)
+        span = tracing.current_span()
+        logger.info(f"LLM usage [{self.role}] trace={span.trace_id if span else '-'}: {self.calls} calls, "
+                    f"{self.input_tokens} in / {self.output_tokens} out tokens, "
+                    f"${self.cost_usd:.5f}, {self.llm_ms:.0f} ms in LLM")
+
+
+def get_token_stats() -> dict:
+    """Token and cost aggregates per role, per tool-selection step and for the costliest sessions."""
+    by_role = {}
+    for role in ("user", "admin"):
+        tokens = metrics.get_summary("llm_tokens_per_request", role=role)
+        by_role[role] = {
+            "requests": int(metrics.get_counter("llm_accounted_requests", role=role)),
+            "input_tokens": int(metrics.get_counter("llm_tokens", role=role, type="input")),
+            "output_tokens": int(metrics.get_counter("llm_tokens", role=role, type="output")),
+            "cost_usd": round(metrics.get_counter("llm_cost_usd", role=role), 6),
+            "avg_tokens_per_request": tokens["mean"],
+            "p95_tokens_per_request": tokens["p95"],
+            "avg_cost_per_request_usd": metrics.get_summary("llm_cost_per_request", role=role)["mean"],
+            "avg_llm_ms_per_request": metrics.get_summary("llm_ms_per_request", role=role)["mean"],
+            "budget_stops": int(metrics.get_counter("llm_budget_stops", role=role)),
+        }
+    with _lock:
+        steps = sorted(_step_labels)
+        sessions = sorted(_session_totals.items(), key=lambda item: item[1][2], reverse=True)[:TOP_SESSIONS]
+    return {
+        "max_tokens_per_request": CHAT_MAX_TOKENS_PER_REQUEST,
+        "by_role": by_role,
+        "by_step": {
+            step: {
+                "calls": int(metrics.get_counter("llm_step_calls", step=step)),
+                "tokens": int(metrics.get_counter("llm_step_tokens", step=step)),
+                "cost_usd": round(metrics.get_counter("llm_step_cost_usd", step=step), 6),
+            }
+            for step in steps
+        },
+        "top_sessions": [
+            # Keys embed the user id: report a stable hash instead
+            {"session": hashlib.sha256(key.encode()).hexdigest()[:16], "requests": requests, "tokens": tokens, "cost_usd": round(cost, 6)}
+            for key, (requests, tokens, cost) in sessions
+        ],
+    }
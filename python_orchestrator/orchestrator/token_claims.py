@@ -0,0 +1,111 @@
+"""
+Verified JWT claims for the caller.
+
+Tokens are verified with the configured HS secret or RS/ES public key, and the
+verified claims are cached by token hash until the token expires, so role and
+user id are known without asking NestJS who the user is.
+"""
+
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+import jwt
+from python_orchestrator.config import (
+    JWT_SECRET, JWT_PUBLIC_KEY, JWT_ALGORITHMS, JWT_AUDIENCE, JWT_ISSUER, JWT_CLAIMS_CACHE_MAX_ENTRIES
+)
+from python_orchestrator.utils import metrics
+from python_orchestrator.utils import prometheus_metrics as prom
+from python_orchestrator.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# sha256(token) -> (expires_at, claims)
+_claims_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _verification_key(algorithm: str) -> Optional[str]:
+    return JWT_SECRET if algorithm.startswith("HS") else JWT_PUBLIC_KEY
+
+
+def _decode(token: str) -> Optional[dict]:
+    algorithm = jwt.get_unverified_header(token).get("alg", "")
+    if algorithm not in JWT_ALGORITHMS:
+        raise jwt.InvalidAlgorithmError(f"Algorithm '{algorithm}' is not allowed")
+    key = _verification_key(algorithm)
+    if not key:
+        logger.warning(f"No verification key configured for {algorithm} tokens")
+        return None
+    return jwt.decode(
+        token,
+        key,
+        algorithms=JWT_ALGORITHMS,
+        audience=JWT_AUDIENCE or None,
+        issuer=JWT_ISSUER or None,
+        options={"require": ["exp", "sub"], "verify_aud": bool(JWT_AUDIENCE)},
+    )
+
+
+def verify_token(auth_token: Optional[str]) -> Optional[dict]:
+    """Return the token's verified claims, or None if it is missing, invalid or expired."""
+    if not auth_token:
+        return None
+    key = hashlib.sha256(auth_token.encode()).hexdigest()
+    now = time.time()
+    with _lock:
+        entry = _claims_cache.get(key)
+        prom.cache_lookup("jwt_claims", bool(entry and entry[0] > now))
+        if entry and entry[0] > now:
+            _claims_cache.move_to_end(key)
+            metrics.increment("jwt_claims_lookups", result="cache_hit")
+            return entry[1]
+        _claims_cache.pop(key, None)
+
+    try:
+        claims = _decode(auth_token)
+    except jwt.PyJWTError as e:
+        logger.warning(f"Rejected auth token: {e}")
+        metrics.increment("jwt_claims_lookups", result="invalid")
+        return None
+    if claims is None:
+        metrics.increment("jwt_claims_lookups", result="unverifiable")
+        return None
+
+    metrics.increment("jwt_claims_lookups", result="verified")
+    with _lock:
+        _claims_cache[key] = (claims["exp"], claims)
+        while len(_claims_cache) > JWT_CLAIMS_CACHE_MAX_ENTRIES:
+            _claims_cache.popitem(last=False)
+    return claims
+
+
+def get_role(auth_token: Optional[str]) -> Optional[str]:
+    """Role from verified claims ('user' or 'admin'), or None if the token cannot be verified."""
+    claims = verify_token(auth_token)
+    if claims is None:
+        return None
+    return "admin" if claims.get("role") == "admin" else "user"
+
+
+def get_user_id(auth_token: Optional[str]) -> Optional[str]:
+    claims = verify_token(auth_token)
+    return claims.get("sub") if claims else None
+
+
+def format_identity(auth_token: Optional[str]) -> str:
+    """Prompt line stating who the verified caller is, so the agent need not look it up."""
+    claims = verify_token(auth_token)
+    if not claims:
+        return ""
+    role = "admin" if claims.get("role") == "admin" else "user"
+    return f"Current user (verified): user_id={claims['sub']}, email={claims.get('email', 'unknown')}, role={role}"
+
+
+def get_claims_cache_stats() -> dict:
+    return {
+        "entries": len(_claims_cache),
+        **{result: int(metrics.get_counter("jwt_claims_lookups", result=result))
+           for result in ("cache_hit", "verified", "invalid", "unverifiable")},
+    }
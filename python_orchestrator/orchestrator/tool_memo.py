@@ -0,0 +1,106 @@
+"""
+Per-run memoization of tool invocations.
+
+Within one agent run, repeating a read-only tool with the same arguments
+returns the earlier result instead of calling the backend again. Each hit is
+logged, counted and dispatched as a `tool_memo_hit` event on the run trace.
+Side-effecting tools are never memoized and clear the memo when they succeed.
+Error and degraded-backend results are not memoized, so a retry reaches the backend.
+"""
+
+import copy
+import json
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from langchain_core.callbacks.manager import adispatch_custom_event
+from python_orchestrator.utils import metrics
+from python_orchestrator.utils import prometheus_metrics as prom
+from python_orchestrator.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MEMO_HIT_EVENT = "tool_memo_hit"
+SIDE_EFFECT_PREFIXES = ("create_", "upload_", "delete_")
+# Writes that do not follow the naming convention
+SIDE_EFFECT_TOOLS = {"calculate_premium_tool"}
+
+_run_memo: ContextVar[Optional[dict]] = ContextVar("tool_run_memo", default=None)
+_memoized_tools = set()
+
+
+def is_side_effecting(tool_name: str) -> bool:
+    return tool_name.startswith(SIDE_EFFECT_PREFIXES) or tool_name in SIDE_EFFECT_TOOLS
+
+
+@contextmanager
+def run_memo():
+    """Scope a fresh memo to one agent run."""
+    token = _run_memo.set({})
+    try:
+        yield
+    finally:
+        _run_memo.reset(token)
+
+
+def _memo_key(tool_name: str, kwargs: dict) -> tuple:
+    return tool_name, json.dumps(kwargs, sort_keys=True, default=str)
+
+
+def _is_failure(result) -> bool:
+    """True for an error result, or a list holding one (e.g. a claim whose history failed to load)."""
+    if isinstance(result, dict):
+        return "error" in result
+    if isinstance(result, list):
+        return any(isinstance(item, dict) and "error" in item for item in result)
+    return False
+
+
+async def _trace_hit(tool_name: str, kwargs: dict):
+    try:
+        await adispatch_custom_event(MEMO_HIT_EVENT, {"tool": tool_name, "args": kwargs})
+    except RuntimeError:
+        # Called outside of a traced run (e.g. directly from a test)
+        pass
+
+
+def memoize_tool(tool):
+    """Wrap a tool's coroutine so repeated calls within a run are served from the memo."""
+    if getattr(tool.coroutine, "_memoized", False):
+        return tool
+    original = tool.coroutine
+    side_effecting = is_side_effecting(tool.name)
+
+    @functools.wraps(original)
+    async def wrapper(*args, **kwargs):
+        memo = _run_memo.get()
+        if memo is None:
+            return await original(*args, **kwargs)
+        if side_effecting:
+            result = await original(*args, **kwargs)
+            memo.clear()
+            return result
+        key = _memo_key(tool.name, kwargs)
+        hit = key in memo
+        prom.cache_lookup("tool_memo", hit)
+        if hit:
+            metrics.increment("tool_memo_hits", tool=tool.name)
+            logger.info(f"Tool memo hit: {tool.name} {key[1]}")
+            await _trace_hit(tool.name, kwargs)
+            return copy.deepcopy(memo[key])
+        result = await original(*args, **kwargs)
+        if not _is_failure(result):
+            memo[key] = copy.deepcopy(result)
+        return result
+
+    wrapper._memoized = True
+    tool.coroutine = wrapper
+    if not side_effecting:
+        _memoized_tools.add(tool.name)
+    return tool
+
+
+def get_tool_memo_stats() -> dict:
+    """Memo hits per memoized tool."""
+    return {name: int(metrics.get_counter("tool_memo_hits", tool=name)) for name in sorted(_memoized_tools)}
@@ -0,0 +1,80 @@
+"""
+Embedding-based dynamic tool selection.
+
+Tool descriptions are embedded once per role; for each query only the top-N
+most relevant tools plus a few always-on essentials are exposed to the agent,
+which shrinks the tool section serialized into every structured-chat prompt.
+"""
+
+import json
+import numpy as np
+from typing import List, Optional, Tuple
+from python_orchestrator.config import TOOL_SELECTION_ENABLED, TOOL_SELECTION_TOP_N
+from python_orchestrator.utils import metrics
+from .tools import get_tools_for_role
+from .retrieval import get_vectorizer
+
+CHARS_PER_TOKEN = 4
+ESSENTIAL_TOOLS = ("search_knowledge_base_tool", "get_current_user_profile_tool", "get_tool_result_page_tool")
+
+# Per-role (tools, normalized description matrix)
+_tool_index = {}
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def tool_prompt_tokens(tools) -> int:
+    """Approximate prompt tokens spent describing these tools."""
+    chars = sum(len(t.name) + len(t.description or "") + len(json.dumps(t.args)) for t in tools)
+    return chars // CHARS_PER_TOKEN
+
+
+def _get_index(role: str):
+    if role not in _tool_index:
+        tools = get_tools_for_role(role)
+        texts = [f"{t.name.replace('_', ' ')}: {t.description}" for t in tools]
+        matrix = _normalize(np.array(get_vectorizer().vectorize_chunks_batch(texts)))
+        _tool_index[role] = (tools, matrix)
+    return _tool_index[role]
+
+
+def rank_tools(query: str, role: str) -> List[Tuple[str, float]]:
+    """All role tools ranked by similarity to the query."""
+    tools, matrix = _get_index(role)
+    scores = matrix @ _normalize(get_vectorizer().vectorize_chunk(query))
+    order = np.argsort(-scores)
+    return [(tools[i].name, float(scores[i])) for i in order]
+
+
+def select_tool_names(query: str, role: str, top_n: int = TOOL_SELECTION_TOP_N) -> Optional[tuple]:
+    """
+    Names of the tools to expose for this query, in the role's original order,
+    or None to expose every tool (selection disabled or nothing to gain).
+    """
+    all_tools = get_tools_for_role(role)
+    if not TOOL_SELECTION_ENABLED or len(all_tools) <= top_n + len(ESSENTIAL_TOOLS):
+        return None
+    chosen = {name for name, _ in rank_tools(query, role)[:top_n]} | set(ESSENTIAL_TOOLS)
+    selected = [t for t in all_tools if t.name in chosen]
+    full_tokens, selected_tokens = tool_prompt_tokens(all_tools), tool_prompt_tokens(selected)
+    metrics.observe("tool_prompt_tokens", full_tokens, selection="full", role=role)
+    metrics.observe("tool_prompt_tokens", selected_tokens, selection="dynamic", role=role)
+    return tuple(t.name for t in selected)
+
+
+def get_tool_selection_stats() -> dict:
+    """Average tool-prompt tokens with and without dynamic selection, per role."""
+    stats = {"enabled": TOOL_SELECTION_ENABLED, "top_n": TOOL_SELECTION_TOP_N}
+    for role in ("user", "admin"):
+        full = metrics.get_summary("tool_prompt_tokens", selection="full", role=role)
+        dynamic = metrics.get_summary("tool_prompt_tokens", selection="dynamic", role=role)
+        stats[role] = {
+            "selections": dynamic["count"],
+            "avg_full_tokens": full["mean"],
+            "avg_selected_tokens": dynamic["mean"],
+            "avg_reduction": 1 - dynamic["mean"] / full["mean"] if full["mean"] else 0.0,
+        }
+    return stats
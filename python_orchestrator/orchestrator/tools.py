@@ -1,211 +1,376 @@
+import json
+import time
+import uuid
+import functools
+from collections import Counter
 from langchain_core.tools import tool
 from python_orchestrator.agents import user_agent, claims_agent, policy_agent, admin_agent, premium_agent
-from typing import List
-import requests
-import os
+from python_orchestrator.agents.cache import TTLCache, user_identity
+from python_orchestrator.agents.resilience import is_backend_degraded, DEGRADED_MESSAGE
+from typing import Any, List, Optional
+from python_orchestrator.utils import metrics, tracing
+from python_orchestrator.utils import prometheus_metrics as prom
 from python_orchestrator.utils.logger import get_logger
+from .request_context import set_auth_token, set_user_role, get_auth_token, get_user_role
+from .retrieval import search_knowledge_base
+from .tool_memo import memoize_tool
 
 logger = get_logger(__name__)
 
-# NestJS backend URL
-NESTJS_BASE_URL = os.getenv('NESTJS_BASE_URL', 'http://localhost:3000')
+# Default page size for the admin listing tools
+TOOL_PAGE_SIZE = 20
 
-# Global variable to store auth token and user role
-AUTH_TOKEN = None
-USER_ROLE = None  # 'user' or 'admin'
-
-def set_auth_token(token: str):
-    """Set the authentication token for API calls."""
-    global AUTH_TOKEN
-    AUTH_TOKEN = token
-
-def set_user_role(role: str):
-    """Set the user role for tool selection."""
-    global USER_ROLE
-    USER_ROLE = role
+# Auth token and user role are request-scoped (contextvars), so concurrent
+# chats in one worker never run tools with each other's credentials.
 
 # --- User Tools (Available to all users) ---
 
 @tool
 async def get_current_user_profile_tool() -> dict:
     """Retrieve current user's profile information."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to access user profile")
-    return await user_agent.get_current_user_profile(AUTH_TOKEN)
+    return await user_agent.get_current_user_profile(get_auth_token())
 
 @tool
 async def get_user_claims_tool(active_only: bool = False) -> list:
     """Retrieve current user's claims. Set active_only=True to get only active claims."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to access user claims")
-    return await claims_agent.get_user_claims(AUTH_TOKEN, active_only)
+    return await claims_agent.get_user_claims(get_auth_token(), active_only)
 
 @tool
 async def get_user_claim_by_id_tool(claim_id: str) -> dict:
     """Retrieve a specific claim by ID for the current user."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to access user claims")
-    return await claims_agent.get_user_claim_by_id(claim_id, AUTH_TOKEN)
+    return await claims_agent.get_user_claim_by_id(claim_id, get_auth_token())
 
 @tool
 async def get_claim_history_tool(claim_id: str) -> list:
     """Retrieve the history of a specific claim for the current user."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
+        raise ValueError("Authentication token is required to access claim history")
+    return await claims_agent.get_claim_history(claim_id, get_auth_token())
+
+@tool
+async def get_claims_with_history_tool(claim_ids: Optional[List[str]] = None, active_only: bool = False) -> list:
+    """Retrieve the current user's claims together with each claim's history in one call. Pass claim_ids to limit it to specific claims (active_only is then ignored); use this instead of calling get_claim_history_tool per claim."""
+    if not get_auth_token():
         raise ValueError("Authentication token is required to access claim history")
-    return await claims_agent.get_claim_history(claim_id, AUTH_TOKEN)
+    return await claims_agent.get_claims_with_history(get_auth_token(), claim_ids, active_only)
 
 @tool
 async def get_user_policies_tool(active_only: bool = False) -> list:
     """Get current user's policies. Set active_only=True to get only active policies."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to access user policies")
-    return await policy_agent.get_user_policies(AUTH_TOKEN, active_only)
+    return await policy_agent.get_user_policies(get_auth_token(), active_only)
 
 @tool
 async def get_user_policy_by_id_tool(policy_id: str) -> dict:
     """Get specific policy details for current user."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to access user policies")
-    return await policy_agent.get_user_policy_by_id(policy_id, AUTH_TOKEN)
+    return await policy_agent.get_user_policy_by_id(policy_id, get_auth_token())
 
 @tool
 async def calculate_premium_tool(premium_data: dict) -> dict:
     """Calculate premium for a policy."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to calculate premium")
-    return await premium_agent.calculate_premium(premium_data, AUTH_TOKEN)
+    return await premium_agent.calculate_premium(premium_data, get_auth_token())
 
 # --- Admin Tools (Available only to admin users) ---
 
 @tool
 async def get_user_by_id_tool(user_id: str) -> dict:
     """Retrieve user details by their UUID (admin only)."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to access user data")
-    if USER_ROLE != 'admin':
+    if get_user_role() != 'admin':
         raise ValueError("Admin access required to fetch user by ID")
-    return await user_agent.get_user_by_id(user_id, AUTH_TOKEN)
+    return await user_agent.get_user_by_id(user_id, get_auth_token())
 
 @tool
 async def get_user_by_email_tool(email: str) -> dict:
     """Retrieve user details by their email address (admin only)."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to access user data")
-    if USER_ROLE != 'admin':
+    if get_user_role() != 'admin':
         raise ValueError("Admin access required to fetch user by email")
-    return await user_agent.get_user_by_email(email, AUTH_TOKEN)
+    return await user_agent.get_user_by_email(email, get_auth_token())
 
 @tool
-async def get_all_users_tool() -> list:
-    """Get all users (admin only)."""
-    if not AUTH_TOKEN:
+async def get_all_users_tool(
+    cursor: Optional[str] = None,
+    limit: int = TOOL_PAGE_SIZE,
+    role: Optional[str] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None
+) -> dict:
+    """Get a page of users (admin only). Filter by role ('user'/'admin') and created_from/created_to (ISO dates); pass next_cursor as cursor for the next page."""
+    if not get_auth_token():
         raise ValueError("Authentication token is required to access user data")
-    if USER_ROLE != 'admin':
+    if get_user_role() != 'admin':
         raise ValueError("Admin access required to fetch all users")
-    return await admin_agent.get_all_users(AUTH_TOKEN)
+    return await admin_agent.get_all_users(get_auth_token(), cursor, limit, role, created_from, created_to)
 
 @tool
 async def get_user_by_id_admin_tool(user_id: str) -> dict:
     """Get specific user details (admin only)."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to access user data")
-    if USER_ROLE != 'admin':
+    if get_user_role() != 'admin':
         raise ValueError("Admin access required to fetch user details")
-    return await admin_agent.get_user_by_id_admin(user_id, AUTH_TOKEN)
+    return await admin_agent.get_user_by_id_admin(user_id, get_auth_token())
 
 @tool
 async def create_user_tool(user_data: dict) -> dict:
     """Create new user (admin only)."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to create user")
-    if USER_ROLE != 'admin':
+    if get_user_role() != 'admin':
         raise ValueError("Admin access required to create user")
-    return await admin_agent.create_user(user_data, AUTH_TOKEN)
+    return await admin_agent.create_user(user_data, get_auth_token())
 
 @tool
-async def get_all_policies_tool() -> list:
-    """Get all policies (admin only)."""
-    if not AUTH_TOKEN:
+async def get_all_policies_tool(
+    cursor: Optional[str] = None,
+    limit: int = TOOL_PAGE_SIZE,
+    status: Optional[str] = None,
+    user_id: Optional[str] = None,
+    plan_name: Optional[str] = None,
+    start_from: Optional[str] = None,
+    start_to: Optional[str] = None
+) -> dict:
+    """Get a page of policies (admin only). Filter by status ('active'/'expired'), user_id, plan_name and start_from/start_to (ISO dates); pass next_cursor as cursor for the next page."""
+    if not get_auth_token():
         raise ValueError("Authentication token is required to access policies")
-    if USER_ROLE != 'admin':
+    if get_user_role() != 'admin':
         raise ValueError("Admin access required to fetch all policies")
-    return await policy_agent.get_all_policies(AUTH_TOKEN)
+    return await policy_agent.get_all_policies(get_auth_token(), cursor, limit, status, user_id,
+                                               plan_name, start_from, start_to)
 
 @tool
 async def create_policy_tool(policy_data: dict) -> dict:
     """Create new policy (admin only)."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to create policy")
-    if USER_ROLE != 'admin':
+    if get_user_role() != 'admin':
         raise ValueError("Admin access required to create policy")
-    return await policy_agent.create_policy(policy_data, AUTH_TOKEN)
+    return await policy_agent.create_policy(policy_data, get_auth_token())
 
 @tool
 async def upload_knowledge_base_tool(kb_data: dict) -> dict:
     """Upload knowledge base (admin only)."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to upload knowledge base")
-    if USER_ROLE != 'admin':
+    if get_user_role() != 'admin':
         raise ValueError("Admin access required to upload knowledge base")
-    return await admin_agent.upload_knowledge_base(kb_data, AUTH_TOKEN)
+    return await admin_agent.upload_knowledge_base(kb_data, get_auth_token())
 
 @tool
 async def delete_knowledge_base_entry_tool(kb_id: str) -> dict:
     """Delete knowledge base entry (admin only)."""
-    if not AUTH_TOKEN:
+    if not get_auth_token():
         raise ValueError("Authentication token is required to delete knowledge base")
-    if USER_ROLE != 'admin':
+    if get_user_role() != 'admin':
         raise ValueError("Admin access required to delete knowledge base")
-    return await admin_agent.delete_knowledge_base_entry(kb_id, AUTH_TOKEN)
+    return await admin_agent.delete_knowledge_base_entry(kb_id, get_auth_token())
+
+# --- Paging Tool (Available to all users) ---
+
+@tool
+async def get_tool_result_page_tool(result_id: str, page: int = 1) -> dict:
+    """Page through the full items of a compacted tool result, using the result_id it returned."""
+    hit, items = _full_results.get((user_identity(get_auth_token()), result_id))
+    if not hit:
+        raise ValueError(f"Result '{result_id}' is unknown or has expired; call the original tool again")
+    pages = max(1, -(-len(items) // PAGE_SIZE))
+    page = min(max(page, 1), pages)
+    return {
+        "result_id": result_id,
+        "page": page,
+        "pages": pages,
+        "total": len(items),
+        "items": items[(page - 1) * PAGE_SIZE:page * PAGE_SIZE],
+    }
 
 # --- RAG Tool (Available to all users) ---
 
 @tool
 async def search_knowledge_base_tool(query: str, limit: int = 3) -> dict:
     """Search knowledge base for similar content using RAG with cosine similarity."""
-    try:
-        # Step 1: Vectorize the query in Python orchestrator
-        from python_orchestrator.vectorization.text_vectorizer import TextVectorizer
-        vectorizer = TextVectorizer()
-        
-        logger.info(f"Vectorizing query: {query}")
-        query_vector = vectorizer.vectorize_chunk(query)
-        
-        # Step 2: Send vector to NestJS for similarity comparison
-        rag_url = f"{NESTJS_BASE_URL}/orchestrator/rag/search-vector"
-        
-        payload = {
-            "vector": query_vector.tolist(),
-            "limit": limit,
-            "query": query  # Include original query for context
-        }
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {AUTH_TOKEN}" if AUTH_TOKEN else None
-        }
-        
-        # Remove None headers
-        headers = {k: v for k, v in headers.items() if v is not None}
-        
-        logger.info(f"Making vector-based RAG request to {rag_url}")
-        
-        response = requests.post(rag_url, json=payload, headers=headers, timeout=30)
-        
-        if response.status_code == 200:
-            result = response.json()
-            logger.info(f"Vector RAG search returned {len(result.get('results', []))} results")
-            return result
-        else:
-            logger.error(f"Vector RAG search failed with status {response.status_code}: {response.text}")
-            return {"error": f"Vector RAG search failed: {response.text}"}
-            
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Vector RAG search request failed: {e}")
-        return {"error": f"Vector RAG search request failed: {str(e)}"}
-    except Exception as e:
-        logger.error(f"Unexpected error in vector RAG search: {e}")
-        return {"error": f"Unexpected error in vector RAG search: {str(e)}"}
+    return await search_knowledge_base(query, limit, get_auth_token())
+
+
+# --- Output compaction ---
+# Tool results are projected to the fields relevant for each tool before they
+# re-enter the LLM context. Lists that exceed the tool's token budget become a
+# count, aggregates and a sample; the full list stays pageable via
+# get_tool_result_page_tool.
+
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 600
+PAGE_SIZE = 20
+
+TOOL_PROJECTIONS = {
+    "get_current_user_profile_tool": ["user_id", "email", "role", "created_at"],
+    "get_user_by_id_tool": ["user_id", "email", "role", "created_at"],
+    "get_user_by_email_tool": ["user_id", "email", "role", "created_at"],
+    "get_user_by_id_admin_tool": ["user_id", "email", "role", "created_at"],
+    "get_all_users_tool": ["user_id", "email", "role", "created_at"],
+    "get_user_claims_tool": ["claim_id", "status", "vehicle", "damage_description", "policy_id", "last_updated"],
+    "get_claims_with_history_tool": ["claim_id", "status", "vehicle", "policy_id", "last_updated", "history", "error"],
+    "get_user_claim_by_id_tool": ["claim_id", "status", "vehicle", "damage_description", "photos", "policy_id", "last_updated"],
+    "get_user_policies_tool": ["policy_id", "plan_name", "collision_coverage", "roadside_assistance",
+                               "deductible", "premium", "start_date", "end_date"],
+    "get_user_policy_by_id_tool": ["policy_id", "plan_name", "collision_coverage", "roadside_assistance",
+                                   "deductible", "premium", "start_date", "end_date"],
+    "get_all_policies_tool": ["policy_id", "user_id", "plan_name", "premium", "deductible", "end_date"],
+}
+
+# Fields counted by value and fields summed when a list is summarized
+TOOL_AGGREGATES = {
+    "get_all_users_tool": {"count_by": ["role"], "sum": []},
+    "get_all_policies_tool": {"count_by": ["plan_name"], "sum": ["premium", "collision_coverage"]},
+    "get_user_claims_tool": {"count_by": ["status"], "sum": []},
+    "get_claims_with_history_tool": {"count_by": ["status"], "sum": []},
+    "get_user_policies_tool": {"count_by": ["plan_name"], "sum": ["premium"]},
+}
+
+TOOL_TOKEN_BUDGETS = {
+    "get_all_users_tool": 500,
+    "get_all_policies_tool": 500,
+    "get_claims_with_history_tool": 1200,
+}
+
+# Full projected lists of compacted results, per (user identity, result id)
+_full_results = TTLCache(ttl=600, max_entries=200)
+
+
+def _tokens(value: Any) -> int:
+    return len(json.dumps(value, default=str)) // CHARS_PER_TOKEN
+
+
+def _project(value: Any, fields) -> Any:
+    if not fields:
+        return value
+    if isinstance(value, list):
+        return [_project(item, fields) for item in value]
+    if isinstance(value, dict):
+        return {k: value[k] for k in fields if k in value}
+    return value
+
+
+def _summarize(tool_name: str, items: list, budget: int) -> dict:
+    """Replace a long list by a count, aggregates, a sample and a result id for paging."""
+    result_id = uuid.uuid4().hex[:12]
+    _full_results.set((user_identity(get_auth_token()), result_id), items)
+    aggregates = TOOL_AGGREGATES.get(tool_name, {})
+    summary = {
+        "total": len(items),
+        "counts": {f: dict(Counter(str(i.get(f)) for i in items if isinstance(i, dict)))
+                   for f in aggregates.get("count_by", [])},
+        "sums": {f: sum(i.get(f) or 0 for i in items if isinstance(i, dict) and isinstance(i.get(f), (int, float)))
+                 for f in aggregates.get("sum", [])},
+        "sample": [],
+        "result_id": result_id,
+        "note": f"Showing a sample of {len(items)} items. Call get_tool_result_page_tool "
+                f"with result_id='{result_id}' for the full list.",
+    }
+    for item in items:
+        if _tokens(summary) + _tokens(item) > budget:
+            break
+        summary["sample"].append(item)
+    return summary
+
+
+def compact_output(tool_name: str, output: Any) -> Any:
+    """Project a tool's output and shrink large lists to fit the tool's token budget."""
+    if isinstance(output, dict) and "items" in output and "next_cursor" in output:
+        # A backend page: compact its items and keep the cursor
+        return {**output, "items": compact_output(tool_name, output["items"])}
+    budget = TOOL_TOKEN_BUDGETS.get(tool_name, DEFAULT_TOKEN_BUDGET)
+    compacted = _project(output, TOOL_PROJECTIONS.get(tool_name))
+    if isinstance(compacted, list) and _tokens(compacted) > budget:
+        compacted = _summarize(tool_name, compacted, budget)
+    metrics.observe("tool_output_tokens", _tokens(output), tool=tool_name, stage="raw")
+    metrics.observe("tool_output_tokens", _tokens(compacted), tool=tool_name, stage="compacted")
+    return compacted
+
+
+def compact_tool(tool):
+    """Run a tool's output through compact_output before it reaches the agent."""
+    if tool.name == get_tool_result_page_tool.name or getattr(tool.coroutine, "_compacted", False):
+        return tool
+    original = tool.coroutine
+
+    @functools.wraps(original)
+    async def wrapper(*args, **kwargs):
+        return compact_output(tool.name, await original(*args, **kwargs))
+
+    wrapper._compacted = True
+    tool.coroutine = wrapper
+    return tool
+
+
+def report_degraded_backend(tool):
+    """Return a degraded-backend notice to the agent instead of failing the run when the breaker is open."""
+    original = tool.coroutine
+
+    @functools.wraps(original)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await original(*args, **kwargs)
+        except Exception as e:
+            if is_backend_degraded(e):
+                logger.warning(f"{tool.name} skipped: backend circuit is open")
+                return {"error": DEGRADED_MESSAGE}
+            raise
+
+    tool.coroutine = wrapper
+    return tool
+
+
+def trace_tool(tool):
+    """
+    Run each call of the tool in a tracing span, so its backend calls nest
+    under it, and record its latency and errors in Prometheus.
+    """
+    original = tool.coroutine
+    ok_calls, failed_calls, latency = prom.tool_children(tool.name)
+
+    @functools.wraps(original)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with tracing.span(f"tool {tool.name}"):
+                result = await original(*args, **kwargs)
+        except Exception:
+            failed_calls.inc()
+            raise
+        finally:
+            latency.observe(time.perf_counter() - start)
+        # Degraded-backend and similar notices come back as {"error": ...} rather than raising
+        (failed_calls if isinstance(result, dict) and "error" in result else ok_calls).inc()
+        return result
+
+    tool.coroutine = wrapper
+    return tool
+
+
+def get_compaction_stats() -> dict:
+    """Average raw vs compacted output tokens per tool."""
+    stats = {}
+    for name in TOOL_PROJECTIONS:
+        raw = metrics.get_summary("tool_output_tokens", tool=name, stage="raw")
+        compacted = metrics.get_summary("tool_output_tokens", tool=name, stage="compacted")
+        if raw["count"]:
+            stats[name] = {"calls": raw["count"], "avg_raw_tokens": raw["mean"],
+                           "avg_compacted_tokens": compacted["mean"]}
+    return stats
 
 
 # Tool lists for different user roles
@@ -214,10 +379,12 @@ USER_TOOLS = [
     get_user_claims_tool,
     get_user_claim_by_id_tool,
     get_claim_history_tool,
+    get_claims_with_history_tool,
     get_user_policies_tool,
     get_user_policy_by_id_tool,
     calculate_premium_tool,
     search_knowledge_base_tool,  # Add RAG tool to user tools
+    get_tool_result_page_tool,
 ]
 
 ADMIN_TOOLS = USER_TOOLS + [
@@ -232,6 +399,12 @@ ADMIN_TOOLS = USER_TOOLS + [
     delete_knowledge_base_entry_tool,
 ]
 
+# Outputs are compacted first, an open backend circuit becomes a notice to the
+# agent, and repeated read-only calls within one agent run are served from a
+# per-run memo
+for _tool in ADMIN_TOOLS:
+    trace_tool(memoize_tool(report_degraded_backend(compact_tool(_tool))))
+
 def get_tools_for_role(role: str) -> List:
     """Get tools based on user role."""
     if role == 'admin':
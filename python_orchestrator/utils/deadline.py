@@ -0,0 +1,40 @@
+"""
+Per-request deadlines.
+
+A chat request gets a single time budget. The absolute deadline is kept in a
+contextvar so the agent loop, tools and backend HTTP calls made on behalf of
+the request all see it and shrink their own timeouts to what is left.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float):
+    """Run the block under a deadline `seconds` from now; an earlier enclosing deadline wins."""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None when there is no deadline."""
+    deadline = _deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def cap(timeout: Optional[float]) -> Optional[float]:
+    """The smaller of a timeout and the remaining budget (None means unbounded)."""
+    left = remaining()
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
@@ -0,0 +1,82 @@
+"""
+Lightweight in-process metrics for the orchestrator.
+
+Counters and latency samples are kept in memory and exposed through the
+`/stats` endpoint so hot paths can be compared without external tooling.
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Dict
+
+MAX_SAMPLES = 1000
+
+_lock = threading.Lock()
+_counters = defaultdict(float)
+_samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+
+
+def _key(name: str, labels: Dict[str, str]) -> str:
+    """Build a metric key such as `chat_requests{route=agent}`."""
+    if not labels:
+        return name
+    label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    return f"{name}{{{label_str}}}"
+
+
+def increment(name: str, amount: float = 1.0, **labels):
+    """Increment a counter."""
+    with _lock:
+        _counters[_key(name, labels)] += amount
+
+
+def observe(name: str, value: float, **labels):
+    """Record a sample (e.g. a latency in milliseconds)."""
+    with _lock:
+        _samples[_key(name, labels)].append(value)
+
+
+def get_counter(name: str, **labels) -> float:
+    """Return the current value of a counter."""
+    with _lock:
+        return _counters.get(_key(name, labels), 0.0)
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(values) -> dict:
+    """Summarize samples as count/mean/p50/p95/p99/max."""
+    values = list(values)
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0,
+    }
+
+
+def get_summary(name: str, **labels) -> dict:
+    """Summarize the samples recorded for one metric."""
+    with _lock:
+        values = list(_samples.get(_key(name, labels), ()))
+    return summarize(values)
+
+
+def snapshot() -> dict:
+    """Return all counters and sample summaries."""
+    with _lock:
+        counters = dict(_counters)
+        samples = {k: list(v) for k, v in _samples.items()}
+    return {
+        "counters": counters,
+        "latencies": {k: summarize(v) for k, v in samples.items()},
+    }
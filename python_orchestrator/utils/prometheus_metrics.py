@@ -0,0 +1,193 @@
+"""
+Prometheus metrics for the orchestrator, served at `/metrics`.
+
+Label sets are bound once (at import or first use) and kept in plain dicts,
+so recording on the hot path is a dict lookup and an increment rather than a
+label resolution per request.
+
+With several workers, set PROMETHEUS_MULTIPROC_DIR to a shared, empty
+directory before start-up: every worker then writes its values to mmap files
+there and `/metrics` aggregates them, whichever worker serves the scrape.
+"""
+
+import os
+import time
+import asyncio
+import resource
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+SAMPLE_INTERVAL_SECONDS = float(os.getenv("METRICS_SAMPLE_INTERVAL_SECONDS", "15"))
+
+ROLES = ("user", "admin")
+CACHES = ("backend", "tool_memo", "agent", "jwt_claims", "revalidation")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+# --- HTTP requests served ---
+HTTP_REQUESTS = Counter("orchestrator_http_requests_total", "Requests served",
+                        ["method", "route", "status"])
+HTTP_DURATION = Histogram("orchestrator_http_request_duration_seconds", "Request latency, including streaming",
+                          ["method", "route"], buckets=LATENCY_BUCKETS)
+
+# --- Vectorizer ---
+ENCODE_BATCH_SIZE = Histogram("orchestrator_encode_batch_size", "Texts per encode call", buckets=BATCH_BUCKETS)
+ENCODE_DURATION = Histogram("orchestrator_encode_duration_seconds", "Encode call latency", buckets=LATENCY_BUCKETS)
+ENCODED_TEXTS = Counter("orchestrator_encoded_texts_total", "Texts encoded (rate() gives throughput)")
+
+# --- Admission queue ---
+CHAT_IN_FLIGHT = Gauge("orchestrator_chat_in_flight", "Agent runs executing", multiprocess_mode="livesum")
+CHAT_QUEUE_DEPTH = Gauge("orchestrator_chat_queue_depth", "Chat requests waiting for a slot",
+                         multiprocess_mode="livesum")
+CHAT_QUEUE_WAIT = Histogram("orchestrator_chat_queue_wait_seconds", "Time spent waiting for a slot",
+                            buckets=LATENCY_BUCKETS)
+CHAT_REJECTED = Counter("orchestrator_chat_rejected_total", "Chat requests rejected by admission control",
+                        ["reason"])
+
+# --- Caches ---
+CACHE_LOOKUPS = Counter("orchestrator_cache_lookups_total", "Cache lookups by result", ["cache", "result"])
+_cache_children = {(cache, hit): CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss")
+                   for cache in CACHES for hit in (True, False)}
+
+# --- LLM calls ---
+LLM_CALLS = Counter("orchestrator_llm_calls_total", "LLM calls", ["role", "status"])
+LLM_DURATION = Histogram("orchestrator_llm_call_duration_seconds", "LLM call latency", ["role"],
+                         buckets=LATENCY_BUCKETS)
+LLM_TOKENS = Counter("orchestrator_llm_tokens_total", "LLM tokens", ["role", "type"])
+LLM_COST = Counter("orchestrator_llm_cost_usd_total", "Estimated LLM cost in USD", ["role"])
+_llm_children = {
+    role: {
+        "ok": LLM_CALLS.labels(role, "ok"),
+        "error": LLM_CALLS.labels(role, "error"),
+        "duration": LLM_DURATION.labels(role),
+        "input": LLM_TOKENS.labels(role, "input"),
+        "output": LLM_TOKENS.labels(role, "output"),
+        "cost": LLM_COST.labels(role),
+    }
+    for role in ROLES
+}
+
+# --- Tools ---
+TOOL_CALLS = Counter("orchestrator_tool_calls_total", "Tool calls", ["tool", "status"])
+TOOL_DURATION = Histogram("orchestrator_tool_duration_seconds", "Tool call latency", ["tool"],
+                          buckets=LATENCY_BUCKETS)
+
+# --- Backend HTTP pool ---
+BACKEND_IN_FLIGHT = Gauge("orchestrator_backend_requests_in_flight", "Backend requests in flight",
+                          multiprocess_mode="livesum")
+BACKEND_POOL_CONNECTIONS = Gauge("orchestrator_backend_pool_connections", "Backend pool connections by state",
+                                 ["state"], multiprocess_mode="livesum")
+BACKEND_POOL_LIMIT = Gauge("orchestrator_backend_pool_max_connections", "Backend pool connection limit per worker",
+                           multiprocess_mode="livesum")
+_pool_children = {state: BACKEND_POOL_CONNECTIONS.labels(state) for state in ("active", "idle")}
+
+# --- Process ---
+PROCESS_RSS = Gauge("orchestrator_process_resident_memory_bytes", "Resident memory per worker",
+                    multiprocess_mode="all")
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def cache_lookup(cache: str, hit: bool):
+    _cache_children[(cache, hit)].inc()
+
+
+def llm_children(role: str) -> dict:
+    """Pre-bound LLM metrics for a role (unknown roles count as 'user')."""
+    return _llm_children.get(role) or _llm_children["user"]
+
+
+def tool_children(tool_name: str) -> tuple:
+    """Pre-bound (ok counter, error counter, latency histogram) for a tool."""
+    return (TOOL_CALLS.labels(tool_name, "ok"), TOOL_CALLS.labels(tool_name, "error"),
+            TOOL_DURATION.labels(tool_name))
+
+
+def observe_encode(batch_size: int, seconds: float):
+    ENCODE_BATCH_SIZE.observe(batch_size)
+    ENCODE_DURATION.observe(seconds)
+    ENCODED_TEXTS.inc(batch_size)
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        # Not Linux: fall back to peak RSS (kilobytes on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _sample_pool(pool):
+    connections = list(getattr(pool, "connections", ()))
+    idle = sum(1 for c in connections if c.is_idle())
+    _pool_children["idle"].set(idle)
+    _pool_children["active"].set(len(connections) - idle)
+
+
+async def sample_periodically(get_pool, max_connections: int):
+    """
+    Refresh per-worker gauges (RSS, backend pool) in the background, so each
+    worker reports its own values however scrapes are routed.
+    """
+    BACKEND_POOL_LIMIT.set(max_connections)
+    while True:
+        PROCESS_RSS.set(_rss_bytes())
+        pool = get_pool()
+        if pool is not None:
+            _sample_pool(pool)
+        await asyncio.sleep(SAMPLE_INTERVAL_SECONDS)
+
+
+def render() -> bytes:
+    """Current metrics in the Prometheus text format, aggregated across workers when multiprocess."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_worker_exit():
+    """Drop this worker's live gauges from the multiprocess aggregate."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class PrometheusMiddleware:
+    """ASGI middleware counting requests and timing them per route template."""
+
+    def __init__(self, app):
+        self.app = app
+        self._children = {}
+
+    def _bound(self, method: str, route: str, status: int):
+        key = (method, route, status)
+        bound = self._children.get(key)
+        if bound is None:
+            bound = self._children[key] = (HTTP_REQUESTS.labels(method, route, str(status)),
+                                           HTTP_DURATION.labels(method, route))
+        return bound
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            counter, histogram = self._bound(scope["method"], route, status)
+            counter.inc()
+            histogram.observe(time.perf_counter() - start)
+
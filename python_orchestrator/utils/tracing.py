@@ -0,0 +1,229 @@
+"""
+Lightweight request tracing.
+
+Spans carry W3C trace-context ids and nest through a contextvar, so a chat
+request yields one trace covering the agent run, LLM calls, tools, encodes
+and backend HTTP calls. Finished traces can be exported as OTLP/JSON lines to
+a file and/or POSTed to an OpenTelemetry collector's OTLP/HTTP endpoint, and
+summarised per request for the X-Debug-Timing header.
+"""
+
+import json
+import time
+import queue
+import logging
+import secrets
+import threading
+import httpx
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from python_orchestrator.config import (
+    TRACING_ENABLED, TRACING_FILE_PATH, TRACING_OTLP_ENDPOINT, TRACING_SERVICE_NAME
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_SPANS_PER_TRACE = 1000
+EXPORT_QUEUE_SIZE = 1000
+# OTLP span kinds and status codes
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+STATUS_OK, STATUS_ERROR = 1, 2
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    def __init__(self, name: str, trace: list, trace_id: str, parent_id: Optional[str],
+                 kind: int = KIND_INTERNAL, attributes: Optional[dict] = None):
+        self.name = name
+        self.trace = trace
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.status = STATUS_OK
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        if len(trace) < MAX_SPANS_PER_TRACE:
+            trace.append(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status = STATUS_ERROR
+        self.attributes["error.type"] = type(error).__name__
+        self.attributes["error.message"] = str(error)[:200]
+
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent header value naming this span as the parent."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attributes(attributes: dict) -> list:
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            result.append({"key": key, "value": {"boolValue": value}})
+        elif isinstance(value, int):
+            result.append({"key": key, "value": {"intValue": str(value)}})
+        elif isinstance(value, float):
+            result.append({"key": key, "value": {"doubleValue": value}})
+        else:
+            result.append({"key": key, "value": {"stringValue": str(value)}})
+    return result
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple]:
+    """(trace_id, parent_span_id) from a W3C traceparent header, or None if absent or invalid."""
+    parts = (header or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2]
+
+
+def start_span(name: str, kind: int = KIND_INTERNAL, parent: Optional[Span] = None,
+               traceparent: Optional[str] = None, **attributes) -> Optional[Span]:
+    """
+    Start a span without making it current (for callback-driven spans).
+    Without a parent span the span starts a new trace, continuing the remote
+    trace in `traceparent` when one is given. Returns None when tracing is off.
+    """
+    if not TRACING_ENABLED:
+        return None
+    parent = parent or _current_span.get()
+    if parent is not None:
+        return Span(name, parent.trace, parent.trace_id, parent.span_id, kind, attributes)
+    remote = parse_traceparent(traceparent)
+    trace_id, parent_id = remote or (secrets.token_hex(16), None)
+    return Span(name, [], trace_id, parent_id, kind, attributes)
+
+
+def end_span(span: Optional[Span], error: Optional[BaseException] = None):
+    """Finish a span; finishing a trace's local root exports the whole trace."""
+    if span is None or span.end_ns is not None:
+        return
+    if error is not None:
+        span.record_error(error)
+    span.end_ns = time.time_ns()
+    if span.trace and span.trace[0] is span:
+        _export(span.trace)
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, traceparent: Optional[str] = None, **attributes):
+    """Run the block in a span that is the current span for nested work."""
+    current = start_span(name, kind, traceparent=traceparent, **attributes)
+    if current is None:
+        yield None
+        return
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        end_span(current, e)
+        raise
+    finally:
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            pass  # a generator closed from another context (e.g. at garbage collection)
+        end_span(current)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def timing_breakdown(root: Optional[Span]) -> "OrderedDict[str, dict]":
+    """Total time and count per span name in the root's trace, in first-seen order."""
+    breakdown = OrderedDict()
+    for s in (root.trace if root else []):
+        entry = breakdown.setdefault(s.name, {"ms": 0.0, "count": 0})
+        entry["ms"] += s.duration_ms
+        entry["count"] += 1
+    return breakdown
+
+
+def format_timing_header(root: Optional[Span]) -> str:
+    """Server-Timing style summary, e.g. `chat;dur=812.4, llm gpt-4o-mini;dur=640.2;desc="2 calls"`."""
+    parts = []
+    for name, entry in timing_breakdown(root).items():
+        part = f"{name.replace(',', ' ').replace(';', ' ')};dur={entry['ms']:.1f}"
+        if entry["count"] > 1:
+            part += f';desc="{entry["count"]} calls"'
+        parts.append(part)
+    return ", ".join(parts)
+
+
+# Export happens on a background thread so request handling never waits on disk or the collector
+_export_queue: "queue.Queue[list]" = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+_exporter_thread: Optional[threading.Thread] = None
+_exporter_lock = threading.Lock()
+
+
+def _otlp_payload(spans: list) -> dict:
+    return {"resourceSpans": [{
+        "resource": {"attributes": _otlp_attributes({"service.name": TRACING_SERVICE_NAME})},
+        "scopeSpans": [{"scope": {"name": "python_orchestrator"}, "spans": [s.to_otlp() for s in spans]}],
+    }]}
+
+
+def _export_loop():
+    client = httpx.Client(timeout=5.0) if TRACING_OTLP_ENDPOINT else None
+    while True:
+        payload = _otlp_payload(_export_queue.get())
+        try:
+            if TRACING_FILE_PATH:
+                with open(TRACING_FILE_PATH, "a") as f:
+                    f.write(json.dumps(payload) + "\n")
+            if client:
+                client.post(TRACING_OTLP_ENDPOINT, json=payload)
+        except Exception as e:
+            logger.warning(f"Trace export failed: {e}")
+
+
+def _export(spans: list):
+    global _exporter_thread
+    if not (TRACING_FILE_PATH or TRACING_OTLP_ENDPOINT):
+        return
+    if _exporter_thread is None:
+        with _exporter_lock:
+            if _exporter_thread is None:
+                _exporter_thread = threading.Thread(target=_export_loop, name="trace-exporter", daemon=True)
+                _exporter_thread.start()
+    try:
+        _export_queue.put_nowait(spans)
+    except queue.Full:
+        logger.warning("Trace export queue full, dropping a trace")
@@ -6,10 +6,13 @@ using sentence transformers with configurable dimensions.
 """
 
 import os
+import time
 import numpy as np
 from sentence_transformers import SentenceTransformer
 import logging
 from typing import List, Union
+from python_orchestrator.utils import tracing
+from python_orchestrator.utils import prometheus_metrics as prom
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -77,7 +80,10 @@ class TextVectorizer:
             raise ValueError("Text chunk cannot be empty or only whitespace")
         
         try:
-            embedding = self.model.encode(text_chunk)
+            start = time.perf_counter()
+            with tracing.span("vectorizer.encode", **{"batch.size": 1}):
+                embedding = self.model.encode(text_chunk)
+            prom.observe_encode(1, time.perf_counter() - start)
             if not isinstance(embedding, np.ndarray):
                 embedding = np.array(embedding)
             
@@ -121,7 +127,10 @@ class TextVectorizer:
         
         try:
             # Encode all text chunks at once for better performance
-            embeddings = self.model.encode(text_chunks)
+            start = time.perf_counter()
+            with tracing.span("vectorizer.encode", **{"batch.size": len(text_chunks)}):
+                embeddings = self.model.encode(text_chunks)
+            prom.observe_encode(len(text_chunks), time.perf_counter() - start)
             
             # Ensure embeddings are numpy arrays and resize if needed
             if not isinstance(embeddings, np.ndarray):
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Fault-injection tests for the backend resilience layer.
+
+A local stub server plays NestJS and injects failures (5xx responses, slow
+responses) on demand, so retries, the circuit breaker and hedged GETs are
+exercised over real HTTP without a backend.
+"""
+
+import json
+import time
+import asyncio
+import threading
+import httpx
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from python_orchestrator.utils import metrics
+from python_orchestrator.agents.http_client import CoalescingTransport
+from python_orchestrator.agents.resilience import (
+    ResilientTransport, RetryBudget, CircuitBreaker, BackendDegradedError, is_backend_degraded
+)
+
+
+class FaultInjectingBackend(BaseHTTPRequestHandler):
+    """Serves JSON; the server's `faults` list decides each request's fate in order."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _respond(self):
+        self.server.requests += 1
+        fault = self.server.faults.pop(0) if self.server.faults else "ok"
+        if fault == "slow":
+            time.sleep(0.5)
+        status = 503 if fault == "503" else 200
+        body = json.dumps({"path": self.path, "fault": fault}).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the caller already moved on (e.g. a hedged request that lost)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FaultInjectingBackend)
+    server.faults, server.requests = [], 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def make_client(**options) -> httpx.AsyncClient:
+    options.setdefault("backoff_seconds", 0.01)
+    options.setdefault("budget", RetryBudget(ratio=5.0))
+    return httpx.AsyncClient(transport=ResilientTransport(httpx.AsyncHTTPTransport(), **options))
+
+
+def run_with_stub(scenario):
+    server, url = start_stub()
+    try:
+        return asyncio.run(scenario(server, url))
+    finally:
+        server.shutdown()
+
+
+def test_get_retries_transient_503():
+    async def scenario(server, url):
+        server.faults = ["503", "503"]
+        async with make_client(max_retries=2) as client:
+            response = await client.get(f"{url}/user/claims")
+        return response.status_code, server.requests
+    assert run_with_stub(scenario) == (200, 3)
+
+
+def test_post_is_not_retried():
+    async def scenario(server, url):
+        server.faults = ["503"]
+        async with make_client(max_retries=2) as client:
+            response = await client.post(f"{url}/admin/users", json={})
+        return response.status_code, server.requests
+    assert run_with_stub(scenario) == (503, 1)
+
+
+def test_retry_budget_limits_retries():
+    async def scenario(server, url):
+        server.faults = ["503"] * 10
+        budget = RetryBudget(ratio=0.0, min_per_second=0.0)
+        async with make_client(max_retries=5, budget=budget) as client:
+            response = await client.get(f"{url}/user/claims")
+        return response.status_code, server.requests
+    assert run_with_stub(scenario) == (503, 1)
+
+
+def test_breaker_opens_fails_fast_and_recovers():
+    async def scenario(server, url):
+        server.faults = ["503"] * 3
+        breaker = CircuitBreaker(failure_threshold=3, reset_seconds=0.2)
+        async with make_client(max_retries=0, breaker=breaker) as client:
+            for _ in range(3):
+                await client.get(f"{url}/user/policies")
+            sent_before = server.requests
+            try:
+                await client.get(f"{url}/user/policies")
+                failed_fast = False
+            except BackendDegradedError as e:
+                failed_fast = is_backend_degraded(e) and server.requests == sent_before
+            await asyncio.sleep(0.25)
+            recovered = (await client.get(f"{url}/user/policies")).status_code == 200
+        return breaker.state, failed_fast, recovered
+    assert run_with_stub(scenario) == (CircuitBreaker.CLOSED, True, True)
+
+
+def test_hedged_get_beats_slow_response():
+    async def scenario(server, url):
+        server.faults = ["slow"]
+        async with make_client(hedge=True, hedge_delay_ms=50) as client:
+            start = time.perf_counter()
+            response = await client.get(f"{url}/user/profile")
+            elapsed = time.perf_counter() - start
+        return response.json()["fault"], elapsed < 0.4, server.requests
+    assert run_with_stub(scenario) == ("ok", True, 2)
+
+
+def test_cancelled_chats_cancel_shared_backend_request():
+    async def scenario(server, url):
+        server.faults = ["slow"]
+        cancelled = lambda: metrics.get_counter("backend_requests_cancelled", route="/user/policies")
+        before = cancelled()
+        transport = CoalescingTransport(ResilientTransport(httpx.AsyncHTTPTransport(),
+                                                           backoff_seconds=0.01, budget=RetryBudget(ratio=5.0)))
+        async with httpx.AsyncClient(transport=transport) as client:
+            chats = [asyncio.create_task(client.get(f"{url}/user/policies")) for _ in range(2)]
+            await asyncio.sleep(0.1)
+            chats[0].cancel()
+            await asyncio.sleep(0.05)
+            # The other chat still waits on the shared request
+            survived_first_cancel = not chats[1].done() and cancelled() == before
+            chats[1].cancel()
+            await asyncio.gather(*chats, return_exceptions=True)
+            start = time.perf_counter()
+            response = await client.get(f"{url}/user/policies")
+            fresh_request = response.json()["fault"] == "ok" and time.perf_counter() - start < 0.4
+        return survived_first_cancel, cancelled() - before, fresh_request, server.requests
+    assert run_with_stub(scenario) == (True, 1, True, 2)
+
+
+if __name__ == "__main__":
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith("test_")]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"{len(tests)} resilience scenarios passed")
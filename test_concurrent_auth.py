@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test: overlapping chats in one worker must never run tools
+with each other's auth token or role.
+
+Tools are called directly by many interleaved chats, and also from full agent
+runs: two agents share one cached executor, and a fake LLM asks each of them to
+call a profile tool that reads the request's token.
+"""
+
+import json
+import asyncio
+import random
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from python_orchestrator.orchestrator import tools, agent_factory
+from python_orchestrator.orchestrator.langhub import get_orchestrator_agent, run_agent
+from python_orchestrator.agents import user_agent
+
+CONCURRENT_CHATS = 500
+TOOL_CALLS_PER_CHAT = 5
+
+
+async def fake_get_current_user_profile(auth_token):
+    """Echo the token the tool was called with (in a projected field), after a random delay."""
+    await asyncio.sleep(random.uniform(0, 0.01))
+    return {"email": auth_token}
+
+
+async def fake_get_user_by_id(user_id, auth_token):
+    await asyncio.sleep(random.uniform(0, 0.01))
+    return {"user_id": user_id, "email": auth_token}
+
+
+async def simulated_chat(chat_id: int) -> int:
+    """Set this chat's auth, then interleave tool calls with other chats."""
+    token = f"token-{chat_id}"
+    role = "admin" if chat_id % 2 else "user"
+    tools.set_auth_token(token)
+    tools.set_user_role(role)
+
+    leaks = 0
+    for _ in range(TOOL_CALLS_PER_CHAT):
+        await asyncio.sleep(random.uniform(0, 0.005))
+        profile = await tools.get_current_user_profile_tool.ainvoke({})
+        leaks += profile["email"] != token
+        try:
+            admin_result = await tools.get_user_by_id_tool.ainvoke({"user_id": str(chat_id)})
+            leaks += role != "admin" or admin_result["email"] != token
+        except ValueError:
+            leaks += role == "admin"
+    return leaks
+
+
+async def run_stress() -> int:
+    originals = (user_agent.get_current_user_profile, user_agent.get_user_by_id)
+    user_agent.get_current_user_profile = fake_get_current_user_profile
+    user_agent.get_user_by_id = fake_get_user_by_id
+    try:
+        chats = [asyncio.create_task(simulated_chat(i)) for i in range(CONCURRENT_CHATS)]
+        return sum(await asyncio.gather(*chats))
+    finally:
+        user_agent.get_current_user_profile, user_agent.get_user_by_id = originals
+
+
+class ProfileLookupModel(BaseChatModel):
+    """Calls the profile tool, then answers with the email the tool returned."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "profile-lookup-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        results = [m.content for m in messages if isinstance(m, ToolMessage)]
+        if results:
+            reply = AIMessage(content=results[-1])
+        else:
+            reply = AIMessage(content="", tool_calls=[
+                {"name": "get_current_user_profile_tool", "args": {}, "id": "call_profile"}])
+        return ChatResult(generations=[ChatGeneration(message=reply)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        # Yield so the two agent runs interleave between LLM calls
+        await asyncio.sleep(random.uniform(0, 0.01))
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+
+async def agent_chat(token: str) -> str:
+    tools.set_auth_token(token)
+    agent = get_orchestrator_agent(token, "user", verbose=False)
+    return await run_agent("What is my email?", token, "user", agent=agent)
+
+
+async def run_agent_pair() -> list:
+    """Two concurrent agent runs; each answer is the token its tool call saw."""
+    originals = (user_agent.get_current_user_profile, agent_factory.build_llm, agent_factory.OPENAI_API_KEY)
+    user_agent.get_current_user_profile = fake_get_current_user_profile
+    agent_factory.build_llm = lambda *args, **kwargs: ProfileLookupModel()
+    # Patched on the module: config was read when the first test module imported it
+    agent_factory.OPENAI_API_KEY = "sk-test"
+    agent_factory._agent_cache.clear()
+    try:
+        return await asyncio.gather(agent_chat("token-a"), agent_chat("token-b"))
+    finally:
+        user_agent.get_current_user_profile, agent_factory.build_llm, agent_factory.OPENAI_API_KEY = originals
+        agent_factory._agent_cache.clear()
+
+
+def test_no_cross_request_auth_leakage():
+    assert asyncio.run(run_stress()) == 0
+
+
+def test_concurrent_agent_runs_use_their_own_tokens():
+    for _ in range(20):
+        answers = asyncio.run(run_agent_pair())
+        assert [json.loads(answer)["email"] for answer in answers] == ["token-a", "token-b"]
+
+
+if __name__ == "__main__":
+    leaks = asyncio.run(run_stress())
+    print(f"{CONCURRENT_CHATS} concurrent chats, {leaks} cross-request leaks")
+    print("✅ No leakage" if leaks == 0 else "❌ Auth leaked between requests")
+    test_concurrent_agent_runs_use_their_own_tokens()
+    print("✅ Concurrent agent runs each used their own token")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Step counting for a tool-calling agent whose model asks for several tools in
+one round-trip: tool actions and LLM round-trips must be counted separately.
+"""
+
+import asyncio
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import tool
+from python_orchestrator.utils import metrics
+from python_orchestrator.orchestrator.agent_modes import create_agent_executor, TOOL_CALLING
+from python_orchestrator.orchestrator.step_counter import StepCounterHandler
+
+
+class ParallelToolCallModel(BaseChatModel):
+    """Asks for both lookups in its first reply, then answers from their results."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "parallel-tool-call-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        results = [m.content for m in messages if isinstance(m, ToolMessage)]
+        if results:
+            reply = AIMessage(content="You have " + " and ".join(results) + ".")
+        else:
+            reply = AIMessage(content="", tool_calls=[
+                {"name": "get_policies", "args": {}, "id": "call_policies"},
+                {"name": "get_claims", "args": {}, "id": "call_claims"},
+            ])
+        return ChatResult(generations=[ChatGeneration(message=reply)])
+
+
+@tool
+def get_policies() -> str:
+    """List the user's policies."""
+    return "1 policy"
+
+
+@tool
+def get_claims() -> str:
+    """List the user's claims."""
+    return "2 claims"
+
+
+def test_multi_tool_call_step_is_one_iteration():
+    async def scenario():
+        agent = create_agent_executor(ParallelToolCallModel(), [get_policies, get_claims], TOOL_CALLING,
+                                      verbose=False)
+        steps = StepCounterHandler()
+        result = await agent.ainvoke({"input": "What do I have?"}, config={"callbacks": [steps]})
+        steps.record(mode="step_counter_test")
+        return result["output"], steps.llm_calls, steps.steps, sorted(steps.tools)
+    output, llm_calls, tool_steps, tool_names = asyncio.run(scenario())
+    assert output == "You have 1 policy and 2 claims."
+    assert (llm_calls, tool_steps, tool_names) == (2, 2, ["get_claims", "get_policies"])
+    assert metrics.get_summary("agent_iterations", mode="step_counter_test")["mean"] == 2
+
+
+if __name__ == "__main__":
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith("test_")]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"{len(tests)} step counting scenarios passed")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+/chat/stream token filtering: only final-answer tokens reach the client.
+
+Tool-calling mode is driven by the real chat model replaying OpenAI streams
+(one tool-call reply, one answer); structured-chat mode feeds a Final Answer
+JSON blob to the handler in small fragments.
+"""
+
+import json
+import uuid
+import asyncio
+import httpx
+from python_orchestrator.orchestrator import agent_factory
+from python_orchestrator.orchestrator.agent_modes import TOOL_CALLING, STRUCTURED_CHAT
+from python_orchestrator.orchestrator.streaming import StreamingCallbackHandler
+
+ANSWER = 'Your Gold policy covers "collision" damage.\nDeductible: 500 €.'
+
+
+def _sse(delta: dict, finish_reason=None) -> str:
+    chunk = {"id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o-mini",
+             "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+def replay(request: httpx.Request) -> httpx.Response:
+    """The question gets a tool call; the tool result gets the answer, word by word."""
+    messages = json.loads(request.content)["messages"]
+    if messages[-1]["content"].startswith("Which"):
+        call = {"index": 0, "id": "call_1", "type": "function",
+                "function": {"name": "get_user_policies_tool", "arguments": ""}}
+        # Text alongside or after a tool call is the model thinking aloud, not the answer
+        events = [_sse({"role": "assistant", "content": "Let me check.", "tool_calls": [call]}),
+                  _sse({"content": " One moment."}),
+                  _sse({"tool_calls": [{"index": 0, "function": {"arguments": '{"active_only": true}'}}]}),
+                  _sse({}, "tool_calls")]
+    else:
+        events = [_sse({"role": "assistant", "content": ""})]
+        events += [_sse({"content": word}) for word in ANSWER.split(" ")]
+        events += [_sse({}, "stop")]
+    return httpx.Response(200, headers={"Content-Type": "text/event-stream"},
+                          content=("".join(events) + "data: [DONE]\n\n").encode())
+
+
+def queued_tokens(handler: StreamingCallbackHandler) -> list:
+    tokens = []
+    while not handler.queue.empty():
+        event, data = handler.queue.get_nowait()
+        tokens.append(data["token"])
+        assert event == "token"
+    return tokens
+
+
+def test_tool_calling_streams_only_the_answer():
+    async def scenario():
+        agent_factory._llm_http_client = httpx.AsyncClient(transport=httpx.MockTransport(replay))
+        llm = agent_factory.build_llm("sk-test")
+        handler = StreamingCallbackHandler(TOOL_CALLING)
+        await llm.ainvoke("Which policy do I have?", config={"callbacks": [handler]})
+        tool_call_tokens = queued_tokens(handler)
+        await llm.ainvoke("Tool result: 1 active Gold policy", config={"callbacks": [handler]})
+        return tool_call_tokens, queued_tokens(handler)
+    tool_call_tokens, answer_tokens = asyncio.run(scenario())
+    assert tool_call_tokens == []
+    assert " ".join(answer_tokens) == ANSWER
+
+
+def test_structured_chat_streams_only_the_final_answer():
+    async def scenario():
+        handler = StreamingCallbackHandler(STRUCTURED_CHAT)
+        tool_step = 'Thought: look it up\nAction:\n```\n{"action": "get_user_policies_tool", "action_input": {}}\n```'
+        final = ('Thought: I know the answer\nAction:\n```\n'
+                 + json.dumps({"action": "Final Answer", "action_input": ANSWER}) + "\n```")
+        for reply in (tool_step, final):
+            run_id = uuid.uuid4()
+            for i in range(0, len(reply), 3):
+                await handler.on_llm_new_token(reply[i:i + 3], run_id=run_id)
+            await handler.on_llm_end(None, run_id=run_id)
+        return queued_tokens(handler)
+    assert "".join(asyncio.run(scenario())) == ANSWER
+
+
+if __name__ == "__main__":
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith("test_")]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"{len(tests)} streaming scenarios passed")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Token accounting against a streamed completion.
+
+The chat model is built exactly as the agents build it, on an HTTP client
+whose transport replays an OpenAI streaming response, so the test covers the
+request the model sends (usage requested, completion bounded) and the usage
+chunk reaching TokenAccountingHandler.
+"""
+
+import json
+import asyncio
+import httpx
+from python_orchestrator.orchestrator import agent_factory
+from python_orchestrator.orchestrator.token_accounting import TokenAccountingHandler, TokenBudgetExceeded
+
+PROMPT_TOKENS, COMPLETION_TOKENS = 120, 30
+
+
+def _sse(chunk: dict) -> str:
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+def streamed_completion(request: httpx.Request) -> httpx.Response:
+    """An OpenAI chat stream; the usage chunk is only sent when the request asks for it."""
+    body = json.loads(request.content)
+    base = {"id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o-mini"}
+    events = [
+        _sse({**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": "Your policy "},
+                                   "finish_reason": None}]}),
+        _sse({**base, "choices": [{"index": 0, "delta": {"content": "is active."}, "finish_reason": None}]}),
+        _sse({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}),
+    ]
+    if (body.get("stream_options") or {}).get("include_usage"):
+        events.append(_sse({**base, "choices": [], "usage": {
+            "prompt_tokens": PROMPT_TOKENS, "completion_tokens": COMPLETION_TOKENS,
+            "total_tokens": PROMPT_TOKENS + COMPLETION_TOKENS}}))
+    events.append("data: [DONE]\n\n")
+    streamed_completion.requests.append(body)
+    return httpx.Response(200, headers={"Content-Type": "text/event-stream"},
+                          content="".join(events).encode())
+
+
+streamed_completion.requests = []
+
+
+def build_mocked_llm():
+    agent_factory._llm_http_client = httpx.AsyncClient(transport=httpx.MockTransport(streamed_completion))
+    return agent_factory.build_llm("sk-test")
+
+
+def test_streamed_usage_is_accounted():
+    async def scenario():
+        llm = build_mocked_llm()
+        usage = TokenAccountingHandler("user", max_tokens=0)
+        await llm.ainvoke("Is my policy active?", config={"callbacks": [usage]})
+        return usage.calls, usage.input_tokens, usage.output_tokens, usage.cost_usd > 0
+    assert asyncio.run(scenario()) == (1, PROMPT_TOKENS, COMPLETION_TOKENS, True)
+    request = streamed_completion.requests[-1]
+    assert request["stream"] and request["stream_options"] == {"include_usage": True}
+    assert request["max_completion_tokens"] == agent_factory.LLM_MAX_COMPLETION_TOKENS
+
+
+def test_token_cap_stops_next_call():
+    async def scenario():
+        llm = build_mocked_llm()
+        usage = TokenAccountingHandler("user", max_tokens=PROMPT_TOKENS + COMPLETION_TOKENS)
+        await llm.ainvoke("Is my policy active?", config={"callbacks": [usage]})
+        sent = len(streamed_completion.requests)
+        try:
+            await llm.ainvoke("And my claims?", config={"callbacks": [usage]})
+            stopped = False
+        except TokenBudgetExceeded:
+            stopped = True
+        return usage.total_tokens, stopped, len(streamed_completion.requests) == sent
+    assert asyncio.run(scenario()) == (PROMPT_TOKENS + COMPLETION_TOKENS, True, True)
+
+
+if __name__ == "__main__":
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith("test_")]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"{len(tests)} token accounting scenarios passed")
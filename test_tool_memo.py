@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Per-run tool memo: repeated reads are served from the memo, but a failed or
+degraded-backend result is not, so the agent's retry reaches the backend.
+"""
+
+import asyncio
+from python_orchestrator.agents import policy_agent
+from python_orchestrator.agents.resilience import BackendDegradedError, DEGRADED_MESSAGE
+from python_orchestrator.orchestrator.request_context import set_auth_token
+from python_orchestrator.orchestrator.tool_memo import run_memo
+from python_orchestrator.orchestrator.tools import get_user_policies_tool
+
+POLICIES = [{"policy_id": "GOLD-P001", "status": "active"}]
+
+
+def test_retry_after_degraded_backend_reaches_backend():
+    calls = []
+
+    async def flaky_get_user_policies(auth_token, active_only=False):
+        calls.append(active_only)
+        if len(calls) == 1:
+            raise BackendDegradedError(DEGRADED_MESSAGE)
+        return POLICIES
+
+    async def scenario():
+        set_auth_token("token-a")
+        with run_memo():
+            return [await get_user_policies_tool.ainvoke({"active_only": True}) for _ in range(3)]
+
+    original = policy_agent.get_user_policies
+    policy_agent.get_user_policies = flaky_get_user_policies
+    try:
+        degraded, retried, repeated = asyncio.run(scenario())
+    finally:
+        policy_agent.get_user_policies = original
+    assert degraded == {"error": DEGRADED_MESSAGE}
+    assert retried == repeated and retried[0]["policy_id"] == "GOLD-P001"
+    # The retry reached the backend; the repeat after it was a memo hit
+    assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    tests = [obj for name, obj in sorted(globals().items()) if name.startswith("test_")]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"{len(tests)} tool memo scenarios passed")